@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""One clock reading per tick against the clock read (and ISO times parsed) per check.
+
+  cycle       update_state() + render_tank() + render_status() for one view,
+              µs per view: the old model (ISO strings in the state,
+              datetime.now() and fromisoformat() inside every helper)
+              against epoch floats and one `now` passed through; and the
+              same leaving out drawing the tank (the cache key only)
+  torn views  views rendered with a clock that moves on while the view is
+              worked out, starting just before 22:00 or the 8th hour
+              since feeding: how often the tank and the status line
+              disagree (the fish drawn awake but reported asleep, or drawn
+              hungry but reported fine)
+
+Then checks, exit 1 on a failure: the new functions give the same state,
+tank and status as the old ones under a frozen clock, for fish of every
+age, hunger and hour; an old fish_state.json with ISO times loads as
+epoch seconds; and main() with an injected clock prints the same thing
+every time.
+
+Usage: python3 bench/bench_clock.py [--views 20000]
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bench_frames import START, fish
+
+
+class Clock:
+    """A stand-in datetime.now(): a set time, optionally moving on `step` seconds per reading."""
+    current = datetime.fromtimestamp(START)
+    step = timedelta(0)
+
+    @classmethod
+    def set(cls, ts, step=0.0):
+        cls.current, cls.step = datetime.fromtimestamp(ts), timedelta(seconds=step)
+
+    @classmethod
+    def now(cls):
+        now = cls.current
+        if cls.step:
+            cls.current += cls.step
+        return now
+
+
+# The pre-snapshot helpers, each reading the clock itself
+
+def old_hours_since(state, field):
+    return (Clock.now() - datetime.fromisoformat(state[field])).total_seconds() / 3600
+
+
+def old_stage(state):
+    age = (Clock.now() - datetime.fromisoformat(state["birth_time"])).total_seconds() / 86400
+    for stage, (min_age, max_age) in fish.GROWTH_STAGES.items():
+        if min_age <= age < max_age:
+            return stage
+    return "elder"
+
+
+def old_is_sleeping():
+    hour = Clock.now().hour
+    return hour < 6 or hour >= 22
+
+
+def old_update_state(state):
+    hours_away = old_hours_since(state, "last_viewed_time")
+    hours_since_fed = old_hours_since(state, "last_fed_time")
+    state["hunger"] = min(100, int(hours_since_fed * 4))
+    if hours_away > 24:
+        state["happiness"] = max(0, state["happiness"] - int(hours_away / 24) * 10)
+    if old_hours_since(state, "last_fed_time") > 48:
+        state["happiness"] = max(0, state["happiness"] - 20)
+    if hours_since_fed > 168:
+        state["is_alive"] = False
+    state["times_viewed"] = state.get("times_viewed", 0) + 1
+    state["last_viewed_time"] = Clock.now().isoformat()
+    return state
+
+
+def old_visual_state(state, width):
+    if not state["is_alive"]:
+        stage, mood = None, "dead"
+    else:
+        stage = old_stage(state)
+        mood = "sleeping" if old_is_sleeping() else \
+            "hungry" if old_hours_since(state, "last_fed_time") > 8 else "normal"
+    return stage, mood, width, int(Clock.now().timestamp() / 60)
+
+
+def old_render_tank(state, width):
+    return fish.draw_tank(*old_visual_state(state, width))
+
+
+def old_render_status(state):
+    name, stage = state.get("name", "Fish"), old_stage(state)
+    age = (Clock.now() - datetime.fromisoformat(state["birth_time"])).total_seconds() / 86400
+    if not state["is_alive"]:
+        return f"  {name} has passed away...\n  Lived for {age:.1f} days\n  Rest in peace, little friend."
+    hunger, happiness = state.get("hunger", 0), state.get("happiness", 100)
+    lines = [f"  Name: {name} ({stage.capitalize()})", f"  Age: {age:.1f} days",
+             f"  Satiety: [{'=' * (10 - hunger // 10) + '-' * (hunger // 10)}] "
+             f"{'Full' if hunger < 30 else 'Hungry' if hunger < 70 else 'Starving!'}",
+             f"  Mood:    [{'=' * (happiness // 10) + '-' * (10 - happiness // 10)}] "
+             f"{'Happy' if happiness > 70 else 'Okay' if happiness > 30 else 'Sad'}"]
+    if old_is_sleeping():
+        lines.append("  Status: Sleeping... (Night time)")
+    elif old_hours_since(state, "last_fed_time") > 8:
+        lines.append(f"  Status: Hungry! (Not fed for {old_hours_since(state, 'last_fed_time'):.1f}h)")
+    else:
+        lines.append("  Status: Swimming happily")
+    lines.append(f"  Visits: {state.get('times_viewed', 0)}")
+    return "\n".join(lines)
+
+
+def iso_state(state):
+    """`state` with its times as the ISO strings the old script stored."""
+    return {**state, **{f: datetime.fromtimestamp(state[f]).isoformat() for f in fish.TIME_FIELDS}}
+
+
+def make_states(count, seed=0):
+    """(state, now) pairs: fish of every age and hunger, looked at at every hour.
+
+    Times are whole seconds, so their ISO strings hold them exactly.
+    """
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        now = START + rng.randrange(86400 * 3)
+        state = fish.create_initial_state(now - rng.randrange(40 * 86400))
+        state["last_fed_time"] = now - rng.randrange(200 * 3600)
+        state["last_viewed_time"] = now - rng.randrange(72 * 3600)
+        state["happiness"] = rng.randint(0, 100)
+        pairs.append((state, now))
+    return pairs
+
+
+def torn(tank, status):
+    """Whether a tank and its status line tell different stories about sleep or hunger."""
+    asleep = "Sleeping" in status
+    return ("." * 20 in tank) != asleep or ("°" in tank) != ("Hungry!" in status)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--views", type=int, default=20_000)
+    args = parser.parse_args()
+    failures = []
+    pairs = make_states(args.views)
+    olds = [(iso_state(state), now) for state, now in pairs]
+
+    def old_cycle(state, now, render):
+        Clock.set(now)
+        state = old_update_state(dict(state))
+        render(state, 60)
+        old_render_status(state)
+
+    def new_cycle(state, now, render):
+        state = fish.update_state(dict(state), now)
+        render(state, now, 60)
+        fish.render_status(state, now)
+
+    print(f'{"cycle":<26} {"µs/view":>8} {"no drawing":>11}')
+    for label, cycle, views, renders in (("clock per check, ISO", old_cycle, olds, (old_render_tank, old_visual_state)),
+                                         ("one snapshot, epoch", new_cycle, pairs, (fish.render_tank, fish.visual_state))):
+        times = []
+        for render in renders:
+            fish.draw_tank.cache_clear()
+            start = time.perf_counter()
+            for state, now in views:
+                cycle(state, now, render)
+            times.append((time.perf_counter() - start) / len(views) * 1e6)
+        print(f"{label:<26} {times[0]:>8.1f} {times[1]:>11.1f}")
+
+    # Views starting just before 22:00, or just before 8 hours after feeding
+    night = datetime.fromtimestamp(START).replace(hour=22, minute=0, second=0).timestamp()
+    state = fish.create_initial_state(START - 10 * 86400)
+    state["last_fed_time"] = night - 12 * 3600
+    edges = [night - 0.0003, state["last_fed_time"] + 8 * 3600 - 0.0003]
+    counts = {}
+    for label, step in (("clock per check", 0.00002), ("one snapshot", None)):
+        bad = 0
+        for n in range(3000):
+            edge = edges[n % 2] + (n // 2) * 2e-7
+            if step is None:
+                view = fish.update_state(dict(state), edge)
+                bad += torn(fish.render_tank(view, edge, 60), fish.render_status(view, edge))
+            else:
+                Clock.set(edge, step)
+                view = old_update_state(iso_state(state))
+                bad += torn(old_render_tank(view, 60), old_render_status(view))
+        counts[label] = bad
+    print(f'\n{"torn views (of 3000)":<26} {"count":>8}')
+    for label, bad in counts.items():
+        print(f"{label:<26} {bad:>8}")
+    if counts["one snapshot"]:
+        failures.append(f'{counts["one snapshot"]} views disagree with themselves under one snapshot')
+
+    # Same answers as the old helpers under a frozen clock
+    for (state, now), (old, _) in zip(pairs[:5000], olds):
+        Clock.set(now)
+        new_state, old_state = fish.update_state(dict(state), now), old_update_state(dict(old))
+        same = (fish.render_tank(new_state, now, 60) == old_render_tank(old_state, 60)
+                and fish.render_status(new_state, now) == old_render_status(old_state)
+                and all(new_state[k] == old_state[k] for k in new_state if k not in fish.TIME_FIELDS))
+        if not same:
+            failures.append(f"a fish at {now} differs from the old clock model")
+            break
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        fish.DATA_DIR, fish.DATA_FILE = tmp, tmp / "fish_state.json"
+        fish.HISTORY_FILE, fish.LEGACY_HISTORY_FILE = tmp / "fish_history.bin", tmp / "fish_history.json"
+        state, now = pairs[0]
+        old_file = json.dumps(iso_state(state), indent=2)
+        fish.DATA_FILE.write_text(old_file)
+        loaded = fish.load_state()
+        if any(abs(loaded[f] - state[f]) > 1e-3 for f in fish.TIME_FIELDS):
+            failures.append("an ISO fish_state.json does not load as the same epoch times")
+
+        outputs = []
+        sys.argv = ["fish-tank.py"]
+        for _ in range(2):
+            fish.DATA_FILE.write_text(old_file)
+            out = io.StringIO()
+            stdin, sys.stdin = sys.stdin, io.StringIO()
+            with contextlib.redirect_stdout(out):
+                fish.main(clock=lambda: now + 3600.5)
+            sys.stdin = stdin
+            outputs.append(out.getvalue())
+        saved = json.loads(fish.DATA_FILE.read_text())
+        if outputs[0] != outputs[1] or any(not isinstance(saved[f], float) for f in fish.TIME_FIELDS):
+            failures.append("main() with an injected clock is not repeatable, or saves ISO times")
+
+    print(f'\nchecks: {"FAIL" if failures else "ok"}')
+    if failures:
+        print("\nFailures:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
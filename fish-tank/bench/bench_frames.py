@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Bytes per view with frames in a content-addressed FrameTable.
+
+Simulates --views views of one fish over --days days (fed at irregular
+times, a 50- or 60-column terminal), renders every frame with
+render_tank(), and stores the history two ways:
+
+  json        the old fish_history.json, pretty-printed with inline frames
+  ring v2     24-byte records keyed into the frame table, with keyframe
+              deltas, and the same table with every frame stored whole
+
+Then times appends and opening the table, and checks, exit 1 on a
+failure: every view replays to exactly the frame shown, also after
+reopening and through --replay; and a torn last table entry is dropped.
+
+Usage:
+  python3 bench/bench_frames.py
+  python3 bench/bench_frames.py --views 1000000 --days 365
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location("fish_tank", Path(__file__).resolve().parent.parent / "fish-tank.py")
+fish = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(fish)
+
+START = datetime(2026, 1, 1, 9).timestamp()
+
+
+def simulate(views, days, seed=0):
+    """The entries save_history() would have written for `views` views over `days` days."""
+    rng = random.Random(seed)
+    width = 60
+    state = fish.create_initial_state(START)
+    times = sorted(START + rng.random() * days * 86400 for _ in range(views))
+    next_feed = START + rng.uniform(4, 30) * 3600
+    entries = []
+    for now in times:
+        if now >= next_feed:
+            state["last_fed_time"] = now
+            next_feed = now + rng.uniform(4, 30) * 3600
+        if rng.random() < 0.01:
+            width = rng.choice((50, 60))
+        state = fish.update_state(state, now)
+        entries.append({"timestamp": now, "stage": fish.get_growth_stage(state, now),
+                        "is_sleeping": fish.is_sleeping(now), "hunger": state["hunger"],
+                        "happiness": state["happiness"], "frame": fish.render_tank(state, now, width)})
+    return entries
+
+
+def replays(ring, entries):
+    """Number of views whose kept record or frame differs from what was appended."""
+    kept = ring.tail(len(entries))
+    bad = len(entries) - len(kept)
+    for got, want in zip(kept, entries):
+        if ring.frame(got) != want["frame"] or any(got[k] != want[k] for k in want if k != "frame"):
+            bad += 1
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--views", type=int, default=100_000)
+    parser.add_argument("--days", type=float, default=90)
+    args = parser.parse_args()
+    failures = []
+
+    start = time.perf_counter()
+    entries = simulate(args.views, args.days)
+    distinct = {e["frame"] for e in entries}
+    print(f"{args.views} views over {args.days:g} days, {len(distinct)} distinct frames "
+          f"(rendered in {time.perf_counter() - start:.1f}s)\n")
+
+    sample = entries[:1000]
+    json_bytes = len(json.dumps([{**e, "timestamp": datetime.fromtimestamp(e["timestamp"]).isoformat()}
+                                 for e in sample], indent=2).encode("utf-8")) / len(sample)
+    whole = sum(len(zlib.compress(f.encode("utf-8"), 9)) + fish.FrameTable.ENTRY.size for f in distinct)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "h.bin"
+        with fish.HistoryRing(path, args.views) as ring:
+            start = time.perf_counter()
+            for e in entries:
+                ring.append(e)
+            append_us = (time.perf_counter() - start) / len(entries) * 1e6
+            keyframes = sum(1 for _, base, _ in ring.frames.index.values() if not base)
+            failures += [f"{bad} views do not replay" for bad in [replays(ring, entries)] if bad]
+        ring_bytes, table_bytes = path.stat().st_size, path.with_suffix(".frames").stat().st_size
+
+        start = time.perf_counter()
+        with fish.HistoryRing(path, args.views) as ring:
+            open_ms = (time.perf_counter() - start) * 1000
+            failures += [f"{bad} views do not replay after reopening" for bad in [replays(ring, entries)] if bad]
+
+        v2 = (ring_bytes + table_bytes) / args.views
+        print(f'{"format":<26} {"bytes/view":>10} {"vs json":>8}')
+        for label, size in (("json (old)", json_bytes), ("ring v2, frames whole", (ring_bytes + whole) / args.views),
+                            ("ring v2, keyframe deltas", v2)):
+            print(f"{label:<26} {size:>10.1f} {json_bytes / size:>7.0f}x")
+        print(f"\nframe table: {len(distinct)} frames, {keyframes} keyframes, {table_bytes / 1024:.0f} KiB "
+              f"({table_bytes / len(distinct):.0f} bytes/frame)")
+        print(f"append {append_us:.1f} µs/view on an open ring; opening ring and table {open_ms:.1f} ms")
+
+        # A crash halfway through writing a new frame leaves a partial last entry
+        with open(path.with_suffix(".frames"), "ab") as f:
+            f.write(fish.FrameTable.ENTRY.pack(1, 0, 500, 0) + b"\0" * 100)
+        with fish.HistoryRing(path, args.views) as ring:
+            if len(ring.frames) != len(distinct) or replays(ring, entries[-1000:]):
+                failures.append("a torn frame table entry is not dropped")
+            entries.append({**entries[-1], "frame": entries[-1]["frame"] + " "})
+            ring.append(entries[-1])
+            if ring.frame(ring.tail(1)[0]) != entries[-1]["frame"]:
+                failures.append("a frame appended after a torn entry does not replay")
+
+        # --replay as a user would run it (open_history() trims the ring to HISTORY_CAPACITY)
+        fish.HISTORY_FILE = path
+        for back in (1, min(fish.HISTORY_CAPACITY, args.views)):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                fish.replay(back)
+            if "\n" + entries[-back]["frame"] + "\n" not in out.getvalue():
+                failures.append(f"--replay {back} does not show the frame of that view")
+
+    print(f'\nchecks: {"FAIL" if failures else "ok"}')
+    if failures:
+        print("\nFailures:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""View-history appends: the ring buffer file against the old JSON list.
+
+For each retention (--capacities), a full history is prepared in a temp
+directory, then --appends views are timed:
+
+  json   the old save_history(): read fish_history.json, append, keep the
+         last N, rewrite it pretty-printed
+  ring   HistoryRing.append(): one record and one header write, plus a
+         frame table lookup
+
+and tail(10) (what show_history() reads) is timed on the full ring. Then
+checks, exit 1 on a failure: the tail after wrapping is the last views
+appended, a torn record is skipped instead of breaking the file, a
+capacity change keeps the newest views, and an old fish_history.json is
+imported once.
+
+Usage:
+  python3 bench/bench_history.py
+  python3 bench/bench_history.py --capacities 100 10000 1000000
+"""
+import argparse
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location("fish_tank", Path(__file__).resolve().parent.parent / "fish-tank.py")
+fish = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(fish)
+
+
+def make_entry(n):
+    now = 1_700_000_000.0 + n * 60
+    state = fish.create_initial_state(now)
+    state["happiness"] = n % 101
+    return {"timestamp": now, "stage": list(fish.GROWTH_STAGES)[n % 5],
+            "is_sleeping": n % 3 == 0, "hunger": n % 101, "happiness": state["happiness"],
+            "frame": fish.render_tank(state, now)}
+
+
+def json_append(path, entry, limit):
+    """The pre-ring save_history()."""
+    history = []
+    if path.exists():
+        with open(path, 'r') as f:
+            history = json.load(f)
+    history.append({**entry, "timestamp": datetime.fromtimestamp(entry["timestamp"]).isoformat()})
+    history = history[-limit:]
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2)
+
+
+def fill_ring(path, capacity, entry):
+    """A full ring of `capacity` copies of `entry`, written in bulk."""
+    with fish.HistoryRing(path, capacity) as ring:
+        record = ring._pack({**entry, "frame_key": ring.frames.put(entry["frame"])})
+        ring.file.seek(ring.HEADER.size)
+        chunk = record * 4096
+        for start in range(0, capacity, 4096):
+            ring.file.write(chunk[:min(4096, capacity - start) * len(record)])
+        ring.count = capacity
+        ring.file.seek(ring.COUNT_OFFSET)
+        ring.file.write(capacity.to_bytes(8, "little"))
+
+
+def views(ring, n):
+    """tail(n) with each frame looked up, to compare with the entries appended."""
+    return [{**{k: v for k, v in e.items() if k != "frame_key"}, "frame": ring.frame(e)} for e in ring.tail(n)]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for n in range(repeat):
+        fn(n)
+    return (time.perf_counter() - start) / repeat
+
+
+def checks(tmp):
+    failures = []
+    entries = [make_entry(n) for n in range(25)]
+    path = tmp / "check.bin"
+    with fish.HistoryRing(path, 10) as ring:
+        for entry in entries:
+            ring.append(entry)
+        if views(ring, 10) != entries[-10:] or views(ring, 3) != entries[-3:]:
+            failures.append("tail after wrapping is not the last views")
+        # Tear the oldest kept record, as a crash halfway through overwriting it would
+        ring.file.seek(ring.HEADER.size + (ring.count % ring.capacity) * ring.RECORD.size + 8)
+        ring.file.write(b"\xff" * 10)
+        ring.file.flush()
+        if views(ring, 10) != entries[-9:]:
+            failures.append("a torn record is not skipped")
+    with fish.HistoryRing(path, 4) as ring:
+        if ring.capacity != 4 or views(ring, 10) != entries[-4:]:
+            failures.append("shrinking the capacity lost the newest views")
+
+    fish.HISTORY_FILE, fish.LEGACY_HISTORY_FILE = tmp / "h.bin", tmp / "h.json"
+    with open(fish.LEGACY_HISTORY_FILE, "w") as f:
+        json.dump([{**e, "timestamp": datetime.fromtimestamp(e["timestamp"]).isoformat()} for e in entries], f)
+    with fish.open_history() as ring:
+        imported = views(ring, 100)
+    with fish.open_history() as ring:
+        again = len(ring)
+    if imported != entries[-fish.HISTORY_CAPACITY:] or again != len(imported) or fish.LEGACY_HISTORY_FILE.exists():
+        failures.append("fish_history.json not imported exactly once")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capacities", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    parser.add_argument("--appends", type=int, default=200)
+    args = parser.parse_args()
+
+    entry = make_entry(7)
+    print(f'{"retention":>10} {"json ms/view":>13} {"ring µs/view":>13} {"tail(10) µs":>12} {"ring MB":>8}')
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for capacity in args.capacities:
+            json_ms = "-"
+            if capacity <= 10_000:
+                path = tmp / f"h{capacity}.json"
+                with open(path, "w") as f:
+                    json.dump([{**entry, "timestamp": "2026-01-01T00:00:00"}] * capacity, f, indent=2)
+                repeat = max(3, min(args.appends, 2_000_000 // capacity))
+                json_ms = f"{timed(lambda n: json_append(path, entry, capacity), repeat) * 1000:.2f}"
+                path.unlink()
+
+            path = tmp / f"h{capacity}.bin"
+            path.with_suffix(".frames").unlink(missing_ok=True)
+            fill_ring(path, capacity, entry)
+            ring_us = timed(lambda n: fish.HistoryRing(path, capacity).append(entry), args.appends) * 1e6
+            with fish.HistoryRing(path, capacity) as ring:
+                tail_us = timed(lambda n: ring.tail(10), args.appends) * 1e6
+            size = path.stat().st_size / 2**20
+            path.unlink()
+            print(f"{capacity:>10} {json_ms:>13} {ring_us:>13.1f} {tail_us:>12.1f} {size:>8.1f}")
+
+        failures = checks(tmp)
+    print(f'\nchecks: {"FAIL" if failures else "ok"}')
+    if failures:
+        print("\nFailures:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""--live at its target frame rate: FPS, frame times, bytes and CPU.
+
+For a swimming adult, a hungry one and a sleeping one, at 60 columns and
+on a 200-column terminal, run_live() writes to /dev/null for --seconds
+and reports the achieved FPS, frame time percentiles (drawing and
+writing a frame), bytes per frame against reprinting the whole tank each
+frame, and CPU% of one core.
+
+Then checks, exit 1 on a failure: replaying the ANSI output on an
+emulated screen gives exactly the rows LiveTank drew, frame after frame;
+FPS is within 5% of --fps; CPU stays under --max-cpu.
+
+Usage:
+  python3 bench/bench_live.py
+  python3 bench/bench_live.py --fps 60 --seconds 10
+"""
+import argparse
+import os
+import re
+import sys
+
+from bench_frames import START, fish
+
+CURSOR = re.compile(r"\x1b\[(\d+);(\d+)H")
+
+
+def make_fish(age_days, fed_hours, hour):
+    """(state, now): a fish of that age, last fed that long ago, at `hour` o'clock."""
+    now = START + (hour - 9) * 3600
+    state = fish.create_initial_state(now - age_days * 86400)
+    state["last_fed_time"] = now - fed_hours * 3600
+    return state, now
+
+
+def apply(screen, data):
+    """Write ANSI cursor moves and text onto `screen` (a dict of row -> list of cells)."""
+    parts = CURSOR.split(data)
+    for row, col, text in zip(parts[1::3], parts[2::3], parts[3::3]):
+        cells = screen.setdefault(int(row) - 1, [])
+        col = int(col) - 1
+        cells.extend(" " * (col + len(text) - len(cells)))
+        cells[col:col + len(text)] = text
+    return screen
+
+
+def replay_check(state, now, width, frames, fps):
+    tank = fish.LiveTank(state, width, lambda: now)
+    screen = {}
+    for n in range(frames):
+        apply(screen, tank.frame(n / fps))
+        shown = ["".join(screen.get(r, [])).rstrip() for r in range(len(tank.front))]
+        if shown != [row.rstrip() for row in tank.front]:
+            return f"width {width}: screen differs from the drawn rows at frame {n}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fps", type=float, default=fish.LIVE_FPS)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--max-cpu", type=float, default=0.05, help="share of one core to allow")
+    args = parser.parse_args()
+    failures = []
+
+    cases = [("swimming", (10, 2, 14)), ("hungry", (10, 20, 14)), ("sleeping", (10, 2, 23))]
+    print(f'{"fish":<10} {"width":>5} {"FPS":>6} {"p50 ms":>7} {"p95 ms":>7} {"p99 ms":>7} '
+          f'{"bytes/frame":>12} {"full redraw":>12} {"CPU":>6}')
+    with open(os.devnull, "wb") as sink:
+        for label, case in cases:
+            for width in (60, 200):
+                state, now = make_fish(*case)
+                stats = fish.run_live(state, args.fps, args.seconds, sink, width, lambda: now)
+                tank = fish.LiveTank(state, width, lambda: now)
+                tank.frame(0)
+                full = len(("\x1b[H" + "\n".join(tank.front)).encode("utf-8"))
+                ms = stats["frame_ms"]
+                print(f"{label:<10} {width:>5} {stats['fps']:>6.1f} {ms[0.5]:>7.3f} {ms[0.95]:>7.3f} "
+                      f"{ms[0.99]:>7.3f} {stats['bytes_per_frame']:>12.1f} {full:>12} {stats['cpu']:>6.1%}")
+                if stats["fps"] < args.fps * 0.95:
+                    failures.append(f"{label} at {width}: {stats['fps']:.1f} FPS")
+                if stats["cpu"] > args.max_cpu:
+                    failures.append(f"{label} at {width}: CPU {stats['cpu']:.1%}")
+                failure = replay_check(state, now, width, 600, args.fps)
+                if failure:
+                    failures.append(f"{label}: {failure}")
+
+    print(f'\nchecks: {"FAIL" if failures else "ok"}')
+    if failures:
+        print("\nFailures:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""population.py's vectorized step against the real rules, and its speed at a million fish.
+
+  current     --fish fish under the current balance for --days days
+  sweep       the same number of fish split between 12 parameter sets
+              (death_hours x hunger_per_hour x away_penalty)
+
+Each reports visits simulated per second and seconds for the whole run.
+
+Then checks, exit 1 on a failure: replaying every visit of a few thousand
+fish (three parameter sets, all caretaker profiles) through update_state(),
+render_status() and feed() gives exactly the final hunger, happiness,
+is_alive, visit count and starving time the arrays hold, and the same
+count of each Mood and Satiety word and of hungry fish; survival curves
+never rise; and a --fish sweep finishes within --max-seconds.
+
+Usage:
+  python3 bench/bench_population.py
+  python3 bench/bench_population.py --fish 4000000 --days 180
+"""
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+spec = importlib.util.spec_from_file_location("population", Path(__file__).resolve().parent.parent / "population.py")
+population = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(population)
+fish = population.fish
+
+WORDS = (" Happy", " Okay", " Sad", " Full", " Hungry", " Starving!")
+
+
+def replay(params, visits):
+    """Final state and words shown for one fish's (hour, fed) visits, by the real functions."""
+    balance = dict(fish.BALANCE)
+    fish.BALANCE.update({key: int(params[key]) if float(params[key]).is_integer() else params[key]
+                         for key in balance})
+    try:
+        state = fish.create_initial_state(0.0)
+        shown = np.zeros(7, dtype=np.int64)
+        for hours, fed in visits:
+            now = hours * 3600
+            fish.update_state(state, now)
+            if state["is_alive"]:
+                status = fish.render_status(state, now)
+                mood, satiety = status.split("Mood:")[1], status.split("Satiety:")[1].split("\n")[0]
+                shown[:3] += [mood.split("\n")[0].endswith(word) for word in WORDS[:3]]
+                shown[3:6] += [satiety.endswith(word) for word in WORDS[3:]]
+                shown[6] += fish.is_hungry(state, now)
+            if fed:
+                fish.feed(state, now)
+        return state, shown
+    finally:
+        fish.BALANCE.update(balance)
+
+
+def check_rules(per_set, days):
+    """Differences between the arrays and replaying their visits one fish at a time."""
+    param_sets = population.parameter_sets(["death_hours=120,168", "away_penalty=10,25"])[:3]
+    trace = []
+    result = population.simulate(param_sets, per_set, days, seed=1, trace=trace)
+    visits = {}
+    for ids, hours, fed in trace:
+        for i, h, f in zip(ids.tolist(), hours.tolist(), fed.tolist()):
+            visits.setdefault(i, []).append((h, f))
+
+    failures = []
+    shown = np.zeros_like(result["shown"])
+    for i in range(len(result["group"])):
+        params = param_sets[result["group"][i]]
+        state, words = replay(params, visits.get(i, []))
+        shown[result["group"][i]] += words
+        starved = state["last_fed_time"] / 3600 + params["death_hours"]
+        death = starved if not state["is_alive"] or starved < days * 24 else np.inf
+        got = (result["hunger"][i], result["happiness"][i], result["alive"][i], result["views"][i])
+        want = (state["hunger"], state["happiness"], state["is_alive"], state["times_viewed"])
+        # Hours go through epoch seconds and back, so the starving time may be an ulp off
+        if got != want or not np.isclose(result["death"][i], death, rtol=0, atol=1e-9):
+            failures.append(f"fish {i}: arrays hold {got}, death at {result['death'][i]}h; update_state() "
+                            f"and feed() give {want}, death at {death}h")
+    if (shown != result["shown"]).any():
+        failures.append(f"words shown differ: arrays count {result['shown'].tolist()}, "
+                        f"render_status() gives {shown.tolist()}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fish", type=int, default=1_000_000)
+    parser.add_argument("--days", type=float, default=60)
+    parser.add_argument("--checked", type=int, default=1000, help="fish per parameter set replayed one by one")
+    parser.add_argument("--max-seconds", type=float, default=10)
+    args = parser.parse_args()
+    failures = []
+
+    print(f'{"run":<10} {"sets":>5} {"fish":>10} {"visits":>12} {"visits/s":>11} {"seconds":>8}')
+    sweep = ["death_hours=120,168,240", "hunger_per_hour=2,4", "away_penalty=5,10"]
+    for label, overrides in (("current", []), ("sweep", sweep)):
+        param_sets = population.parameter_sets(overrides)
+        per_set = args.fish // len(param_sets)
+        start = time.perf_counter()
+        result = population.simulate(param_sets, per_set, args.days)
+        summaries = population.summarize(result, param_sets, args.days)
+        seconds = time.perf_counter() - start
+        visits = int(result["views"].sum())
+        print(f"{label:<10} {len(param_sets):>5} {per_set * len(param_sets):>10,} {visits:>12,} "
+              f"{visits / seconds:>11,.0f} {seconds:>8.2f}")
+        if seconds > args.max_seconds:
+            failures.append(f"{label}: {seconds:.1f}s for {args.fish:,} fish")
+        if any(np.diff(s["survival"]).max() > 0 for s in summaries):
+            failures.append(f"{label}: a survival curve rises")
+
+    failures += check_rules(args.checked, min(args.days, 30))[:10]
+
+    print(f'\nchecks: {"FAIL" if failures else "ok"}')
+    if failures:
+        print("\nFailures:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Renders per second: the memoized render_tank() against the one it replaced.
+
+  repeat      the same fish re-rendered within a minute, as the feed loop
+              in main() does: cache hits after the first
+  new minute  every render in a minute not seen before: always a miss
+  views       the render of every view in a simulated 30 days of views
+              (bench_frames.simulate), in order
+
+The old renderer rebuilt every row, worked out the mood again for each
+row and reseeded the global random module. Then checks, exit 1 on a failure: every tank
+matches the old renderer's output for all stages, moods and widths over
+a day of minutes, and rendering leaves the global random state alone.
+
+Usage: python3 bench/bench_render.py [--renders 20000]
+"""
+import argparse
+import random
+import sys
+import time
+
+from bench_frames import START, fish, simulate
+
+
+def old_render_tank(state, now, width):
+    """render_tank() before the frame cache."""
+    tank_height = 12
+
+    lines = []
+    lines.append("+" + "-" * (width - 2) + "+")
+
+    if not state["is_alive"]:
+        fish_art = fish.FISH_ART_DEAD
+    else:
+        stage = fish.get_growth_stage(state, now)
+        arts = fish.FISH_ART_SLEEP if fish.is_sleeping(now) else fish.FISH_ART_HUNGRY if fish.is_hungry(state, now) \
+            else fish.FISH_ART
+        fish_art = arts.get(stage, arts["adult"])
+    fish_width = max(len(line) for line in fish_art)
+
+    random.seed(int(now / 60))
+    fish_x = random.randint(5, width - fish_width - 5)
+    fish_y = random.randint(2, 5)
+
+    bubbles = [] if not state["is_alive"] else ["z", "Z"] if fish.is_sleeping(now) else [".", "o", "O"]
+    bubble_positions = [(fish_x + fish_width, fish_y - i - 1) for i, _ in enumerate(bubbles)]
+
+    for y in range(tank_height - 3):
+        line = "|"
+        content = [" "] * (width - 2)
+        if 0 <= y - fish_y < len(fish_art):
+            fish_line = fish_art[y - fish_y]
+            for i, c in enumerate(fish_line):
+                if 0 <= fish_x + i < width - 2:
+                    content[fish_x + i] = c
+        for (bx, by), bubble in zip(bubble_positions, bubbles):
+            if y == by and 0 <= bx < width - 2:
+                content[bx] = bubble
+        if fish.is_sleeping(now) and state["is_alive"]:
+            line += "".join(content).replace(" ", ".")
+        else:
+            line += "".join(content)
+        line += "|"
+        lines.append(line)
+
+    for d in fish.get_decoration(width):
+        lines.append("|" + d.center(width - 2)[:width - 2] + "|")
+    lines.append("+" + "-" * (width - 2) + "+")
+    return "\n".join(lines)
+
+
+def rate(render, calls):
+    """Renders per second of render(n) for n in range(calls), with an empty frame cache."""
+    fish.draw_tank.cache_clear()
+    start = time.perf_counter()
+    for n in range(calls):
+        render(n)
+    return calls / (time.perf_counter() - start)
+
+
+def check():
+    failures = []
+    for width in (24, 50, 60):
+        for age_days in (0.5, 2, 5, 10, 40):
+            for fed_hours in (1, 10, 60, 200):
+                state = fish.create_initial_state(START - age_days * 86400)
+                state["last_fed_time"] = START - fed_hours * 3600
+                state["is_alive"] = fed_hours < 168
+                for minute in range(0, 1440, 7):
+                    now = START + minute * 60
+                    if fish.render_tank(state, now, width) != old_render_tank(state, now, width):
+                        failures.append(f"width {width}, {age_days} days, fed {fed_hours}h ago, minute {minute}: "
+                                        "tank differs from the old renderer")
+                        break
+    random.seed(7)
+    before = random.getstate()
+    fish.draw_tank.cache_clear()
+    fish.render_tank(state, START, 60)
+    if random.getstate() != before:
+        failures.append("render_tank() changes the global random state")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=20_000)
+    args = parser.parse_args()
+
+    entries = simulate(args.renders, 30)
+    state = fish.create_initial_state(START)
+
+    def repeat(n):
+        return START + 86400
+
+    def new_minute(n):
+        return START + n * 60
+
+    def view(n):
+        return entries[n]["timestamp"]
+
+    print(f'{"scenario":<12} {"old/s":>9} {"cached/s":>9} {"speedup":>8} {"hit rate":>9}')
+    for label, tick in (("repeat", repeat), ("new minute", new_minute), ("views", view)):
+        old = rate(lambda n: old_render_tank(state, tick(n), 60), args.renders)
+        new = rate(lambda n: fish.render_tank(state, tick(n), 60), args.renders)
+        info = fish.draw_tank.cache_info()
+        print(f"{label:<12} {old:>9.0f} {new:>9.0f} {new / old:>7.1f}x {info.hits / args.renders:>9.1%}")
+
+    failures = check()
+    print(f'\nchecks: {"FAIL" if failures else "ok"}')
+    if failures:
+        print("\nFailures:\n  " + "\n  ".join(failures[:10]))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""fast_forward() against applying the schedule view by view and ticking minute by minute.
+
+For --fish caretakers (visits at random gaps, each profile with its own
+mean gap, chance of feeding on a visit and of going away for days) over
+--days days each:
+
+  events     fast_forward(): jumps from one queued event to the next
+  views      update_state() / feed() at each action, nothing in between
+             (no timeline, the floor for any simulator)
+  ticking    the same rules evaluated every minute to find when things
+             happen (on the first --ticked fish only)
+
+Then checks, exit 1 on a failure: every view leaves exactly the hunger,
+happiness and is_alive that update_state() gives, and so does the final
+state; and ticking finds the same stage, hunger, death and sleep events,
+each within a minute after the time fast_forward() gives.
+
+Usage:
+  python3 bench/bench_simulate.py
+  python3 bench/bench_simulate.py --fish 2000 --days 365
+"""
+import argparse
+import random
+import sys
+import time
+
+from bench_frames import START, fish
+
+
+def make_schedule(rng, days):
+    """Visits at random gaps; some of them feed the fish, as pressing [f] after looking does."""
+    mean_gap = rng.choice((2, 4, 8, 12, 24))
+    feed_chance = rng.choice((0.3, 0.6, 0.9))
+    actions, t = [], START
+    while True:
+        t += rng.expovariate(1 / (mean_gap * 3600))
+        if rng.random() < 0.002:
+            t += rng.uniform(2, 10) * 86400
+        if t > START + days * 86400:
+            return actions
+        actions.append((t, "view"))
+        if rng.random() < feed_chance:
+            actions.append((t, "feed"))
+
+
+def by_view(state, actions):
+    """update_state() / feed() at each action: the view points fast_forward() must match."""
+    state = dict(state)
+    views = []
+    for t, action in actions:
+        if action == "view":
+            fish.update_state(state, t)
+            views.append((state["hunger"], state["happiness"], state["is_alive"]))
+        else:
+            fish.feed(state, t)
+    return state, views
+
+
+def by_ticking(state, actions, step=60):
+    """Events found by checking the fish every `step` seconds: {kind: [times]}."""
+    state = dict(state)
+    events = {}
+    pending = list(actions)
+    last = {"stage": fish.get_growth_stage(state, START), "sleep": fish.is_sleeping(START),
+            "hungry": False, "starving": False}
+    dead = False
+    t = START
+    while pending:
+        t += step
+        while pending and pending[0][0] <= t:
+            when, action = pending.pop(0)
+            if action == "view":
+                fish.update_state(state, when)
+            else:
+                fish.feed(state, when)
+        if dead:
+            continue
+        hours = fish.get_hours_since_last_fed(state, t)
+        now = {"stage": fish.get_growth_stage(state, t), "sleep": fish.is_sleeping(t),
+               "hungry": hours > 8, "starving": hours > 48}
+        for kind in now:
+            if now[kind] != last[kind] and (kind in ("stage", "sleep") or now[kind]):
+                name = ("sleeps" if now[kind] else "wakes") if kind == "sleep" else kind
+                events.setdefault(name, []).append(t)
+        last = now
+        if hours > 168:
+            events.setdefault("dies", []).append(t)
+            dead = True
+    return events
+
+
+def same_events(timeline, ticked, step=60):
+    events = {}
+    for entry in timeline:
+        if entry["event"] not in ("view", "feed"):
+            events.setdefault(entry["event"], []).append(entry["time"])
+    # Ticking stops at the last action, so leave out the last minutes, where
+    # an event may be seen by one and not the other
+    cutoff = max(entry["time"] for entry in timeline) - 2 * step
+    for kind in set(events) | set(ticked):
+        times = [t for t in events.get(kind, []) if t <= cutoff]
+        found = [f for f in ticked.get(kind, []) if f <= cutoff + step]
+        extra = found[len(times):]
+        if (len(found) < len(times) or any(not 0 <= f - t <= step for f, t in zip(found, times))
+                or any(f <= cutoff for f in extra)):
+            return kind
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fish", type=int, default=500)
+    parser.add_argument("--days", type=float, default=180)
+    parser.add_argument("--ticked", type=int, default=5)
+    args = parser.parse_args()
+    failures = []
+    rng = random.Random(0)
+
+    fishes = [(fish.create_initial_state(START), make_schedule(rng, args.days)) for _ in range(args.fish)]
+    actions = sum(len(schedule) for _, schedule in fishes)
+    events = 0
+    start = time.perf_counter()
+    results = [fish.fast_forward(state, schedule) for state, schedule in fishes]
+    forward_s = time.perf_counter() - start
+    start = time.perf_counter()
+    references = [by_view(state, schedule) for state, schedule in fishes]
+    view_s = time.perf_counter() - start
+
+    for (state, timeline), (want_state, want_views) in zip(results, references):
+        events += len(timeline)
+        views = [(e["hunger"], e["happiness"], e["is_alive"]) for e in timeline if e["event"] == "view"]
+        if views != want_views or state != want_state:
+            failures.append(f"{state['name']}: views differ from update_state()")
+            break
+
+    start = time.perf_counter()
+    for (state, schedule), (_, timeline) in list(zip(fishes, results))[:args.ticked]:
+        kind = same_events(timeline, by_ticking(state, schedule))
+        if kind:
+            failures.append(f"{kind} events differ from ticking minute by minute")
+    tick_s = (time.perf_counter() - start) / min(args.ticked, args.fish) * args.fish
+
+    deaths = sum(1 for state, _ in results if not state["is_alive"])
+    print(f"{args.fish} fish over {args.days:g} days: {actions} actions, {events} timeline events, "
+          f"{deaths} starved\n")
+    print(f'{"simulator":<10} {"total s":>8} {"ms/fish":>8} {"ms/fish-month":>14}')
+    months = args.days / 30
+    for label, seconds in (("events", forward_s), ("views", view_s), ("ticking", tick_s)):
+        per_fish = seconds / args.fish * 1000
+        print(f"{label:<10} {seconds:>8.2f} {per_fish:>8.2f} {per_fish / months:>14.3f}")
+    print("(ticking extrapolated from the first", min(args.ticked, args.fish), "fish)")
+
+    print(f'\nchecks: {"FAIL" if failures else "ok"}')
+    if failures:
+        print("\nFailures:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,16 @@ ASCII Fish Tank Simulator
 A virtual pet fish that grows and changes over time.
 """
 
+import argparse
+import functools
+import hashlib
+import heapq
 import json
 import os
+import struct
 import sys
+import time
+import zlib
 from datetime import datetime
 from pathlib import Path
 import random
@@ -14,7 +21,29 @@ import random
 # Data file path
 DATA_DIR = Path.home() / ".claude" / "fish-data"
 DATA_FILE = DATA_DIR / "fish_state.json"
-HISTORY_FILE = DATA_DIR / "fish_history.json"
+HISTORY_FILE = DATA_DIR / "fish_history.bin"
+LEGACY_HISTORY_FILE = DATA_DIR / "fish_history.json"
+
+# How many views the history keeps; appending costs the same at any size
+HISTORY_CAPACITY = int(os.environ.get("FISH_HISTORY_CAPACITY", "100"))
+
+# State fields holding a time, in epoch seconds (ISO strings in local time before)
+TIME_FIELDS = ("birth_time", "last_fed_time", "last_viewed_time")
+
+# Rendered tanks kept in memory, by visual state (see visual_state())
+RENDER_CACHE_SIZE = 256
+
+# How fast the fish's needs change; population.py sweeps these
+BALANCE = {
+    "hunger_per_hour": 4,       # hunger points gained per hour since feeding
+    "away_hours": 24,           # happiness drops for every this many hours away...
+    "away_penalty": 10,         # ...by this much
+    "hungry_hours": 8,          # hungry this long after feeding
+    "starving_hours": 48,       # starving this long after feeding...
+    "starving_penalty": 20,     # ...losing this much happiness on each visit
+    "death_hours": 168,         # starves to death this long after feeding (7 days)
+    "feed_happiness": 10,       # happiness gained from a feeding
+}
 
 # Fish growth stages (in days)
 GROWTH_STAGES = {
@@ -95,13 +124,13 @@ def get_tank_width():
     except:
         return 50
 
-def create_initial_state():
-    """Create a new fish."""
+def create_initial_state(now):
+    """Create a new fish, born at `now` (epoch seconds)."""
     return {
         "name": generate_fish_name(),
-        "birth_time": datetime.now().isoformat(),
-        "last_fed_time": datetime.now().isoformat(),
-        "last_viewed_time": datetime.now().isoformat(),
+        "birth_time": now,
+        "last_fed_time": now,
+        "last_viewed_time": now,
         "times_viewed": 0,
         "is_alive": True,
         "happiness": 100,
@@ -115,11 +144,15 @@ def generate_fish_name():
     return random.choice(prefixes) + random.choice(suffixes)
 
 def load_state():
-    """Load fish state from file."""
+    """Load fish state from file, with ISO times from older files read as epoch seconds."""
     if DATA_FILE.exists():
         try:
             with open(DATA_FILE, 'r') as f:
-                return json.load(f)
+                state = json.load(f)
+            for field in TIME_FIELDS:
+                if isinstance(state.get(field), str):
+                    state[field] = datetime.fromisoformat(state[field]).timestamp()
+            return state
         except:
             pass
     return None
@@ -130,117 +163,352 @@ def save_state(state):
     with open(DATA_FILE, 'w') as f:
         json.dump(state, f, indent=2)
 
-def save_history(state, rendered_frame):
-    """Save viewing history."""
-    history = []
-    if HISTORY_FILE.exists():
+class FrameTable:
+    """Content-addressed store of rendered tank frames, each kept once.
+
+    A frame is filed under the first 8 bytes of its BLAKE2b hash, so the
+    many views that looked the same share one entry. It is stored
+    zlib-compressed with the latest keyframe as preset dictionary - a delta
+    against it, since frames differ little beyond where the fish swims - or
+    compressed on its own as a new keyframe when that comes out smaller.
+    Deltas only ever refer to a keyframe, so any frame is rebuilt from at
+    most two entries. The file is append-only; a torn last entry is dropped
+    on the next open.
+    """
+
+    MAGIC = b"FISHFRMS"
+    # frame key, keyframe key (0 for a keyframe itself), payload length, payload crc32
+    ENTRY = struct.Struct("<QQII")
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(self.MAGIC)
+        self.file = open(self.path, "r+b")
+        if self.file.read(len(self.MAGIC)) != self.MAGIC:
+            self.file.close()
+            raise ValueError(f"{self.path} is not a fish frame table")
+        # key -> (payload offset, keyframe key, payload length)
+        self.index = {}
+        self.keyframe = 0
+        data = self.file.read()
+        pos = 0
+        while pos + self.ENTRY.size <= len(data):
+            key, base, length, crc = self.ENTRY.unpack_from(data, pos)
+            payload = data[pos + self.ENTRY.size:pos + self.ENTRY.size + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            self.index[key] = (len(self.MAGIC) + pos + self.ENTRY.size, base, length)
+            if not base:
+                self.keyframe = key
+            pos += self.ENTRY.size + length
+        self.end = len(self.MAGIC) + pos
+        if pos < len(data):
+            self.file.truncate(self.end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def key(data):
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def put(self, frame):
+        """Store `frame` unless it is already kept; returns its key."""
+        data = frame.encode("utf-8")
+        key = self.key(data)
+        if key in self.index:
+            return key
+        payload, base = zlib.compress(data, 9), 0
+        if self.keyframe:
+            packer = zlib.compressobj(9, zdict=self._bytes(self.keyframe))
+            delta = packer.compress(data) + packer.flush()
+            if len(delta) < len(payload):
+                payload, base = delta, self.keyframe
+        self.file.seek(self.end)
+        self.file.write(self.ENTRY.pack(key, base, len(payload), zlib.crc32(payload)) + payload)
+        self.file.flush()
+        self.index[key] = (self.end + self.ENTRY.size, base, len(payload))
+        self.end += self.ENTRY.size + len(payload)
+        if not base:
+            self.keyframe = key
+        return key
+
+    def get(self, key):
+        """The frame stored under `key`, or None if it is not kept."""
+        if key not in self.index:
+            return None
+        return self._bytes(key).decode("utf-8")
+
+    def _bytes(self, key):
+        offset, base, length = self.index[key]
+        self.file.seek(offset)
+        payload = self.file.read(length)
+        if not base:
+            return zlib.decompress(payload)
+        unpacker = zlib.decompressobj(zdict=self._bytes(base))
+        return unpacker.decompress(payload) + unpacker.flush()
+
+class HistoryRing:
+    """Fixed-capacity view history: a small header, then `capacity` fixed-size records.
+
+    View n goes to slot n % capacity, so an append is one record write and
+    one header write however long the history is, and the last few views
+    are read straight from their slots. Each record carries a CRC, so a
+    write torn by a crash loses that one entry, not the file. Records refer
+    to their frame by key in a FrameTable (by default next to the ring, as
+    fish_history.frames).
+    """
+
+    MAGIC = b"FISHRING"
+    VERSION = 2
+    # magic, version, record size, capacity, views appended so far
+    HEADER = struct.Struct("<8sIIQQ")
+    COUNT_OFFSET = 24
+    # timestamp, stage, sleeping, hunger, happiness (both clamped to 0-255), frame key; then crc32
+    FIELDS = struct.Struct("<dBBBBQ")
+    RECORD = struct.Struct("<dBBBBQI")
+    STAGES = list(GROWTH_STAGES)
+
+    def __init__(self, path, capacity=HISTORY_CAPACITY, frames=None):
+        self.path = Path(path)
+        self.own_frames = frames is None
+        self.frames = FrameTable(self.path.with_suffix(".frames")) if frames is None else frames
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.RECORD.size, capacity, 0))
         try:
-            with open(HISTORY_FILE, 'r') as f:
-                history = json.load(f)
-        except:
+            self._open()
+        except ValueError:
+            if self.own_frames:
+                self.frames.close()
+            raise
+        if self.capacity != capacity:
+            self._resize(capacity)
+
+    def _open(self):
+        self.file = open(self.path, "r+b")
+        header = self.file.read(self.HEADER.size)
+        magic, version, record_size, self.capacity, self.count = (
+            self.HEADER.unpack(header) if len(header) == self.HEADER.size else (None, 0, 0, 0, 0))
+        if (magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD.size
+                or not self.capacity):
+            self.file.close()
+            raise ValueError(f"{self.path} is not a version {self.VERSION} fish history file")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def close(self):
+        self.file.close()
+        if self.own_frames:
+            self.frames.close()
+
+    def append(self, entry):
+        """Add one view ({timestamp (epoch seconds), stage, is_sleeping, hunger, happiness, frame}).
+
+        An entry already carrying a frame_key (as read() returns them) keeps
+        that frame without it being looked at.
+        """
+        if "frame_key" not in entry:
+            entry = {**entry, "frame_key": self.frames.put(entry.get("frame", ""))}
+        self.file.seek(self.HEADER.size + (self.count % self.capacity) * self.RECORD.size)
+        self.file.write(self._pack(entry))
+        # The record is complete before the count makes it visible
+        self.count += 1
+        self.file.seek(self.COUNT_OFFSET)
+        self.file.write(struct.pack("<Q", self.count))
+        self.file.flush()
+
+    def tail(self, n):
+        """The last `n` views, oldest first."""
+        return self.read(max(self.count - min(n, len(self)), 0), self.count)
+
+    def read(self, start, stop):
+        """Views start..stop-1 (numbered from the first ever appended) that are still kept.
+
+        Entries carry a frame_key; frame() gives the frame itself.
+        """
+        start = max(start, self.count - len(self))
+        entries = []
+        while start < stop:
+            slot = start % self.capacity
+            run = min(stop - start, self.capacity - slot)
+            self.file.seek(self.HEADER.size + slot * self.RECORD.size)
+            data = self.file.read(run * self.RECORD.size)
+            for offset in range(0, len(data) - self.RECORD.size + 1, self.RECORD.size):
+                entry = self._unpack(data[offset:offset + self.RECORD.size])
+                if entry is not None:
+                    entries.append(entry)
+            start += run
+        return entries
+
+    def frame(self, entry):
+        """The tank frame of a view read from the ring, exactly as it was shown; None if lost."""
+        return self.frames.get(entry["frame_key"])
+
+    def _pack(self, entry):
+        # A clock stepped back makes hunger negative, and an imported view may hold anything
+        hunger, happiness = (min(255, max(0, int(entry[name]))) for name in ("hunger", "happiness"))
+        fields = (entry["timestamp"], self.STAGES.index(entry["stage"]), bool(entry["is_sleeping"]),
+                  hunger, happiness, entry["frame_key"])
+        return self.RECORD.pack(*fields, zlib.crc32(self.FIELDS.pack(*fields)))
+
+    def _unpack(self, data):
+        timestamp, stage, sleeping, hunger, happiness, key, crc = self.RECORD.unpack(data)
+        if zlib.crc32(data[:self.FIELDS.size]) != crc or stage >= len(self.STAGES):
+            return None
+        return {"timestamp": timestamp, "stage": self.STAGES[stage], "is_sleeping": bool(sleeping),
+                "hunger": hunger, "happiness": happiness, "frame_key": key}
+
+    def _resize(self, capacity):
+        """Rewrite the file for a new capacity, keeping the most recent views that fit."""
+        self._rewrite(capacity, self.tail(capacity))
+
+    def _rewrite(self, capacity, entries):
+        self.file.close()
+        tmp = self.path.with_suffix(".tmp")
+        tmp.unlink(missing_ok=True)
+        with HistoryRing(tmp, capacity, self.frames) as ring:
+            for entry in entries:
+                ring.append(entry)
+        os.replace(tmp, self.path)
+        self._open()
+
+def open_history():
+    """The history ring, importing the old fish_history.json the first time.
+
+    A ring or frame table that cannot be read is moved aside (with a
+    .corrupt suffix) and history starts over, so a view still gets saved.
+    """
+    try:
+        ring = HistoryRing(HISTORY_FILE)
+    except ValueError as e:
+        print(f"  {e}; moved aside as .corrupt, starting a new history.", file=sys.stderr)
+        for path in (HISTORY_FILE, HISTORY_FILE.with_suffix(".frames")):
+            if path.exists():
+                path.replace(path.with_name(path.name + ".corrupt"))
+        ring = HistoryRing(HISTORY_FILE)
+    if LEGACY_HISTORY_FILE.exists() and ring.count == 0:
+        try:
+            with open(LEGACY_HISTORY_FILE, 'r') as f:
+                legacy = json.load(f)
+            for entry in legacy:
+                ring.append({**entry, "timestamp": datetime.fromisoformat(entry["timestamp"]).timestamp()})
+            LEGACY_HISTORY_FILE.rename(LEGACY_HISTORY_FILE.with_suffix(".json.bak"))
+        except (ValueError, KeyError, TypeError, OSError):
             pass
+    return ring
 
-    history.append({
-        "timestamp": datetime.now().isoformat(),
-        "stage": get_growth_stage(state),
-        "is_sleeping": is_sleeping(),
-        "hunger": state.get("hunger", 0),
-        "happiness": state.get("happiness", 100),
-        "frame": rendered_frame
-    })
-
-    # Keep only last 100 entries
-    history = history[-100:]
-
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
-
-def get_age_days(state):
+def save_history(state, rendered_frame, now):
+    """Save viewing history."""
+    with open_history() as ring:
+        ring.append({
+            "timestamp": now,
+            "stage": get_growth_stage(state, now),
+            "is_sleeping": is_sleeping(now),
+            "hunger": state.get("hunger", 0),
+            "happiness": state.get("happiness", 100),
+            "frame": rendered_frame
+        })
+
+def get_age_days(state, now):
     """Calculate fish age in days."""
-    birth = datetime.fromisoformat(state["birth_time"])
-    now = datetime.now()
-    return (now - birth).total_seconds() / 86400
+    return (now - state["birth_time"]) / 86400
 
-def get_growth_stage(state):
+def get_growth_stage(state, now):
     """Determine fish growth stage based on age."""
-    age = get_age_days(state)
+    age = get_age_days(state, now)
     for stage, (min_age, max_age) in GROWTH_STAGES.items():
         if min_age <= age < max_age:
             return stage
     return "elder"
 
-def get_hours_since_last_fed(state):
+def get_hours_since_last_fed(state, now):
     """Get hours since last feeding."""
-    last_fed = datetime.fromisoformat(state["last_fed_time"])
-    now = datetime.now()
-    return (now - last_fed).total_seconds() / 3600
+    return (now - state["last_fed_time"]) / 3600
 
-def get_hours_since_last_viewed(state):
+def get_hours_since_last_viewed(state, now):
     """Get hours since last viewing."""
-    last_viewed = datetime.fromisoformat(state["last_viewed_time"])
-    now = datetime.now()
-    return (now - last_viewed).total_seconds() / 3600
+    return (now - state["last_viewed_time"]) / 3600
 
-def is_sleeping():
+def is_sleeping(now):
     """Check if it's nighttime (fish sleeping)."""
-    hour = datetime.now().hour
+    hour = time.localtime(now).tm_hour
     return hour < 6 or hour >= 22  # Sleep between 10pm and 6am
 
-def is_hungry(state):
+def is_hungry(state, now):
     """Check if fish is hungry."""
-    hours_since_fed = get_hours_since_last_fed(state)
-    return hours_since_fed > 8
+    hours_since_fed = get_hours_since_last_fed(state, now)
+    return hours_since_fed > BALANCE["hungry_hours"]
 
-def is_very_hungry(state):
+def is_very_hungry(state, now):
     """Check if fish is very hungry (starving)."""
-    hours_since_fed = get_hours_since_last_fed(state)
-    return hours_since_fed > 48
+    hours_since_fed = get_hours_since_last_fed(state, now)
+    return hours_since_fed > BALANCE["starving_hours"]
 
-def update_state(state):
+def update_state(state, now):
     """Update fish state based on time passed."""
-    hours_away = get_hours_since_last_viewed(state)
+    hours_away = get_hours_since_last_viewed(state, now)
 
     # Update hunger
-    hours_since_fed = get_hours_since_last_fed(state)
-    state["hunger"] = min(100, int(hours_since_fed * 4))  # +4% per hour
+    hours_since_fed = get_hours_since_last_fed(state, now)
+    state["hunger"] = min(100, int(hours_since_fed * BALANCE["hunger_per_hour"]))
 
     # Update happiness based on visits and hunger
-    if hours_away > 24:
-        state["happiness"] = max(0, state["happiness"] - int(hours_away / 24) * 10)
+    if hours_away > BALANCE["away_hours"]:
+        penalty = int(hours_away / BALANCE["away_hours"]) * BALANCE["away_penalty"]
+        state["happiness"] = max(0, state["happiness"] - penalty)
 
-    if is_very_hungry(state):
-        state["happiness"] = max(0, state["happiness"] - 20)
+    if is_very_hungry(state, now):
+        state["happiness"] = max(0, state["happiness"] - BALANCE["starving_penalty"])
 
     # Fish dies if starving for too long (7 days without food)
-    if hours_since_fed > 168:  # 7 days
+    if hours_since_fed > BALANCE["death_hours"]:
         state["is_alive"] = False
 
     # Update view count and time
     state["times_viewed"] = state.get("times_viewed", 0) + 1
-    state["last_viewed_time"] = datetime.now().isoformat()
+    state["last_viewed_time"] = now
 
     return state
 
-def get_fish_art(state):
-    """Get appropriate fish ASCII art based on state."""
-    if not state["is_alive"]:
+def get_fish_art(stage, mood):
+    """Get appropriate fish ASCII art for a stage and mood (see visual_state())."""
+    if mood == "dead":
         return FISH_ART_DEAD
 
-    stage = get_growth_stage(state)
-
-    if is_sleeping():
+    if mood == "sleeping":
         return FISH_ART_SLEEP.get(stage, FISH_ART_SLEEP["adult"])
-    elif is_hungry(state):
+    elif mood == "hungry":
         return FISH_ART_HUNGRY.get(stage, FISH_ART_HUNGRY["adult"])
     else:
         return FISH_ART.get(stage, FISH_ART["adult"])
 
-def get_bubbles(state):
+def get_bubbles(mood):
     """Generate bubble patterns."""
-    if not state["is_alive"]:
+    if mood == "dead":
         return []
 
-    if is_sleeping():
+    if mood == "sleeping":
         return ["z", "Z"]  # Sleeping zzz
 
     return [".", "o", "O"]
@@ -258,32 +526,53 @@ def get_decoration(width):
 
     return [seaweed_line, rocks_line, sand]
 
-def render_tank(state):
-    """Render the complete fish tank."""
-    width = get_tank_width()
-    tank_height = 12
+@functools.lru_cache(maxsize=None)
+def tank_edges(width):
+    """The rows every tank of this width shares: top border, then decoration and bottom border."""
+    border = "+" + "-" * (width - 2) + "+"
+    bottom = ["|" + d.center(width - 2)[:width - 2] + "|" for d in get_decoration(width)]
+    return border, bottom + [border]
 
-    lines = []
+def visual_state(state, now, width=None):
+    """All a rendered tank depends on: (stage, mood, width, minute).
+
+    mood is "dead", "sleeping", "hungry" or "normal"; the stage of a dead
+    fish does not show, so it is None.
+    """
+    if not state["is_alive"]:
+        stage, mood = None, "dead"
+    else:
+        stage = get_growth_stage(state, now)
+        mood = "sleeping" if is_sleeping(now) else "hungry" if is_hungry(state, now) else "normal"
+    width = get_tank_width() if width is None else width
+    return stage, mood, width, int(now / 60)
+
+def render_tank(state, now, width=None):
+    """Render the complete fish tank."""
+    return draw_tank(*visual_state(state, now, width))
 
-    # Tank top
-    lines.append("+" + "-" * (width - 2) + "+")
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def draw_tank(stage, mood, width, minute):
+    """The tank for one visual state; the fish moves once a minute."""
+    tank_height = 12
+    top, bottom = tank_edges(width)
 
     # Get fish art
-    fish_art = get_fish_art(state)
+    fish_art = get_fish_art(stage, mood)
     fish_width = max(len(line) for line in fish_art)
 
-    # Calculate fish position (slightly randomized but consistent for session)
-    random.seed(int(datetime.now().timestamp() / 60))  # Changes every minute
-    fish_x = random.randint(5, width - fish_width - 5)
-    fish_y = random.randint(2, 5)
+    # Calculate fish position (slightly randomized but consistent for the minute)
+    rng = random.Random(minute)
+    fish_x = rng.randint(5, width - fish_width - 5)
+    fish_y = rng.randint(2, 5)
 
     # Generate bubbles
-    bubbles = get_bubbles(state)
+    bubbles = get_bubbles(mood)
     bubble_positions = [(fish_x + fish_width, fish_y - i - 1) for i, _ in enumerate(bubbles)]
 
     # Render tank body
+    lines = [top]
     for y in range(tank_height - 3):
-        line = "|"
         content = [" "] * (width - 2)
 
         # Add fish
@@ -299,32 +588,20 @@ def render_tank(state):
                 content[bx] = bubble
 
         # Night mode - darker background
-        if is_sleeping() and state["is_alive"]:
-            line += "".join(content).replace(" ", ".")
-        else:
-            line += "".join(content)
-
-        line += "|"
-        lines.append(line)
-
-    # Tank decoration (seaweed and rocks)
-    deco = get_decoration(width)
-    for d in deco:
-        padded = d.center(width - 2)[:width - 2]
-        lines.append("|" + padded + "|")
+        row = "".join(content)
+        if mood == "sleeping":
+            row = row.replace(" ", ".")
+        lines.append("|" + row + "|")
 
-    # Tank bottom
-    lines.append("+" + "-" * (width - 2) + "+")
+    return "\n".join(lines + bottom)
 
-    return "\n".join(lines)
-
-def render_status(state):
+def render_status(state, now):
     """Render fish status information."""
     lines = []
 
     name = state.get("name", "Fish")
-    stage = get_growth_stage(state)
-    age = get_age_days(state)
+    stage = get_growth_stage(state, now)
+    age = get_age_days(state, now)
 
     if not state["is_alive"]:
         lines.append(f"  {name} has passed away...")
@@ -350,11 +627,10 @@ def render_status(state):
     lines.append(f"  Mood:    [{happy_bar}] {happy_status}")
 
     # Time info
-    hour = datetime.now().hour
-    if is_sleeping():
+    if is_sleeping(now):
         lines.append(f"  Status: Sleeping... (Night time)")
-    elif is_hungry(state):
-        hours = get_hours_since_last_fed(state)
+    elif is_hungry(state, now):
+        hours = get_hours_since_last_fed(state, now)
         lines.append(f"  Status: Hungry! (Not fed for {hours:.1f}h)")
     else:
         lines.append(f"  Status: Swimming happily")
@@ -372,68 +648,424 @@ def render_commands():
   [f] Feed fish  [n] New fish  [h] History  [q] Quit
 """
 
-def feed_fish(state):
-    """Feed the fish."""
+def feed(state, now):
+    """Feed the fish without a word; False if it has passed away."""
     if not state["is_alive"]:
+        return False
+
+    state["last_fed_time"] = now
+    state["hunger"] = 0
+    state["happiness"] = min(100, state["happiness"] + BALANCE["feed_happiness"])
+    return True
+
+def feed_fish(state, now):
+    """Feed the fish."""
+    if not feed(state, now):
         print("  Cannot feed a fish that has passed away...")
         return state
 
-    state["last_fed_time"] = datetime.now().isoformat()
-    state["hunger"] = 0
-    state["happiness"] = min(100, state["happiness"] + 10)
     print(f"  {state['name']} happily eats the food! *gulp gulp*")
     return state
 
+def next_sleep_change(t):
+    """The first 06:00 or 22:00 local time after `t`."""
+    lt = time.localtime(t)
+    for day in range(3):
+        for hour in (6, 22):
+            change = time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday + day, hour, 0, 0, 0, 0, -1))
+            if change > t:
+                return change
+
+def fast_forward(state, actions):
+    """Play a schedule of actions on a copy of `state`, jumping from event to event.
+
+    `actions` are (time, "view" | "feed") pairs in epoch seconds. A view is
+    update_state() and a feed is feed(), as running the script and then
+    pressing [f] do. Between actions the fish only changes at known moments,
+    kept on a priority queue: reaching the next stage, getting hungry,
+    starving and starving to death (BALANCE hours after feeding), and
+    falling asleep or waking (22:00 and 06:00). Nothing is computed in between, so
+    months of schedule take milliseconds.
+
+    Returns (state after the last action, timeline). The timeline is a list of
+    dicts with "time" and "event": "view" (with the hunger, happiness
+    and is_alive it left), "feed" (with "fed", False for a dead fish),
+    "stage" (with the "stage" reached), "hungry", "starving", "dies",
+    "sleeps" or "wakes". The view that finds a fish starved records
+    is_alive False; "dies" marks the moment it happened.
+    """
+    state = dict(state)
+    actions = sorted(actions, key=lambda action: action[0])
+    if not actions:
+        return state, []
+    end = actions[-1][0]
+    # (time, 0 for actions so they go first at a tie, order, kind, last_fed_time it was scheduled for)
+    queue = [(t, 0, n, action, None) for n, (t, action) in enumerate(actions)]
+    order = len(queue)
+    dead = not state["is_alive"]
+
+    def push(t, kind, fed=None):
+        nonlocal order
+        if t <= end:
+            heapq.heappush(queue, (t, 1, order, kind, fed))
+            order += 1
+
+    def schedule_hunger(start):
+        fed = state["last_fed_time"]
+        for key, kind in (("hungry_hours", "hungry"), ("starving_hours", "starving"), ("death_hours", "dies")):
+            hours = BALANCE[key]
+            if fed + hours * 3600 > start:
+                push(fed + hours * 3600, kind, fed)
+
+    start = state["last_viewed_time"]
+    heapq.heapify(queue)
+    for min_age, _ in GROWTH_STAGES.values():
+        if state["birth_time"] + min_age * 86400 > start:
+            push(state["birth_time"] + min_age * 86400, "stage")
+    schedule_hunger(start)
+    push(next_sleep_change(start), "sleep")
+
+    timeline = []
+    while queue:
+        t, _, _, kind, fed = heapq.heappop(queue)
+        if kind == "view":
+            update_state(state, t)
+            timeline.append({"time": t, "event": "view", "hunger": state["hunger"],
+                             "happiness": state["happiness"], "is_alive": state["is_alive"]})
+        elif kind == "feed":
+            was_dead = dead
+            fed = feed(state, t)
+            timeline.append({"time": t, "event": "feed", "fed": fed})
+            if fed:
+                dead = False
+                schedule_hunger(t)
+                if was_dead:
+                    push(next_sleep_change(t), "sleep")
+        elif dead:
+            continue
+        elif kind == "stage":
+            timeline.append({"time": t, "event": "stage", "stage": get_growth_stage(state, t)})
+        elif kind == "sleep":
+            timeline.append({"time": t, "event": "sleeps" if is_sleeping(t) else "wakes"})
+            push(next_sleep_change(t), "sleep")
+        elif fed == state["last_fed_time"]:
+            # Hunger events of an earlier feeding are stale
+            timeline.append({"time": t, "event": kind})
+            dead = kind == "dies"
+    return state, timeline
+
+def regular_schedule(start, days, view_hours, feed_hours):
+    """A visit every `view_hours` and a feeding (a visit, then [f]) every `feed_hours`, for `days`."""
+    end = start + days * 86400
+    views = [start + n * view_hours * 3600 for n in range(1, int(days * 24 / view_hours) + 1)]
+    feeds = [start + n * feed_hours * 3600 for n in range(1, int(days * 24 / feed_hours) + 1)]
+    actions = [(t, "view") for t in sorted(set(views) | set(feeds)) if t <= end]
+    return actions + [(t, "feed") for t in feeds if t <= end]
+
+def print_timeline(state, timeline, start):
+    """Report of a fast_forward() run: what happened to the fish, day by day."""
+    words = {"hungry": "gets hungry", "starving": "is starving", "dies": "starves to death"}
+    for entry in timeline:
+        if entry["event"] in ("view", "feed", "sleeps", "wakes"):
+            continue
+        day = (entry["time"] - start) / 86400
+        when = datetime.fromtimestamp(entry["time"]).strftime("%a %H:%M")
+        what = f"grows into a {entry['stage']}" if entry["event"] == "stage" else words[entry["event"]]
+        print(f"  Day {day:5.1f}  {when}  {what}")
+    views = sum(1 for entry in timeline if entry["event"] == "view")
+    feeds = sum(1 for entry in timeline if entry["event"] == "feed")
+    end = timeline[-1]["time"] if timeline else start
+    alive = "alive" if state["is_alive"] else "dead"
+    print(f"\n  After {(end - start) / 86400:.1f} days, {views} views and {feeds} feedings: {state['name']} is "
+          f"{alive}, {get_growth_stage(state, end)}, hunger {state['hunger']}, happiness {state['happiness']}")
+
 def show_history():
     """Show viewing history."""
-    if not HISTORY_FILE.exists():
+    if not HISTORY_FILE.exists() and not LEGACY_HISTORY_FILE.exists():
         print("  No history yet.")
         return
 
     try:
-        with open(HISTORY_FILE, 'r') as f:
-            history = json.load(f)
+        with open_history() as ring:
+            history = ring.tail(10)
 
         print("\n  Recent History (last 10 entries):")
         print("  " + "-" * 40)
-        for entry in history[-10:]:
-            ts = datetime.fromisoformat(entry["timestamp"]).strftime("%Y-%m-%d %H:%M")
+        for back, entry in zip(range(len(history), 0, -1), history):
+            ts = datetime.fromtimestamp(entry["timestamp"]).strftime("%Y-%m-%d %H:%M")
             stage = entry.get("stage", "unknown")
             sleeping = " (sleeping)" if entry.get("is_sleeping") else ""
-            print(f"  {ts} - {stage}{sleeping}")
+            print(f"  {back:>2}. {ts} - {stage}{sleeping}")
         print("  " + "-" * 40)
+        print("  Replay one with: fish-tank.py --replay N")
     except:
         print("  Could not read history.")
 
-def main():
-    """Main function."""
+def replay(back):
+    """Show the tank exactly as it was `back` views ago (1 is the last view)."""
+    if not HISTORY_FILE.exists():
+        print("  No history yet.")
+        return
+    with open_history() as ring:
+        if not 1 <= back <= len(ring):
+            print(f"  Only the last {len(ring)} views are kept.")
+            return
+        entries = ring.read(ring.count - back, ring.count - back + 1)
+        frame = ring.frame(entries[0]) if entries else None
+    if frame is None:
+        print("  That view could not be read.")
+        return
+    entry = entries[0]
+    ts = datetime.fromtimestamp(entry["timestamp"]).strftime("%Y-%m-%d %H:%M")
+    sleeping = " (sleeping)" if entry["is_sleeping"] else ""
+    print(f"\n  {ts} - {entry['stage']}{sleeping}")
+    print(frame)
+    print(f"  Hunger: {entry['hunger']}  Happiness: {entry['happiness']}")
+
+# Frames per second of --live
+LIVE_FPS = 30
+
+class LiveTank:
+    """The tank animated in place for --live: the fish swims and bubbles rise.
+
+    A frame is a grid of one-character cells, kept as a list of row
+    strings. Each frame is drawn into a back buffer and compared with the
+    front one (what the terminal shows). Only runs of changed cells are
+    written, each after an ANSI cursor move, and then the buffers swap. A
+    frame where only the fish moved costs a few dozen bytes at any width.
+    """
+
+    # Columns per second; eggs and dead fish stay put
+    SPEED = {"normal": 6.0, "hungry": 10.0, "sleeping": 1.5, "dead": 0.0}
+    BUBBLE_EVERY = {"normal": 0.8, "hungry": 0.5, "sleeping": 1.5}
+    RISE = 2.0  # rows per second
+    # Cursor moves cost more than rewriting a short unchanged gap
+    GAP = 4
+    MIRROR = str.maketrans("<>()", "><)(")
+
+    def __init__(self, state, width=None, clock=time.time):
+        self.state = state
+        self.clock = clock
+        self.width = get_tank_width() if width is None else width
+        self.front = []
+        self.rng = random.Random()
+        self.x, self.y, self.heading = 5.0, 3, 1
+        self.bubbles = []
+        self.next_bubble = 0.0
+        self.checked = None
+        self.elapsed = 0.0
+
+    def frame(self, t):
+        """ANSI output that turns the previous frame into the one at `t` seconds."""
+        dt, self.elapsed = t - self.elapsed, t
+        if self.checked is None or t - self.checked >= 1:
+            self._look(t)
+        self._swim(t, dt)
+        rows = self._draw()
+        out = self._diff(rows)
+        self.front = rows
+        return out
+
+    def _look(self, t):
+        """Re-read what the fish looks like and its status, once a second."""
+        self.checked = t
+        now = self.clock()
+        self.stage, self.mood, _, _ = visual_state(self.state, now, self.width)
+        self.art = get_fish_art(self.stage, self.mood)[0]
+        top, bottom = tank_edges(self.width)
+        self.water = ("." if self.mood == "sleeping" else " ") * (self.width - 2)
+        self.header = ["  ASCII FISH TANK - live (Ctrl-C to stop)", top]
+        self.footer = bottom + render_status(self.state, now).split("\n")
+        if self.mood == "dead":
+            self.y = 0
+
+    def _swim(self, t, dt):
+        space = self.width - 2 - len(self.art)
+        if self.stage != "egg":
+            self.x += self.heading * self.SPEED[self.mood] * dt
+        if not 0 <= self.x <= space:
+            # Turn around at the glass, at a new depth
+            self.x = min(max(self.x, 0), space)
+            self.heading = -self.heading
+            self.y = self.rng.randint(2, 5)
+        for bubble in self.bubbles:
+            bubble[1] -= self.RISE * dt
+        self.bubbles = [b for b in self.bubbles if b[1] >= 0]
+        if self.mood in self.BUBBLE_EVERY and t >= self.next_bubble:
+            mouth = int(self.x) + len(self.art) if self.heading > 0 else int(self.x) - 1
+            self.bubbles.append([mouth, float(self.y - 1), self.y - 1])
+            self.next_bubble = t + self.BUBBLE_EVERY[self.mood]
+
+    def _draw(self):
+        cells = [list(self.water) for _ in range(9)]
+        art = self.art if self.heading > 0 or self.mood == "dead" else self.art[::-1].translate(self.MIRROR)
+        for i, c in enumerate(art):
+            if 0 <= int(self.x) + i < self.width - 2:
+                cells[self.y][int(self.x) + i] = c
+        for x, y, start in self.bubbles:
+            if 0 <= x < self.width - 2:
+                # A bubble grows as it rises; sleep bubbles are z, then Z
+                risen = start - int(y)
+                chars = "zZ" if self.mood == "sleeping" else ".oO"
+                cells[int(y)][x] = chars[min(risen, len(chars) - 1)]
+        return self.header + ["|" + "".join(row) + "|" for row in cells] + self.footer
+
+    def _diff(self, rows):
+        out = []
+        for r, row in enumerate(rows):
+            old = self.front[r] if r < len(self.front) else ""
+            if row == old:
+                continue
+            row, old = row.ljust(len(old)), old.ljust(len(row))
+            c = 0
+            while c < len(row):
+                if row[c] == old[c]:
+                    c += 1
+                    continue
+                end = gap = c + 1
+                while gap < len(row) and gap - end < self.GAP:
+                    if row[gap] != old[gap]:
+                        end = gap + 1
+                    gap += 1
+                out.append(f"\x1b[{r + 1};{c + 1}H{row[c:end]}")
+                c = end
+        return "".join(out)
+
+def percentile(values, q):
+    """The q-quantile (0-1) of a non-empty list, nearest rank."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def run_live(state, fps=LIVE_FPS, seconds=None, out=None, width=None, clock=time.time):
+    """Animate the tank at `fps` (> 0) until Ctrl-C or `seconds`; returns frame statistics.
+
+    With no frame drawn (`seconds` 0, or Ctrl-C before the first) the
+    statistics are all zero.
+    """
+    out = sys.stdout.buffer if out is None else out
+    tank = LiveTank(state, width, clock)
+    period = 1 / fps
+    frame_times, sizes = [], []
+    out.write(b"\x1b[?25l\x1b[2J")
+    start = deadline = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        while seconds is None or time.perf_counter() - start < seconds:
+            t = time.perf_counter()
+            data = tank.frame(t - start).encode("utf-8")
+            out.write(data)
+            out.flush()
+            frame_times.append(time.perf_counter() - t)
+            sizes.append(len(data))
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Behind schedule: drop the lost time rather than rush to catch up
+                deadline = time.perf_counter()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.write(f"\x1b[{len(tank.front) + 1};1H\x1b[?25h".encode("utf-8"))
+        out.flush()
+    wall = time.perf_counter() - start
+    if not sizes:
+        return {"frames": 0, "seconds": wall, "fps": 0.0, "frame_ms": dict.fromkeys((0.5, 0.95, 0.99), 0.0),
+                "first_bytes": 0, "bytes_per_frame": 0.0, "cpu": 0.0}
+    later = sizes[1:] or sizes
+    return {
+        "frames": len(sizes),
+        "seconds": wall,
+        "fps": len(sizes) / wall,
+        "frame_ms": {q: percentile(frame_times, q) * 1000 for q in (0.5, 0.95, 0.99)},
+        "first_bytes": sizes[0],
+        "bytes_per_frame": sum(later) / len(later),
+        "cpu": (time.process_time() - cpu) / wall,
+    }
+
+def print_live_stats(stats):
+    """Report of a run_live() session."""
+    ms = stats["frame_ms"]
+    print(f"  {stats['frames']} frames in {stats['seconds']:.1f}s: {stats['fps']:.1f} FPS, "
+          f"CPU {stats['cpu']:.1%}")
+    if not stats["frames"]:
+        return
+    print(f"  Frame time p50 {ms[0.5]:.2f} ms, p95 {ms[0.95]:.2f} ms, p99 {ms[0.99]:.2f} ms")
+    print(f"  {stats['bytes_per_frame']:.0f} bytes per frame after the first ({stats['first_bytes']} bytes)")
+
+def positive(text):
+    """argparse type: a float above zero."""
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be above 0, not {text}")
+    return value
+
+def main(clock=time.time):
+    """Main function; `clock` gives the time (epoch seconds), read once per command."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replay", type=int, metavar="N",
+                        help="show the tank as it was N views ago (1 = the last view) and exit")
+    parser.add_argument("--live", action="store_true", help="animate the tank in place until Ctrl-C")
+    parser.add_argument("--fps", type=positive, default=LIVE_FPS, help=f"frames per second of --live (default {LIVE_FPS})")
+    parser.add_argument("--seconds", type=float, help="stop --live after this long")
+    parser.add_argument("--simulate", type=float, metavar="DAYS",
+                        help="fast-forward your fish (or a new one) DAYS ahead under a regular schedule; "
+                             "nothing is saved")
+    parser.add_argument("--view-every", type=float, default=8, metavar="HOURS",
+                        help="hours between visits in --simulate (default 8)")
+    parser.add_argument("--feed-every", type=float, default=12, metavar="HOURS",
+                        help="hours between feedings in --simulate (default 12)")
+    args = parser.parse_args()
+    if args.replay is not None:
+        replay(args.replay)
+        return
+    if args.simulate is not None:
+        now = clock()
+        state = load_state() or create_initial_state(now)
+        state["last_viewed_time"] = max(state["last_viewed_time"], now)
+        actions = regular_schedule(now, args.simulate, args.view_every, args.feed_every)
+        started = time.perf_counter()
+        state, timeline = fast_forward(state, actions)
+        print_timeline(state, timeline, now)
+        print(f"  ({len(timeline)} events simulated in {(time.perf_counter() - started) * 1000:.1f} ms)")
+        return
+
     # Load or create state
+    now = clock()
     state = load_state()
 
     if state is None:
         print("\n  Welcome! A new fish egg has appeared in your tank!")
         print("  Take good care of it!\n")
-        state = create_initial_state()
+        state = create_initial_state(now)
     else:
-        hours_away = get_hours_since_last_viewed(state)
+        hours_away = get_hours_since_last_viewed(state, now)
         if hours_away > 24:
             print(f"\n  It's been {hours_away:.1f} hours since your last visit!")
-        state = update_state(state)
+        state = update_state(state, now)
 
     # Render the tank
-    tank = render_tank(state)
-    status = render_status(state)
+    width = get_tank_width()
+    tank = render_tank(state, now, width)
+    status = render_status(state, now)
+
+    if args.live:
+        save_state(state)
+        save_history(state, tank, now)
+        print_live_stats(run_live(state, args.fps, args.seconds, width=width, clock=clock))
+        return
 
     # Display
-    print("\n" + "=" * get_tank_width())
+    print("\n" + "=" * width)
     print("       ASCII FISH TANK")
-    print("=" * get_tank_width())
+    print("=" * width)
     print(tank)
     print(status)
 
     # Save state and history
     save_state(state)
-    save_history(state, tank)
+    save_history(state, tank, now)
 
     # Interactive mode if running in terminal
     if sys.stdin.isatty():
@@ -442,22 +1074,24 @@ def main():
         while True:
             try:
                 cmd = input("  > ").strip().lower()
+                now = clock()
                 if cmd == 'q':
                     print("  Goodbye! Take care of your fish!")
                     break
                 elif cmd == 'f':
-                    state = feed_fish(state)
+                    state = feed_fish(state, now)
                     save_state(state)
-                    print(render_tank(state))
-                    print(render_status(state))
+                    print(render_tank(state, now, width))
+                    print(render_status(state, now))
                 elif cmd == 'n':
                     confirm = input("  Start over with a new fish? (y/n): ").strip().lower()
                     if confirm == 'y':
-                        state = create_initial_state()
+                        now = clock()
+                        state = create_initial_state(now)
                         save_state(state)
                         print(f"\n  A new fish named {state['name']} has arrived!")
-                        print(render_tank(state))
-                        print(render_status(state))
+                        print(render_tank(state, now, width))
+                        print(render_status(state, now))
                 elif cmd == 'h':
                     show_history()
                 else:
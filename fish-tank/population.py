@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Fish Population Simulator
+Many fish and their caretakers at once, for tuning fish-tank.py's balance (requires NumPy).
+
+Every fish lives under the rules of update_state() and feed() with one
+parameter set (BALANCE and the GROWTH_STAGES boundaries of fish-tank.py,
+with any --set values on top). Each fish is also looked after by one
+caretaker profile, who visits at random gaps, feeds on some visits and
+now and then goes away for days. The whole population is held in NumPy
+arrays, one element per fish. Each step takes every fish on to its own
+next visit at once. Fish that have died or gone past --days leave the
+arrays, so a million fish take a few seconds.
+
+For each parameter set it reports:
+  survival    share of fish still alive on a day (starved to death
+              counts from the moment it happened, not from the next visit)
+  stages      share of fish that lived to reach each growth stage
+  visits      share of visits finding the fish Happy, Okay or Sad, and
+              Full, Hungry or Starving!, as render_status() puts it; and
+              drawn hungry (fed more than hungry_hours before)
+
+Usage:
+  python3 population.py                                    # the current balance
+  python3 population.py --set death_hours=120,168,240      # a sweep, one set per value
+  python3 population.py --set hunger_per_hour=2,4 --set away_penalty=5,10 --fish 1000000
+  python3 population.py --set stages=1/3/7/30,1/5/14/60 --json sweep.json
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+spec = importlib.util.spec_from_file_location("fish_tank", Path(__file__).resolve().parent / "fish-tank.py")
+fish = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(fish)
+
+# Caretakers: share of fish, mean hours between visits, chance of feeding
+# on a visit, chance of going away after a visit and for up to how many days
+PROFILES = {
+    "devoted": {"share": 0.2, "visit_hours": 6, "feed_chance": 0.7, "away_chance": 0.002, "away_days": 4},
+    "regular": {"share": 0.4, "visit_hours": 12, "feed_chance": 0.5, "away_chance": 0.01, "away_days": 7},
+    "casual": {"share": 0.3, "visit_hours": 24, "feed_chance": 0.5, "away_chance": 0.02, "away_days": 10},
+    "forgetful": {"share": 0.1, "visit_hours": 48, "feed_chance": 0.3, "away_chance": 0.05, "away_days": 14},
+}
+
+# Days to show on the survival curve
+CHECKPOINTS = (1, 3, 7, 14, 30, 60, 90, 180, 365)
+
+# What render_status() shows on a visit: the Mood and Satiety bars
+MOODS = ("happy", "okay", "sad")
+SATIETY = ("full", "hungry", "starving")
+
+
+def default_params():
+    """The balance fish-tank.py plays by, with the stage boundaries as "stages" (days)."""
+    return {**fish.BALANCE, "stages": tuple(min_age for min_age, _ in list(fish.GROWTH_STAGES.values())[1:])}
+
+
+def parameter_sets(overrides):
+    """Every combination of the --set values ("key=v1,v2"), on top of default_params()."""
+    base = default_params()
+    keys, choices = [], []
+    for override in overrides:
+        key, _, values = override.partition("=")
+        if key not in base:
+            raise SystemExit(f"Unknown parameter {key!r}; one of: {', '.join(base)}")
+        if key == "stages":
+            parsed = [tuple(float(day) for day in value.split("/")) for value in values.split(",")]
+            if any(len(stages) != len(base["stages"]) or list(stages) != sorted(stages) for stages in parsed):
+                raise SystemExit(f"stages takes {len(base['stages'])} rising days split by /, e.g. 1/3/7/30")
+        else:
+            parsed = [float(value) for value in values.split(",")]
+        keys.append(key)
+        choices.append(parsed)
+    return [{**base, **dict(zip(keys, combo))} for combo in itertools.product(*choices)]
+
+
+def simulate(param_sets, fish_per_set, days, profiles=PROFILES, seed=0, trace=None):
+    """Run `fish_per_set` new eggs per parameter set for `days` days, all in one population.
+
+    A fish starts as an egg at hour 0, fed and viewed. Each visit is
+    update_state(), then feed() with the profile's feed chance if the fish
+    is still alive; a fish found dead leaves the population. If `trace` is
+    a list, each step appends (fish ids, visit hours, fed) for checking
+    against the scalar rules.
+
+    Returns a dict of per-fish arrays: "group" (index into param_sets),
+    "profile" (index into profiles), "death" (hours after birth it starved,
+    inf if it lived to the end), "happiness", "hunger", "alive" (as the
+    last visit found it) and "views"; and "shown", visit counts per group
+    by MOODS, SATIETY and drawn hungry.
+    """
+    rng = np.random.default_rng(seed)
+    groups = len(param_sets)
+    n = groups * fish_per_set
+    horizon = days * 24.0
+    names = list(profiles)
+    shares = np.array([profiles[name]["share"] for name in names], dtype=float)
+
+    group = np.repeat(np.arange(groups), fish_per_set)
+    profile = rng.choice(len(names), n, p=shares / shares.sum())
+    result = {"group": group, "profile": profile, "death": np.full(n, np.inf), "happiness": np.zeros(n),
+              "hunger": np.zeros(n), "alive": np.ones(n, dtype=bool), "views": np.zeros(n, dtype=np.int64)}
+    # Per group: visits, happy, sad, full, not starving, drawn hungry
+    counts = np.zeros((groups, 6), dtype=np.int64)
+
+    # Per fish: its caretaker, its state and the rules that differ between sets (the
+    # rest stay plain numbers). Fish stay in order of their set, so each set is a slice.
+    rules = {}
+    for key in fish.BALANCE:
+        values = np.array([float(params[key]) for params in param_sets])
+        rules[key] = values[0] if (values == values[0]).all() else values[group]
+    live = {key: value for key, value in rules.items() if isinstance(value, np.ndarray)}
+    for key in ("visit_hours", "feed_chance", "away_chance", "away_days"):
+        live[key] = np.array([float(profiles[name][key]) for name in names])[profile]
+    live.update(id=np.arange(n), group=group, active=np.ones(n, dtype=bool), last_fed=np.zeros(n),
+                last_viewed=np.zeros(n), happiness=np.full(n, 100.0), views=np.zeros(n, dtype=np.int64))
+    live["t"] = rng.standard_exponential(n) * live["visit_hours"]
+
+    def finish(done, died):
+        """Write the final state of the fish at indices `done` and mark them inactive."""
+        ids, dead = live["id"][done], died[done]
+        last_fed, last_viewed = live["last_fed"][done], live["last_viewed"][done]
+        # Found dead, or starved after the last visit without anyone seeing
+        starved = last_fed + np.broadcast_to(rules["death_hours"], died.shape)[done]
+        result["death"][ids] = np.where(dead | (starved < horizon), starved, np.inf)
+        result["alive"][ids] = ~dead
+        result["hunger"][ids] = np.minimum(100, np.floor(
+            (last_viewed - last_fed) * np.broadcast_to(rules["hunger_per_hour"], died.shape)[done]))
+        result["happiness"][ids] = live["happiness"][done]
+        result["views"][ids] = live["views"][done]
+        live["active"][done] = False
+
+    finish(np.flatnonzero(live["t"] > horizon), np.zeros(n, dtype=bool))
+    edges = np.searchsorted(group, np.arange(groups + 1))
+    while True:
+        remaining = np.count_nonzero(live["active"])
+        if not remaining:
+            break
+        # Finished fish ride along (their results already written) until a fifth are done
+        if remaining * 5 < len(live["active"]) * 4:
+            keep = live["active"]
+            live = {key: value[keep] for key, value in live.items()}
+            rules.update((key, live[key]) for key in rules if key in live)
+            edges = np.searchsorted(live["group"], np.arange(groups + 1))
+        active, t = live["active"], live["t"]
+        since = t - live["last_fed"]
+        away = t - live["last_viewed"]
+
+        # update_state()
+        penalty = np.floor(away / rules["away_hours"]) * rules["away_penalty"] * (away > rules["away_hours"])
+        starving = since > rules["starving_hours"]
+        penalty += rules["starving_penalty"] * starving
+        happiness = np.maximum(0, live["happiness"] - penalty)
+        died = active & (since > rules["death_hours"])
+
+        # What render_status() shows, before any feeding
+        seen = active & ~died
+        hunger = np.floor(since * rules["hunger_per_hour"])
+        for column, mask in enumerate((seen, seen & (happiness > 70), seen & (happiness <= 30), seen & (hunger < 30),
+                                       seen & (hunger < 70), seen & (since > rules["hungry_hours"]))):
+            counts[:, column] += [np.count_nonzero(mask[a:b]) for a, b in zip(edges[:-1], edges[1:])]
+
+        # feed(), on a fish still alive
+        fed = seen & (rng.random(len(t)) < live["feed_chance"])
+        if trace is not None:
+            trace.append((live["id"][active], t[active], fed[active]))
+        live["happiness"] = np.minimum(100, happiness + rules["feed_happiness"] * fed)
+        live["last_fed"] = np.maximum(live["last_fed"], t * fed)
+        live["last_viewed"] = t
+        live["views"] += 1
+
+        # The caretaker's next visit, after a trip away now and then
+        gap = rng.standard_exponential(len(t)) * live["visit_hours"]
+        trip = np.flatnonzero(rng.random(len(t)) < live["away_chance"])
+        gap[trip] += rng.random(len(trip)) * live["away_days"][trip] * 24
+        live["t"] = t = t + gap
+        finish(np.flatnonzero(died | (active & (t > horizon))), died)
+
+    seen, happy, sad, full, fine, drawn = counts.T
+    result["shown"] = np.column_stack((happy, seen - happy - sad, sad, full, fine - full, seen - fine, drawn))
+    return result
+
+
+def summarize(result, param_sets, days, profiles=PROFILES):
+    """Survival curve, stage reach and mood shares for each parameter set (and the survival of each profile)."""
+    summaries = []
+    curve_days = np.arange(int(days) + 1)
+    for g, params in enumerate(param_sets):
+        mine = result["group"] == g
+        lived = np.sort(result["death"][mine] / 24)
+        curve = 1 - np.searchsorted(lived, curve_days, side="right") / len(lived)
+        stages = dict(zip(fish.GROWTH_STAGES, [0.0, *params["stages"]]))
+        shown = result["shown"][g] / max(1, result["shown"][g][:3].sum())
+        summaries.append({
+            "params": {k: list(v) if isinstance(v, tuple) else v for k, v in params.items()},
+            "fish": int(mine.sum()),
+            "survival": [round(float(share), 6) for share in curve],
+            "stages": {stage: float((lived > day).mean()) if day <= days else None for stage, day in stages.items()},
+            "mood": dict(zip(MOODS, map(float, shown[:3]))),
+            "satiety": dict(zip(SATIETY, map(float, shown[3:6]))),
+            "drawn_hungry": float(shown[6]),
+            "profiles": {name: float(np.isinf(result["death"][mine & (result["profile"] == p)]).mean())
+                         for p, name in enumerate(profiles)},
+            "views_per_fish": float(result["views"][mine].mean()),
+        })
+    return summaries
+
+
+def print_summary(summaries, days, swept):
+    """Tables of the summaries, one row per parameter set labelled by the swept values."""
+    def label(summary):
+        params = summary["params"]
+        return ", ".join(f"{key}={'/'.join(f'{d:g}' for d in params[key]) if key == 'stages' else f'{params[key]:g}'}"
+                         for key in swept) or "current balance"
+
+    width = max(16, *(len(label(s)) for s in summaries))
+    checkpoints = [day for day in CHECKPOINTS if day <= days]
+    print("\n  Survival (share alive on day)")
+    print(f'  {"":<{width}} ' + " ".join(f"{f'd{day}':>6}" for day in checkpoints))
+    for s in summaries:
+        print(f"  {label(s):<{width}} " + " ".join(f"{s['survival'][day]:>6.1%}" for day in checkpoints))
+
+    stages = list(fish.GROWTH_STAGES)[1:]
+    print("\n  Stage reached")
+    print(f'  {"":<{width}} ' + " ".join(f"{stage:>8}" for stage in stages))
+    for s in summaries:
+        cells = ("-" if s["stages"][stage] is None else f"{s['stages'][stage]:.1%}" for stage in stages)
+        print(f"  {label(s):<{width}} " + " ".join(f"{cell:>8}" for cell in cells))
+
+    print("\n  Visits finding the fish (Mood, then Satiety)")
+    print(f'  {"":<{width}} ' + " ".join(f"{name:>8}" for name in MOODS + SATIETY) + f' {"drawn hungry":>13}')
+    for s in summaries:
+        shares = [s["mood"][name] for name in MOODS] + [s["satiety"][name] for name in SATIETY]
+        print(f"  {label(s):<{width}} " + " ".join(f"{share:>8.1%}" for share in shares)
+              + f" {s['drawn_hungry']:>13.1%}")
+
+    profiles = list(summaries[0]["profiles"])
+    print(f"\n  Alive at day {days:g}, by caretaker")
+    print(f'  {"":<{width}} ' + " ".join(f"{name:>9}" for name in profiles))
+    for s in summaries:
+        print(f"  {label(s):<{width}} " + " ".join(f"{s['profiles'][name]:>9.1%}" for name in profiles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fish", type=int, default=1_000_000, help="fish in all, split evenly between the sets")
+    parser.add_argument("--days", type=float, default=60)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=V1,V2",
+                        help=f"values to sweep, for one of: {', '.join(default_params())}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the summaries, with full survival curves, here")
+    args = parser.parse_args()
+
+    param_sets = parameter_sets(args.set)
+    per_set = max(1, args.fish // len(param_sets))
+    started = time.perf_counter()
+    result = simulate(param_sets, per_set, args.days, seed=args.seed)
+    summaries = summarize(result, param_sets, args.days)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n  {per_set * len(param_sets):,} fish ({len(param_sets)} parameter set(s) x {per_set:,}) "
+          f"over {args.days:g} days, {int(result['views'].sum()):,} visits in {elapsed:.1f}s")
+    print_summary(summaries, args.days, [override.partition("=")[0] for override in args.set])
+    if args.json:
+        args.json.write_text(json.dumps(summaries, indent=2))
+        print(f"\n  Written to {args.json}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
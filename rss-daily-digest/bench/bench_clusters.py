@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Accuracy and speed of clustering.cluster() on known duplicate sets.
+
+Three checks, exit 1 if any fails:
+  known     hand-written headlines (English and Chinese) with the expected
+            clusters, plus mark_derivatives() keeping the first-party post
+            and keeping derivatives out of the Top 10 only
+  synthetic --events generated stories with 1-4 rewrites each (words dropped,
+            swapped, reordered) among unrelated items; pair precision and
+            recall must reach --min-precision / --min-recall
+  timing    --size items (10% rewrites) must cluster within --max-seconds
+
+Usage:
+  python3 bench/bench_clusters.py
+  python3 bench/bench_clusters.py --size 200000 --max-seconds 20
+"""
+import argparse
+import random
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_summary as gs  # noqa: E402
+from clustering import cluster  # noqa: E402
+from item_store import ItemStore  # noqa: E402
+
+# (category, source, sourceQuality, title + summary); the expected clusters are index groups
+KNOWN = [
+    ('news-media', 'The Verge', 3, 'OpenAI releases GPT-5.3 Codex with faster inference\n'
+     'OpenAI today released GPT-5.3 Codex, a coding model with 30% faster inference and a larger context window.'),
+    ('ai-company-blogs', 'OpenAI Blog', 5, 'Introducing GPT-5.3 Codex\n'
+     'Today we are releasing GPT-5.3 Codex, our coding model with 30% faster inference and a larger context window.'),
+    ('tech-blogs', 'Simon Willison', 4, 'Quoting the GPT-5.3 Codex announcement\n'
+     'OpenAI released GPT-5.3 Codex today: a coding model with 30% faster inference and a larger context window.'),
+    ('ai-research', 'arXiv cs.AI', 3, 'Sparse attention for long-context retrieval\n'
+     'We propose a sparse attention scheme that improves retrieval accuracy over long contexts.'),
+    ('github-releases', 'Claude Code Releases', 4, 'Claude Code v2.1.0\n'
+     'Claude Code 2.1.0 新增 worktree 并行会话支持，修复了 MCP 服务器重连问题。'),
+    ('news-media', '机器之心', 3, 'Claude Code 2.1.0 发布\n'
+     'Claude Code 2.1.0 新增 worktree 并行会话支持，并修复 MCP 服务器重连问题。'),
+    ('podcasts', 'Latent Space', 4, 'Building agents in production\n'
+     'A conversation about evaluation, tool use and failure modes of agents running in production.'),
+    ('github-releases', 'Claude Code Releases', 4, 'Claude Code v2.1.1\n'
+     'Claude Code 2.1.1 新增 worktree 并行会话支持，修复了 MCP 服务器重连问题。'),
+]
+KNOWN_CLUSTERS = [[0, 1, 2], [4, 5, 7]]
+# The next release note of the same repo (7) reads alike but is news of its own, not a derivative
+KNOWN_ORIGINALS = {0: 1, 2: 1, 5: 4}
+
+
+def check_known():
+    failures = []
+    got = cluster([text for *_, text in KNOWN])
+    if got != KNOWN_CLUSTERS:
+        failures.append(f'known clusters: got {got}, expected {KNOWN_CLUSTERS}')
+
+    store = ItemStore()
+    for i, (cat, source, quality, text) in enumerate(KNOWN):
+        title, summary = text.split('\n')
+        scores = {'relevance': 4, 'sourceQuality': quality, 'contentValue': 3, 'actionability': 3}
+        store.append(i, f'k{i}', True, title, f'https://example.com/{i}', source, cat, cat, '', summary,
+                     scores, gs.get_score_total(scores), '', None)
+    gs.mark_derivatives(store, list(range(len(store))))
+    expected = [KNOWN_ORIGINALS.get(i) for i in range(len(KNOWN))]
+    got = [None if link is None else int(link.rsplit('/', 1)[1]) for link in store.derivativeOf]
+    if got != expected:
+        failures.append(f'derivativeOf: got {got}, expected {expected}')
+
+    # Derivatives only stay out of the Top 10; the other boards rank them like any item
+    boards = {'smartPicks': {'size': 10}, 'all': {'size': 10}}
+    top10, others = gs.select_store_boards(store, list(range(len(store))), boards)
+    if set(top10) & set(KNOWN_ORIGINALS) or not set(others['all']) >= set(KNOWN_ORIGINALS):
+        failures.append(f'boards: Top 10 {top10}, other board {others["all"]}; '
+                        f'derivatives {sorted(KNOWN_ORIGINALS)} belong on the other board only')
+    return failures
+
+
+def make_corpus(events, noise, seed=0, vocab=20_000):
+    """Texts plus the ground-truth event of each (None for unrelated items)."""
+    rng = random.Random(seed)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10)))
+             for _ in range(vocab)]
+    texts, truth = [], []
+    for event in range(events):
+        base = rng.sample(words, 25)
+        for _ in range(rng.randint(2, 5)):
+            text = [w for w in base if rng.random() > 0.1]
+            text = [rng.choice(words) if rng.random() < 0.05 else w for w in text]
+            n = rng.randrange(len(text) - 3)
+            text[n:n + 3] = reversed(text[n:n + 3])
+            texts.append(' '.join(text))
+            truth.append(event)
+    for _ in range(noise):
+        texts.append(' '.join(rng.sample(words, 25)))
+        truth.append(None)
+    return texts, truth
+
+
+def pairs(groups):
+    return {pair for group in groups for pair in combinations(sorted(group), 2)}
+
+
+def score(texts, truth, threshold):
+    events = {}
+    for i, event in enumerate(truth):
+        if event is not None:
+            events.setdefault(event, []).append(i)
+    expected, got = pairs(events.values()), pairs(cluster(texts, threshold))
+    hit = len(expected & got)
+    return hit / len(got) if got else 1.0, hit / len(expected) if expected else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=2_000)
+    parser.add_argument('--threshold', type=float, default=gs.CLUSTERING['threshold'])
+    parser.add_argument('--min-precision', type=float, default=0.99)
+    parser.add_argument('--min-recall', type=float, default=0.95)
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--max-seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    failures = check_known()
+    print(f'known:     {len(KNOWN)} items, {len(KNOWN_CLUSTERS)} clusters — {"FAIL" if failures else "ok"}')
+
+    texts, truth = make_corpus(args.events, args.events * 5)
+    precision, recall = score(texts, truth, args.threshold)
+    ok = precision >= args.min_precision and recall >= args.min_recall
+    print(f'synthetic: {len(texts)} items, {args.events} events — precision {precision:.4f}, recall {recall:.4f}'
+          f' — {"ok" if ok else "FAIL"}')
+    if not ok:
+        failures.append(f'synthetic: precision {precision:.4f}, recall {recall:.4f}')
+
+    texts, _ = make_corpus(args.size // 35, args.size - args.size // 35 * 7 // 2, seed=1)
+    start = time.perf_counter()
+    found = cluster(texts, args.threshold)
+    seconds = time.perf_counter() - start
+    ok = seconds <= args.max_seconds
+    print(f'timing:    {len(texts)} items — {len(found)} clusters in {seconds:.2f}s — {"ok" if ok else "FAIL"}')
+    if not ok:
+        failures.append(f'timing: {seconds:.2f}s > {args.max_seconds}s')
+
+    if failures:
+        print('\nFailures:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Company classification throughput: per-rule substring scans vs the compiled table.
+
+Usage: python3 bench/bench_company.py [--items 1000000] [--extra-rules 0 200]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from company_rules import compile_rules, load_rules  # noqa: E402
+from generate_summary import CONFIG_DIR  # noqa: E402
+from bench_topk import SOURCES  # noqa: E402
+
+
+def linear_classify(rules, source, title, idx=-1):
+    """The old get_company() shape: walk every rule with `in` checks."""
+    lowered = title.lower()
+    for rule in rules:
+        if any(p in source for p in rule.get('source', [])) or \
+                any(p.lower() in lowered for p in rule.get('title', [])):
+            return rule['company'].format(idx=idx)
+    return source
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1_000_000)
+    parser.add_argument('--extra-rules', type=int, nargs='+', default=[0, 200])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = ['agent', 'ggml', 'release', 'Claude', 'model', 'benchmark', 'GGML', 'update', 'inference']
+    items = [(rng.choice(SOURCES), ' '.join(rng.choice(words) for _ in range(8)) + f' #{i}', i)
+             for i in range(args.items)]
+    base = load_rules(CONFIG_DIR / 'company-rules.json')
+
+    print(f'{args.items} items')
+    print(f'{"rules":>6} {"linear ms/1k":>13} {"compiled ms/1k":>15}')
+    for extra in args.extra_rules:
+        # Extra vendors go first so the linear walk pays for every one of them
+        rules = [{'company': f'vendor-{n}', 'source': [f'Vendor {n} Blog'], 'title': [f'vendor{n}x']}
+                 for n in range(extra)] + base
+        classify = compile_rules(rules)
+
+        start = time.perf_counter()
+        expected = [linear_classify(rules, s, t, i) for s, t, i in items]
+        linear = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = [classify(s, t, i) for s, t, i in items]
+        compiled = time.perf_counter() - start
+
+        assert got == expected, 'compiled classifier diverged from linear rules'
+        per_k = 1000 / args.items * 1000
+        print(f'{len(rules):>6} {linear * per_k:>13.3f} {compiled * per_k:>15.3f}')
+
+
+if __name__ == '__main__':
+    main()
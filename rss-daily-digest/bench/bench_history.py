@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Query latency of the multi-day history store (digest_store.py).
+
+Fills a fresh database with --days daily runs of --per-day scored synthetic
+items (bench/synth_items.py, skewed scores, every other one marked as
+derivative coverage), then times each query as the median of --repeat runs.
+Each Top-K result is checked against leaderboards.select_boards() over the
+same window in Python, and every board over the last run's day against the
+picks the daily run made (derivatives included on all but smartPicks);
+exits 1 on a mismatch.
+
+Usage:
+  python3 bench/bench_history.py
+  python3 bench/bench_history.py --days 365 --per-day 2000
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import digest_store  # noqa: E402
+import generate_summary as gs  # noqa: E402
+from item_store import ItemStore  # noqa: E402
+from leaderboards import DEFAULT_BOARDS, select_boards  # noqa: E402
+from synth_items import DIMENSIONS, SCORE_DISTRIBUTIONS, make_item, source_list  # noqa: E402
+
+END = datetime(2026, 2, 21, tzinfo=timezone.utc)
+
+
+def fill(conn, days, per_day, seed=0):
+    """Record the runs; returns the last run's {board name: item keys} as the daily run picks them."""
+    rng = random.Random(seed)
+    draw = SCORE_DISTRIBUTIONS['skewed']
+    sources = source_list()
+    for day in range(days, 0, -1):
+        run_at = END - timedelta(days=day - 1)
+        store = ItemStore()
+        for i in range(per_day):
+            item = make_item(rng, f'{day}-{i}', sources=sources)
+            item['pubDate'] = format_datetime(run_at - timedelta(seconds=rng.randrange(86400)), usegmt=True)
+            scores = {d: draw(rng) for d in DIMENSIONS}
+            gs.process_item(store, i, item)
+            store.scores[-1], store.total[-1] = scores, gs.get_score_total(scores)
+            if i % 2 == 1:
+                store.derivativeOf[-1] = store.link[-2]
+        digest_store.record_run(conn, store, range(len(store)), run_at.isoformat(), per_day, gs.CAP_KEYS)
+    picks = gs.store_picks(store, range(len(store)), DEFAULT_BOARDS)
+    return {name: [store.key[row] for row in rows] for name, rows in picks.items()}
+
+
+def expected(conn, start, end, board, name):
+    """The same board computed in Python from every row in the window."""
+    rows = conn.execute('SELECT * FROM items WHERE pubTs >= ? AND pubTs < ? ORDER BY firstRun, idx',
+                        (start, end)).fetchall()
+    if name == 'smartPicks':
+        rows = [row for row in rows if row['derivativeOf'] is None]
+    key_fns = {name: (lambda row, name=name: digest_store.json.loads(row['caps']).get(name))
+               for name in board.get('caps', {})}
+    return select_boards(rows, {'board': board}, key_fns, score=lambda r: r['total'],
+                         category=lambda r: r['categoryId'])['board']
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--per-day', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = digest_store.connect(Path(tmp) / 'digest.db')
+        start = time.perf_counter()
+        daily = fill(conn, args.days, args.per_day)
+        print(f'{args.days} runs x {args.per_day} items recorded in {time.perf_counter() - start:.2f}s')
+
+        end = END.timestamp() + 86400
+        queries = [('smartPicks', 90), ('smartPicks', 7), ('blogTop5', 90), ('podcastTop5', 90)]
+        print(f'\n{"query":<18} {"days":>5} {"rows":>5} {"ms":>8}  check')
+        for name, days in queries:
+            window = digest_store.window(days, end)
+            board = DEFAULT_BOARDS[name]
+            got, ms = timed(lambda: digest_store.top_k(conn, *window, board, name), args.repeat)
+            ok = [r['key'] for r in got] == [r['key'] for r in expected(conn, *window, board, name)]
+            if not ok:
+                failures.append(f'top {name}, {days} days: differs from select_boards()')
+            print(f'{"top " + name:<18} {days:>5} {len(got):>5} {ms:>8.2f}  {"ok" if ok else "FAIL"}')
+
+        # The last run's day (its pubDates fall in the 24h up to END) holds only that run's items
+        window = (int(END.timestamp()) - 86399, int(END.timestamp()) + 1)
+        derivatives, before = 0, len(failures)
+        for name, board in DEFAULT_BOARDS.items():
+            got = [r['key'] for r in digest_store.top_k(conn, *window, board, name)]
+            if got != daily[name]:
+                failures.append(f'top {name} over the last run: {got}, the daily run picked {daily[name]}')
+            if name != 'smartPicks':
+                derivatives += conn.execute(f'SELECT COUNT(*) FROM items WHERE derivativeOf IS NOT NULL AND key IN '
+                                            f'({", ".join("?" * len(got))})', got).fetchone()[0]
+        if not derivatives:
+            failures.append('the last run\'s category boards pick no derivative, so nothing checks them')
+        print(f'{"last run, boards":<18} {1:>5} {len(DEFAULT_BOARDS):>5} {"":>8}  '
+              f'{"ok" if len(failures) == before else "FAIL"} ({derivatives} derivatives on category boards)')
+        for period in ('day', 'week'):
+            window = digest_store.window(90, end)
+            got, ms = timed(lambda: digest_store.source_trends(conn, *window, ['OpenAI Blog'], period), args.repeat)
+            print(f'{"trends " + period:<18} {90:>5} {len(got):>5} {ms:>8.2f}')
+        got, ms = timed(lambda: digest_store.source_trends(conn, *digest_store.window(90, end), None, 'week'),
+                        max(1, args.repeat // 4))
+        print(f'{"trends all/week":<18} {90:>5} {len(got):>5} {ms:>8.2f}')
+        conn.close()
+
+    if failures:
+        print('\nFailures:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
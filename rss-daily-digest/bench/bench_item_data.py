@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Cold-start cost of ITEM_DATA: a Python dict literal vs item-data.json + pack (item_data.py).
+
+For each size, synthetic entries shaped like real ones (Chinese summary,
+scores, reason) are written both as a module holding the literal and as
+item-data.json. Every measurement is a fresh interpreter, best of --repeat:
+
+  literal compile   import the module with no .pyc (first run after each edit)
+  literal .pyc      import it again from the cached bytecode
+  json.load         parse the whole JSON file
+  pack build        compile the JSON into the pack (once per edit)
+  pack + N gets     open the pack and look up --lookups entries
+
+Usage:
+  python3 bench/bench_item_data.py
+  python3 bench/bench_item_data.py --sizes 1000 50000 200000 --lookups 300
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SKILL_DIR = Path(__file__).resolve().parent.parent
+
+TIMER = '''
+import sys, time
+sys.path.insert(0, {skill!r}); sys.path.insert(0, {tmp!r})
+t = time.perf_counter()
+{body}
+print(time.perf_counter() - t)
+'''
+
+
+def make_entries(count, seed=0):
+    rng = random.Random(seed)
+    chars = '模型发布推理速度开发者工具代码智能体性能更新支持评测开源框架部署接口'
+    entries = {}
+    for i in range(count):
+        entry = {'summary': ''.join(rng.choice(chars) for _ in range(rng.randint(60, 160)))}
+        if rng.random() < 0.2:
+            entry['scores'] = {d: rng.randint(1, 5)
+                               for d in ('relevance', 'sourceQuality', 'contentValue', 'actionability')}
+            entry['scoreReason'] = ''.join(rng.choice(chars) for _ in range(rng.randint(40, 100)))
+        entries[f'{i:016x}'] = entry
+    return entries
+
+
+def timed(tmp, body, repeat, flags=()):
+    code = TIMER.format(skill=str(SKILL_DIR), tmp=str(tmp), body=body)
+    return min(float(subprocess.run([sys.executable, *flags, '-c', code], check=True, capture_output=True,
+                                    text=True).stdout) for _ in range(repeat))
+
+
+def measure(count, lookups, repeat, tmp):
+    entries = make_entries(count)
+    module = tmp / f'literal_{count}.py'
+    module.write_text(f'ITEM_DATA = {entries!r}\n', encoding='utf-8')
+    source = tmp / f'item-data-{count}.json'
+    source.write_text(json.dumps(entries, ensure_ascii=False, indent=2),
+                      encoding='utf-8')
+    pack = source.with_suffix('.pack')
+    keys = random.Random(1).sample(list(entries), min(lookups, count))
+
+    results = {}
+    # -B: never write a .pyc, so every run compiles the literal
+    results['literal compile'] = timed(tmp, f'import {module.stem}', repeat, ('-B',))
+    timed(tmp, f'import {module.stem}', 1)
+    results['literal .pyc'] = timed(tmp, f'import {module.stem}', repeat)
+    results['json.load'] = timed(tmp, f'import json; json.load(open({str(source)!r}, encoding="utf-8"))', repeat)
+    results['pack build'] = timed(tmp, f'import item_data; item_data.build_pack({str(source)!r}, {str(pack)!r})',
+                                  repeat)
+    results[f'pack + {len(keys)} gets'] = timed(
+        tmp, f'import item_data\nd = item_data.ItemData({str(source)!r}, {str(pack)!r})\n'
+             f'for k in {keys!r}: assert d.get(k)', repeat)
+    sizes = {'.py': module.stat().st_size, '.json': source.stat().st_size, '.pack': pack.stat().st_size}
+    return results, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 50_000])
+    parser.add_argument('--lookups', type=int, default=200, help='entries a run looks up (a day is ~100-300)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.sizes:
+            results, sizes = measure(count, args.lookups, args.repeat, Path(tmp))
+            print(f'\n{count} entries  (' + ', '.join(f'{ext} {n / 1e6:.1f} MB' for ext, n in sizes.items()) + ')')
+            for name, seconds in results.items():
+                print(f'  {name:<18} {seconds * 1000:>9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Memory and allocations per item: per-item dicts (old run()) vs ItemStore rows.
+
+Every synthetic item gets a cached summary and scores so the whole pipeline
+is exercised. "retained" is what the processed representation holds once all
+items are built; "peak" is the tracemalloc peak over a full run() including
+leaderboards and writing the output (json.load of the input sets the floor).
+
+Usage: python3 bench/bench_items.py [--items 100000]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_summary as gs  # noqa: E402
+from item_store import ItemStore  # noqa: E402
+from synth_items import make_cache, write_items  # noqa: E402
+
+def legacy_item(i, item, cache):
+    """The per-item dict the old build_item() returned."""
+    key, info = gs.lookup_info(item, cache)
+    proc = {
+        'title': item.get('title', ''), 'link': item.get('link', ''),
+        'source': item.get('feedName', item.get('source', '')),
+        'categoryId': item.get('categoryId', ''), 'categoryName': item.get('categoryName', ''),
+        'pubDate': item.get('pubDate', ''),
+        'summary': info.get('summary', f"{item.get('feedName', '')} — {item.get('title', '')}"),
+        'isSmartPick': False, 'smartPickRank': None, '_idx': i, '_key': key, '_cached': bool(info),
+    }
+    if info.get('company'):
+        proc['company'] = info['company']
+    if info.get('scores'):
+        proc['scores'] = {**info['scores'], 'total': gs.get_score_total(info['scores'])}
+        proc['scoreReason'] = info.get('scoreReason', '')
+    return proc
+
+
+def legacy_entry(p, with_scores):
+    entry = {k: p[k] for k in ('title', 'link', 'source', 'categoryId', 'categoryName', 'pubDate', 'summary',
+                               'isSmartPick', 'smartPickRank')}
+    if with_scores and 'scores' in p:
+        entry['scores'] = p['scores']
+        entry['scoreReason'] = p.get('scoreReason', '')
+    return entry
+
+
+def legacy_run(in_path, out_path, cache):
+    """The old run(): dict per item, copied into every board and the output, one json.dump."""
+    raw_items = gs.load_items(in_path)['items']
+    processed = [legacy_item(i, item, cache) for i, item in enumerate(raw_items)]
+    top10, others = gs.select_leaderboards([p for p in processed if 'scores' in p])
+    for rank, p in enumerate(top10, 1):
+        p['isSmartPick'], p['smartPickRank'] = True, rank
+    output = {'summarizedAt': '', 'totalItems': len(raw_items), 'smartPickCount': len(top10)}
+    for name, picks in others.items():
+        output[name] = [legacy_entry(p, True) for p in picks]
+    output['items'] = [legacy_entry(p, p['isSmartPick']) for p in processed]
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+
+
+def retained(build):
+    """(bytes, blocks) still allocated after build() returns its result."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    del result
+    return sum(s.size_diff for s in stats), sum(s.count_diff for s in stats)
+
+
+def peak(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, top
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.items
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, out, pending = Path(tmp) / 'filtered.json', Path(tmp) / 'out.json', Path(tmp) / 'pending.json'
+        write_items(src, n)
+        raw = gs.load_items(src)['items']
+        cache = make_cache(raw)
+
+        def build_store():
+            store = ItemStore()
+            for i, item in enumerate(raw):
+                gs.process_item(store, i, item, cache)
+            return store
+
+        print(f'{n} items')
+        print(f'{"representation":<16} {"retained B/item":>16} {"blocks/item":>12}')
+        for name, build in (('dicts (old)', lambda: [legacy_item(i, it, cache) for i, it in enumerate(raw)]),
+                            ('ItemStore', build_store)):
+            size, blocks = retained(build)
+            print(f'{name:<16} {size / n:>16.1f} {blocks / n:>12.2f}')
+
+        del raw
+        print(f'\n{"full run":<16} {"wall s":>8} {"peak MiB":>9}')
+        # Both runs start with json.load of the input; its peak is the floor for either
+        for name, fn in (('load only', lambda: gs.load_items(src)),
+                         ('dicts (old)', lambda: legacy_run(src, out, cache)),
+                         ('ItemStore', lambda: gs.run(src, out, cache, pending))):
+            elapsed, top = peak(fn)
+            print(f'{name:<16} {elapsed:>8.2f} {top / (1 << 20):>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Serial vs category-sharded parallel processing (generate_summary.run(workers=N)).
+
+Two parts, exit 1 if any result differs from the serial path:
+  exactness  --trials small random corpora with few sources (so company caps
+             bite) and small pools, reduced with merge_boards() and compared
+             with select_store_boards() over all rows; shards run in-process,
+             so this part needs no spare cores
+  scaling    one --size corpus over --categories categories: the process
+             stage (map, transfer, merge) for each --workers count, with the
+             merged store and every leaderboard checked against serial
+
+Speed-up is bounded by the CPU count (printed); on a single core the
+parallel rows only show the pool's overhead.
+
+Usage:
+  python3 bench/bench_parallel.py
+  python3 bench/bench_parallel.py --size 500000 --categories 64 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_summary as gs  # noqa: E402
+import leaderboards  # noqa: E402
+from item_store import ItemStore  # noqa: E402
+from leaderboards import DEFAULT_BOARDS  # noqa: E402
+from synth_items import iter_items, make_cache  # noqa: E402
+
+BOARDS = {**DEFAULT_BOARDS, 'ai-companyTop3': {'size': 3, 'categories': ['ai-company-blogs'], 'caps': {'company': 1}}}
+
+
+def serial(raw_items, cache, boards):
+    store = gs.process_items(raw_items, dict(cache))
+    return store, gs.select_store_boards(store, store.scored_rows(), boards)
+
+
+def in_process(raw_items, cache, boards):
+    """process_parallel() with the shards run one after another in this process."""
+    shards = defaultdict(list)
+    for i, item in enumerate(raw_items):
+        shards[item.get('categoryId', '')].append(i)
+    cache = dict(cache)
+    gs._SHARED = (raw_items, cache, boards)
+    results = [gs._process_shard(indices) for indices in shards.values()]
+    gs._SHARED = None
+    store, pools = gs.merge_shards(raw_items, cache, list(shards.values()), results)
+    return store, gs.merge_boards(store, store.scored_rows(), pools, boards)
+
+
+def exactness(trials, seed=0):
+    rng = random.Random(seed)
+    failures = []
+    # Small pools make truncation, and so the fallback, common
+    pool_factor, leaderboards.POOL_FACTOR, gs.POOL_FACTOR = gs.POOL_FACTOR, 1, 1
+    try:
+        for trial in range(trials):
+            count = rng.randint(1, 400)
+            raw_items = list(iter_items(count, seed=trial, categories=rng.randint(1, 12), sources=rng.randint(1, 12)))
+            cache = make_cache(raw_items, seed=trial, scores=rng.choice(['uniform', 'skewed']),
+                               scored=rng.random())
+            if serial(raw_items, cache, BOARDS)[1] != in_process(raw_items, cache, BOARDS)[1]:
+                failures.append(f'exactness: trial {trial} ({count} items) differs from serial')
+    finally:
+        leaderboards.POOL_FACTOR = gs.POOL_FACTOR = pool_factor
+    return failures
+
+
+def scaling(size, categories, worker_counts):
+    raw_items = list(iter_items(size, categories=categories, sources=2000))
+    cache = make_cache(raw_items, scores='skewed', scored=0.5)
+    failures = []
+
+    start = time.perf_counter()
+    base_store, base_boards = serial(raw_items, cache, BOARDS)
+    base = time.perf_counter() - start
+    print(f'{"workers":>8} {"process s":>10} {"speed-up":>9}  check')
+    print(f'{"serial":>8} {base:>10.3f} {1:>8.2f}x  -')
+    for workers in worker_counts:
+        start = time.perf_counter()
+        store, pools = gs.process_parallel(raw_items, dict(cache), BOARDS, workers)
+        seconds = time.perf_counter() - start
+        boards = gs.merge_boards(store, store.scored_rows(), pools, BOARDS)
+        same_store = all(getattr(store, name) == getattr(base_store, name) for name in ItemStore.__slots__)
+        ok = same_store and boards == base_boards
+        if not ok:
+            failures.append(f'scaling: {workers} workers differ from serial')
+        print(f'{workers:>8} {seconds:>10.3f} {base / seconds:>8.2f}x  {"ok" if ok else "FAIL"}')
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trials', type=int, default=300)
+    parser.add_argument('--size', type=int, default=200_000)
+    parser.add_argument('--categories', type=int, default=32)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, 8, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    failures = exactness(args.trials)
+    print(f'exactness: {args.trials} random corpora — {"FAIL" if failures else "ok"}\n')
+    print(f'scaling: {args.size} items, {args.categories} categories, {os.cpu_count()} CPUs')
+    failures += scaling(args.size, args.categories, args.workers)
+
+    if failures:
+        print('\nFailures:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
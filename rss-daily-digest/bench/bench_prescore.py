@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Throughput and agreement of prescore.py's offline relevance pre-scorer.
+
+  throughput   Profile.score() over --items synthetic items (synth_items
+               descriptions, then every description at the 500 characters
+               rss-parser keeps), in items per second on one core
+  batching     similarity() of a whole batch must equal scoring each text
+               on its own (word pairs never cross an item boundary)
+  agreement    a labelled corpus made from the SKILL.md rubric: titles,
+               sources and descriptions written for each relevance level,
+               with 15% of the labels moved one level as a stand-in for
+               scorer disagreement; exact / within-one agreement,
+               borderline share and agreement on the confident rest, and
+               the same across thresholds
+
+Exits 1 when batching differs or throughput is under --min-rate.
+
+Usage:
+  python3 bench/bench_prescore.py
+  python3 bench/bench_prescore.py --items 500000 --min-rate 100000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from prescore import Profile, agreement, item_text, print_agreement  # noqa: E402
+from synth_items import iter_items  # noqa: E402
+
+TEMPLATES = {
+    5: (['Claude Code {v} adds {feature}', 'Cursor {v}: {feature}', 'GitHub Copilot now supports {feature}',
+         'Windsurf Wave {n} brings {feature}', 'Codex CLI {v} release', '{v}'],
+        ['Claude Code Releases', 'Cursor Changelog', 'GitHub Changelog', 'Windsurf Blog', 'OpenAI Codex Releases'],
+        ['The update ships {feature} for every plan.', 'Run the new command from the terminal today.']),
+    4: (['Introducing {model} in the Messages API', 'Agents SDK {v}: {feature}', 'Building an MCP server for {thing}',
+         '{model} image generation is now available', 'Gemini API adds {feature}', 'A new agent framework for {thing}'],
+        ['Anthropic News', 'OpenAI Blog', 'Google AI Blog', 'OpenAI Agents SDK', 'Simon Willison'],
+        ['Developers can call it from the LLM API with a single flag.', 'The AI agent can now use tools in parallel.']),
+    3: (['Running vLLM inference on Kubernetes', 'Serverless GPU pricing drops', 'A vector database for {thing}',
+         'Observability for {thing} deployments', 'Cloud regions for {thing}', 'Ollama {v} speeds up embeddings'],
+        ['AWS Blog', 'Vercel Blog', 'Hugging Face Blog', 'Cloudflare Blog', 'Pinecone Blog'],
+        ['The deployment guide covers scaling and cost.', 'Benchmarks compare throughput across GPU types.']),
+    2: (['{company} raises $40M for its AI chatbot', 'How generative AI is changing {thing}',
+         'The AI startup behind {thing}', 'Why machine learning teams struggle with {thing}'],
+        ['TechCrunch', 'The Verge', 'Bloomberg Technology', 'VentureBeat'],
+        ['Investors see artificial intelligence as the next platform.', 'The AI market keeps growing.']),
+    1: (['SpaceX launches {n} Starlink satellites', 'A survey of graph methods for {thing}', 'Rust {v} released',
+         '{company} reports quarterly earnings', 'Notes on {thing} from a weekend project'],
+        ['Hacker News', 'arXiv cs.LG', 'Rust Blog', 'Reuters Business', 'Personal Blog'],
+        ['The results beat the previous baseline.', 'Shares rose in early trading.']),
+}
+FILLER = ['The team published the full details on its website.', 'More information is in the linked post.',
+          'Several readers asked for a follow-up.', 'The change rolls out over the coming weeks.',
+          'Feedback is welcome on the forum.', 'Pricing stays the same for existing customers.']
+FILL = {'v': ['2.1.50', 'v0.9.3', '1.4', '3.0 beta'], 'n': ['3', '12', '10,000'],
+        'feature': ['background tasks', 'plan mode', 'multi-file edits', 'structured outputs', 'batch requests'],
+        'model': ['Claude Sonnet', 'GPT-5', 'Gemini 3', 'Imagen 4'],
+        'thing': ['retail', 'protein folding', 'search', 'customer support', 'logistics'],
+        'company': ['Acme', 'Globex', 'Initech', 'Umbrella']}
+
+
+def fill(rng, text):
+    return text.format(**{k: rng.choice(v) for k, v in FILL.items()})
+
+
+def make_labelled(count, seed=0, noise=0.15):
+    """(items, labels): rubric-shaped items per level, labels moved one level for `noise` of them."""
+    rng = random.Random(seed)
+    items, labels = [], []
+    for _ in range(count):
+        level = rng.choice(list(TEMPLATES))
+        titles, sources, topical = TEMPLATES[level]
+        sentences = [fill(rng, rng.choice(topical))] + rng.sample(FILLER, rng.randint(1, 5))
+        rng.shuffle(sentences)
+        items.append({'title': fill(rng, rng.choice(titles)), 'feedName': rng.choice(sources),
+                      'description': ' '.join(sentences)})
+        if rng.random() < noise:
+            level = min(5, max(1, level + rng.choice((-1, 1))))
+        labels.append(level)
+    return items, np.array(labels, dtype=np.float64)
+
+
+def rate(profile, items, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        profile.score(items)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=200_000)
+    parser.add_argument('--labelled', type=int, default=20_000)
+    parser.add_argument('--min-rate', type=float, default=100_000, help='items/s to require on the synthetic corpus')
+    args = parser.parse_args()
+    failures = []
+    profile = Profile()
+
+    items = list(iter_items(args.items))
+    chars = sum(len(item_text(item)) for item in items) / len(items)
+    long_items = [{**item, 'description': (item['description'] * 20)[:500]} for item in items]
+    synth_rate, long_rate = rate(profile, items), rate(profile, long_items)
+    print(f'{"corpus":<28} {"chars/item":>10} {"items/s":>10}')
+    print(f'{"synth_items":<28} {chars:>10.0f} {synth_rate:>10.0f}')
+    print(f'{"500-char descriptions":<28} {sum(len(item_text(i)) for i in long_items) / len(items):>10.0f} '
+          f'{long_rate:>10.0f}')
+    if synth_rate < args.min_rate:
+        failures.append(f'throughput {synth_rate:.0f} items/s is under {args.min_rate:.0f}')
+
+    labelled, labels = make_labelled(args.labelled)
+    texts = [item_text(item) for item in labelled[:2000]]
+    singles = [profile.similarity([text]) for text in texts]
+    sims, words = profile.similarity(texts)
+    batched = (np.array_equal(sims, np.vstack([s for s, _ in singles]))
+               and np.array_equal(words, np.concatenate([w for _, w in singles])))
+    if not batched:
+        failures.append('batched similarity differs from scoring items one at a time')
+    print(f'\nbatching: {"ok" if batched else "FAIL"}')
+
+    relevance, borderline, _ = profile.score(labelled)
+    print(f'\nLabelled corpus ({args.labelled} items, threshold {profile.threshold}, margin {profile.margin}):')
+    print_agreement(agreement(relevance, borderline, labels))
+
+    print(f'\n{"threshold":>9} {"exact":>7} {"within 1":>9} {"borderline":>11} {"confident exact":>16}')
+    for threshold in (0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.10):
+        profile.threshold = threshold
+        stats = agreement(*profile.score(labelled)[:2], labels)
+        print(f'{threshold:>9.2f} {stats["exact"]:>7.1%} {stats["withinOne"]:>9.1%} '
+              f'{stats["borderline"] / stats["items"]:>11.1%} {stats["confidentExact"]:>16.1%}')
+
+    if failures:
+        print('\nFailures:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
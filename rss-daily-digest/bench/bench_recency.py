@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""pubDate parsing, recency decay and time-window boards at scale.
+
+Over --items synthetic pubDates spread across a week (RFC 822 with GMT,
+named and numeric zones, ISO 8601 with Z or an offset, and a few empty or
+unparseable strings):
+
+  parse      time_index.parse_pub_date() against the email.utils /
+             fromisoformat() path it replaced; every result must match
+  rank       process_items() + select_store_boards() with decay off and
+             with a 24h half-life
+  windows    "hours" boards from a TimeIndex slice against filtering every
+             row and selecting again; the picks must match
+
+Exits 1 on a mismatch.
+
+Usage: python3 bench/bench_recency.py [--items 1000000]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_summary as gs  # noqa: E402
+import time_index  # noqa: E402
+from leaderboards import DEFAULT_BOARDS  # noqa: E402
+from synth_items import iter_items, make_cache  # noqa: E402
+from time_index import TimeIndex, parse_pub_date  # noqa: E402
+
+NOW = datetime(2026, 2, 21, 12, tzinfo=timezone.utc)
+ZONES = [timezone(timedelta(hours=h)) for h in (-8, -5, 1, 8, 9)] + [timezone(timedelta(hours=5, minutes=30))]
+NAMED = ['EST', 'PDT', 'UT']
+WINDOWS = (6, 12, 48)
+
+
+def make_dates(n, seed=0):
+    rng = random.Random(seed)
+    dates = []
+    for _ in range(n):
+        dt = NOW - timedelta(seconds=rng.randrange(7 * 86400))
+        shape = rng.random()
+        if shape < 0.5:
+            dates.append(format_datetime(dt, usegmt=True))
+        elif shape < 0.65:
+            dates.append(format_datetime(dt.astimezone(rng.choice(ZONES))))
+        elif shape < 0.7:
+            dates.append(format_datetime(dt.replace(tzinfo=None))[:-6] + ' ' + rng.choice(NAMED))
+        elif shape < 0.85:
+            dates.append(dt.isoformat(timespec='milliseconds').replace('+00:00', 'Z'))
+        elif shape < 0.99:
+            dates.append(dt.astimezone(rng.choice(ZONES)).isoformat())
+        else:
+            dates.append(rng.choice(['', 'yesterday', '2026-02-30T10:00:00Z']))
+    return dates
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1_000_000)
+    args = parser.parse_args()
+    failures = []
+
+    dates = make_dates(args.items)
+    fast, fast_s = timed(lambda: [parse_pub_date(d) for d in dates])
+    slow, slow_s = timed(lambda: [time_index._parse_slow(d) if d else None for d in dates])
+    if fast != slow:
+        failures.append(f'parse: {sum(a != b for a, b in zip(fast, slow))} dates differ from the stdlib')
+    print(f'{args.items} pubDates, {len(set(dates))} distinct, {fast.count(None)} unparseable\n')
+    print(f'{"parse":<22} {"seconds":>8} {"µs/date":>8}')
+    print(f'{"stdlib":<22} {slow_s:>8.2f} {slow_s / args.items * 1e6:>8.2f}')
+    print(f'{"parse_pub_date":<22} {fast_s:>8.2f} {fast_s / args.items * 1e6:>8.2f}')
+
+    items = list(iter_items(args.items))
+    for item, date in zip(items, dates):
+        item['pubDate'] = date
+    cache = make_cache(items, scores='skewed', scored=0.5)
+    gs.ITEM_DATA = {}
+    gs.RANK_TIME = NOW.timestamp()
+    boards = {**DEFAULT_BOARDS, **{f'last{h}h': {'size': 10, 'caps': {'company': 2}, 'hours': h} for h in WINDOWS}}
+
+    print(f'\n{"rank":<22} {"process s":>10} {"boards s":>9}')
+    for label, decay in (('no decay', {}), ('24h half-life', {'halfLifeHours': 24})):
+        gs.DECAY = decay
+        store, process_s = timed(gs.process_items, items, cache)
+        rows = store.scored_rows()
+        _, boards_s = timed(gs.select_store_boards, store, rows, DEFAULT_BOARDS)
+        print(f'{label:<22} {process_s:>10.2f} {boards_s:>9.3f}')
+
+    index, index_s = timed(TimeIndex, store.pubTs, rows)
+    print(f'\n{len(rows)} board candidates; TimeIndex built in {index_s:.2f}s')
+    print(f'{"window":<22} {"rows":>8} {"slice ms":>9} {"index ms":>9} {"filter ms":>10}  check')
+    for h in WINDOWS:
+        name = f'last{h}h'
+        start_ts = gs.window_start(boards[name])
+        window, slice_s = timed(index.between, start_ts)
+        got, got_s = timed(gs.store_picks, store, rows, {name: boards[name]}, index)
+
+        def brute():
+            spec = {k: v for k, v in boards[name].items() if k != 'hours'}
+            recent = [row for row in rows if store.pubTs[row] is not None and store.pubTs[row] >= start_ts]
+            return gs.store_picks(store, recent, {name: spec})
+        want, brute_s = timed(brute)
+        ok = got == want and all(store.pubTs[row] >= start_ts for row in got[name])
+        if not ok:
+            failures.append(f'{name}: windowed picks differ from filter-and-select')
+        print(f'{name:<22} {len(window):>8} {slice_s * 1000:>9.2f} {got_s * 1000:>9.1f} {brute_s * 1000:>10.1f}  '
+              f'{"ok" if ok else "FAIL"}')
+
+    if failures:
+        print('\nFailures:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Load test for serve.py over a synthetic corpus.
+
+Starts serve.py in a subprocess over a --size corpus (half the items
+cached with skewed scores) and drives it with --clients keep-alive
+connections for --seconds per request mix:
+
+  cached   leaderboards, the category list and first pages (made at build)
+  304      the same with If-None-Match, answered without a body
+  pages    random category pages, made on first request and then cached
+  items    random item lookups by key
+
+Then checks, exit 1 on a failure: every leaderboard matches a
+generate_summary.run() over the same files, category pages are ranked by
+score, a matching If-None-Match gets 304, and after the input changes a
+new Top 1 shows up under a new ETag.
+
+Usage:
+  python3 bench/bench_serve.py
+  python3 bench/bench_serve.py --size 100000 --clients 16 --seconds 10
+"""
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_summary as gs  # noqa: E402
+from bench_watch import cache_entry, write_input  # noqa: E402
+from summary_cache import item_key, load_cache, save_cache  # noqa: E402
+from summarize import percentile  # noqa: E402
+from synth_items import DIMENSIONS, iter_items, make_cache, make_item  # noqa: E402
+
+SERVE = Path(__file__).resolve().parent.parent / 'serve.py'
+
+
+def fetch(conn, path, etag=None):
+    conn.request('GET', path, headers={'If-None-Match': etag} if etag else {})
+    response = conn.getresponse()
+    return response.status, response.getheader('etag'), response.read()
+
+
+def check(port, paths, ref_path):
+    """Compare the service with a full run; returns a list of failures."""
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    failures = []
+    ref = json.loads(ref_path.read_text(encoding='utf-8'))
+    _, _, body = fetch(conn, '/boards')
+    boards = json.loads(body)['boards']
+    for name in boards:
+        _, _, body = fetch(conn, f'/boards/{name}')
+        got = [{k: v for k, v in entry.items() if k != 'key'} for entry in json.loads(body)['items']]
+        want = (sorted((e for e in ref['items'] if e['isSmartPick']), key=lambda e: e['smartPickRank'])
+                if name == 'smartPicks' else ref[name])
+        if got != want:
+            failures.append(f'/boards/{name} differs from a full run')
+
+    _, _, body = fetch(conn, '/categories')
+    categories = json.loads(body)['categories']
+    if sum(c['count'] for c in categories) != len(ref['items']):
+        failures.append('/categories counts do not add up to the input')
+    for cat in categories:
+        page = json.loads(fetch(conn, f'/categories/{cat["categoryId"]}?size=200')[2])
+        totals = [e['scores']['total'] for e in page['items'] if 'scores' in e and 'derivativeOf' not in e]
+        if totals != sorted(totals, reverse=True):
+            failures.append(f'/categories/{cat["categoryId"]} is not ranked by score')
+
+    status, etag, _ = fetch(conn, '/boards/smartPicks')
+    again = fetch(conn, '/boards/smartPicks', etag)
+    if again[0] != 304 or again[2]:
+        failures.append(f'If-None-Match answered {again[0]} with {len(again[2])} bytes, not 304')
+    if fetch(conn, '/items/0000000000000000')[0] != 404 or fetch(conn, '/categories/x?page=0')[0] != 400:
+        failures.append('bad requests not answered 404 / 400')
+
+    # A new item scoring 5 on every dimension becomes Top 1 after the next rebuild
+    items = json.loads(paths['input'].read_text(encoding='utf-8'))['items']
+    fresh = make_item(random.Random(1), 'fresh', sources=['Fresh Source'])
+    cache = load_cache(paths['cache'])
+    cache[item_key(fresh)] = {**cache_entry(fresh, random.Random(1), 'fresh'), 'scores': dict.fromkeys(DIMENSIONS, 5)}
+    save_cache(cache, paths['cache'])
+    write_input(paths['input'], [fresh] + items)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        status, new_etag, body = fetch(conn, '/boards/smartPicks', etag)
+        if status == 200:
+            break
+        time.sleep(0.2)
+    if status != 200 or new_etag == etag or json.loads(body)['items'][0]['key'] != item_key(fresh):
+        failures.append('input change not picked up')
+    conn.close()
+    return failures
+
+
+def load(port, paths, clients, seconds):
+    """Send `paths(rng)` requests on `clients` connections for `seconds`; returns (latencies, errors)."""
+    latencies, errors = [], []
+    stop = time.perf_counter() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        mine = []
+        while time.perf_counter() < stop:
+            path, etag = paths(rng)
+            start = time.perf_counter()
+            status, _, _ = fetch(conn, path, etag)
+            mine.append(time.perf_counter() - start)
+            if status not in (200, 304):
+                errors.append(f'{status} {path}')
+        conn.close()
+        latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=20_000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=3.0, help='per request mix')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = {'input': tmp / 'filtered-items.json', 'cache': tmp / 'summary-cache.json',
+                 'item-data': tmp / 'item-data.json'}
+        items = list(iter_items(args.size))
+        cache = make_cache(items, scores='skewed', scored=0.5)
+        write_input(paths['input'], items)
+        save_cache(cache, paths['cache'])
+        paths['item-data'].write_text('{}', encoding='utf-8')
+        gs.ITEM_DATA = gs.open_item_data(paths['item-data'])
+        gs.run(paths['input'], tmp / 'ref.json', load_cache(paths['cache']), tmp / 'pending.json')
+
+        server = subprocess.Popen([sys.executable, str(SERVE), '--input', str(paths['input']),
+                                   '--cache', str(paths['cache']), '--item-data', str(paths['item-data']),
+                                   '--port', '0', '--interval', '0.5'], stdout=subprocess.PIPE, text=True)
+        try:
+            line = server.stdout.readline()
+            print(line.strip())
+            port = int(line.rsplit(':', 1)[1].split()[0])
+
+            conn = http.client.HTTPConnection('127.0.0.1', port)
+            categories = [c['categoryId'] for c in json.loads(fetch(conn, '/categories')[2])['categories']]
+            pages = {cat: json.loads(fetch(conn, f'/categories/{cat}')[2])['pages'] for cat in categories}
+            board_names = list(json.loads(fetch(conn, '/boards')[2])['boards'])
+            cached = ['/boards', '/categories'] + [f'/boards/{n}' for n in board_names] + \
+                     [f'/categories/{c}' for c in categories]
+            etags = {path: fetch(conn, path)[1] for path in cached}
+            keys = [item_key(item) for item in items]
+            conn.close()
+
+            def page(rng):
+                cat = rng.choice(categories)
+                return f'/categories/{cat}?page={rng.randint(1, pages[cat])}', None
+
+            def revalidate(rng):
+                path = rng.choice(cached)
+                return path, etags[path]
+
+            mixes = [('cached', lambda rng: (rng.choice(cached), None)), ('304', revalidate), ('pages', page),
+                     ('items', lambda rng: (f'/items/{rng.choice(keys)}', None))]
+            failures = []
+            print(f'\n{args.clients} clients, {args.seconds:g}s per mix')
+            print(f'{"mix":<8} {"requests":>9} {"req/s":>8} {"p50 ms":>8} {"p99 ms":>8}  errors')
+            for name, mix in mixes:
+                latencies, errors = load(port, mix, args.clients, args.seconds)
+                failures += [f'{name}: {e}' for e in errors[:5]]
+                print(f'{name:<8} {len(latencies):>9} {len(latencies) / args.seconds:>8.0f} '
+                      f'{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f}  '
+                      f'{len(errors)}')
+
+            failures += check(port, paths, tmp / 'ref.json')
+            print(f'\nchecks: {"FAIL" if failures else "ok"}')
+        finally:
+            server.terminate()
+            server.wait()
+
+    if failures:
+        print('\nFailures:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
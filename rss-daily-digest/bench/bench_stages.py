@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Per-stage time and peak memory of generate_summary.run(), checked against stored baselines.
+
+Runs the same stage functions run() uses, one at a time, on synthetic input
+(bench/synth_items.py, every item scored). Wall time is the best of
+--repeat runs; peak memory is the tracemalloc peak during the stage (a
+separate pass, so tracing does not skew the timings).
+
+Baselines live in bench/baselines.json and are machine-specific: record them
+with --update on the machine that runs --check. --check exits 1 when a stage
+is slower than baseline by more than --time-tolerance, or uses more peak
+memory by more than --memory-tolerance.
+
+Usage:
+  python3 bench/bench_stages.py                    # print the table
+  python3 bench/bench_stages.py --check            # fail on regression
+  python3 bench/bench_stages.py --update           # store new baselines
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_summary as gs  # noqa: E402
+from leaderboards import DEFAULT_BOARDS  # noqa: E402
+from synth_items import iter_items, make_cache, write_items  # noqa: E402
+
+BASELINES_PATH = Path(__file__).resolve().parent / 'baselines.json'
+STAGES = ('load', 'process', 'cluster', 'pending', 'leaderboards', 'output')
+# Below this, a slowdown is timer noise rather than a regression
+MIN_SECONDS = 0.01
+
+
+def stage_fns(src, out, pending_path, cache):
+    """The stages of run(), as callables sharing state through `ctx`."""
+    ctx = {}
+
+    def load():
+        ctx['raw'] = gs.load_items(src)['items']
+
+    def process():
+        ctx['store'] = gs.process_items(ctx['raw'], cache)
+
+    def cluster():
+        gs.mark_derivatives(ctx['store'], ctx['store'].scored_rows())
+
+    def pending():
+        store = ctx['store']
+        gs.write_pending(pending_path, (gs.pending_entry(store, row, item)
+                                        for row, item in enumerate(ctx['raw']) if not store.cached[row]))
+
+    def leaderboards():
+        store = ctx['store']
+        ctx['boards'] = gs.select_store_boards(store, store.scored_rows(), DEFAULT_BOARDS)
+
+    def output():
+        top10, others = ctx['boards']
+        header = {'summarizedAt': '', 'totalItems': len(ctx['raw']), 'smartPickCount': len(top10)}
+        gs.write_output(out, header, gs.output_arrays(ctx['store'], top10, others))
+
+    return dict(zip(STAGES, (load, process, cluster, pending, leaderboards, output)))
+
+
+def measure(size, repeat, tmp):
+    src, out, pending_path = tmp / f'filtered-{size}.json', tmp / 'out.json', tmp / 'pending.json'
+    write_items(src, size)
+    cache = make_cache(iter_items(size))
+
+    seconds = {name: float('inf') for name in STAGES}
+    for _ in range(repeat):
+        for name, fn in stage_fns(src, out, pending_path, cache).items():
+            start = time.perf_counter()
+            fn()
+            seconds[name] = min(seconds[name], time.perf_counter() - start)
+
+    peaks = {}
+    tracemalloc.start()
+    for name, fn in stage_fns(src, out, pending_path, cache).items():
+        tracemalloc.reset_peak()
+        fn()
+        peaks[name] = tracemalloc.get_traced_memory()[1] / (1 << 20)
+    tracemalloc.stop()
+    src.unlink()
+    return {name: {'seconds': round(seconds[name], 4), 'peakMiB': round(peaks[name], 2)} for name in STAGES}
+
+
+def regressions(results, baselines, time_tol, mem_tol):
+    found = []
+    for size, stages in results.items():
+        for name, got in stages.items():
+            base = baselines.get(size, {}).get(name)
+            if base is None:
+                continue
+            if got['seconds'] > base['seconds'] * (1 + time_tol) and got['seconds'] - base['seconds'] > MIN_SECONDS:
+                found.append(f'{size} items, {name}: {got["seconds"]:.4f}s vs baseline {base["seconds"]:.4f}s')
+            if got['peakMiB'] > base['peakMiB'] * (1 + mem_tol):
+                found.append(f'{size} items, {name}: {got["peakMiB"]:.1f} MiB vs baseline {base["peakMiB"]:.1f} MiB')
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baselines', type=Path, default=BASELINES_PATH)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--check', action='store_true', help='exit 1 if any stage regressed')
+    mode.add_argument('--update', action='store_true', help='store these results as the baselines')
+    parser.add_argument('--time-tolerance', type=float, default=0.5, help='allowed slowdown, 0.5 = +50%%')
+    parser.add_argument('--memory-tolerance', type=float, default=0.1, help='allowed peak growth, 0.1 = +10%%')
+    args = parser.parse_args()
+
+    stored = json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    baselines = stored.get('sizes', {})
+
+    results = {}
+    print(f'{"items":>8}  {"stage":<13} {"seconds":>8} {"peak MiB":>9} {"vs base":>8}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            results[str(size)] = measure(size, args.repeat, Path(tmp))
+            for name, got in results[str(size)].items():
+                base = baselines.get(str(size), {}).get(name)
+                ratio = f'{got["seconds"] / base["seconds"]:.2f}x' if base and base['seconds'] else '-'
+                print(f'{size:>8}  {name:<13} {got["seconds"]:>8.4f} {got["peakMiB"]:>9.1f} {ratio:>8}')
+
+    if args.update:
+        baselines.update(results)
+        stored = {'recordedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                  'python': platform.python_version(), 'machine': platform.machine(), 'sizes': baselines}
+        args.baselines.write_text(json.dumps(stored, indent=2) + '\n')
+        print(f'\nBaselines written: {args.baselines}')
+    elif args.check:
+        found = regressions(results, baselines, args.time_tolerance, args.memory_tolerance)
+        missing = [s for s in results if s not in baselines]
+        if missing:
+            print(f'\nNo baseline for {", ".join(missing)} items (run --update)')
+        if found:
+            print('\nRegressions:\n  ' + '\n  '.join(found))
+            sys.exit(1)
+        print('\nNo regressions.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Peak RSS and wall time of generate_summary.py, in-memory vs --stream.
+
+Usage: python3 bench/bench_stream.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synth_items import write_items
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'generate_summary.py'
+
+
+def measure(args):
+    """Run one child process; return (wall seconds, peak RSS in MiB)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(SCRIPT), *args], stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise SystemExit(f'generate_summary.py exited with {proc.returncode}')
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = usage.ru_maxrss / (1 << 20 if sys.platform == 'darwin' else 1 << 10)
+    return elapsed, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f'{"items":>9}  {"mode":<9} {"wall s":>8} {"peak MiB":>9}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            src = Path(tmp) / f'filtered-{size}.json'
+            out = Path(tmp) / 'summarized.json'
+            write_items(src, size)
+            for mode, extra in (('memory', []), ('stream', ['--stream'])):
+                wall, rss = measure(['--input', str(src), '--output', str(out), *extra])
+                print(f'{size:>9}  {mode:<9} {wall:>8.2f} {rss:>9.1f}')
+            src.unlink()
+
+
+if __name__ == '__main__':
+    main()
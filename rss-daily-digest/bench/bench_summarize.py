@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Throughput and batch tail latency of summarize.py against the local stub model.
+
+Each row summarizes the same synthetic items into a fresh cache; concurrency 1
+is the old one-batch-at-a-time behaviour.
+
+Usage: python3 bench/bench_summarize.py [--items 800] [--concurrency 1 4 8 16]
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import stub_model  # noqa: E402
+import summarize  # noqa: E402
+from synth_items import write_items  # noqa: E402
+from generate_summary import load_items  # noqa: E402
+from summary_cache import load_cache  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=800)
+    parser.add_argument('--batch-size', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--latency', type=float, default=0.5, help='stub seconds per request')
+    parser.add_argument('--error-rate', type=float, default=0.1, help='stub share of 429 responses')
+    parser.add_argument('--rpm', type=int, default=600, help='requestsPerMinute for the run')
+    args = parser.parse_args()
+
+    # Entries that are not objects (a bare number, null) are skipped, not a crash
+    parsed = summarize.parse_batch('[1, null, "x", {"index": 0, "summary": "s", "scores": [], "scoreReason": ""}, '
+                                   '{"index": 1, "summary": "s", "scores": {"relevance": 4, "sourceQuality": 5, '
+                                   '"contentValue": 4, "actionability": 3}}]', 2)
+    if list(parsed) != [1]:
+        sys.exit(f'parse_batch kept {sorted(parsed)} of a batch with one well-formed entry (1)')
+
+    server = stub_model.start(latency=args.latency, jitter=args.latency / 5, error_rate=args.error_rate)
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    print(f'{args.items} items, batch {args.batch_size}, stub latency {args.latency}s, '
+          f'{args.error_rate:.0%} 429s, {args.rpm} req/min')
+    print(f'{"conc":>4} {"wall s":>7} {"items/s":>8} {"p50 s":>6} {"p95 s":>6} {"max s":>6} {"retries":>7} {"done":>5}')
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / 'filtered.json'
+        write_items(src, args.items)
+        items = load_items(src)['items']
+        for conc in args.concurrency:
+            cache_path = Path(tmp) / f'cache-{conc}.json'
+            config = {**summarize.DEFAULTS, 'batchSize': args.batch_size, 'concurrency': conc,
+                      'requestsPerMinute': args.rpm, 'inputTokensPerMinute': 10 ** 9}
+            stats = summarize.run(items, cache_path, base_url, '', 'stub', config, log=lambda *a: None)
+            assert len(load_cache(cache_path)) == stats['done']
+            lat = stats['batchLatency']
+            print(f'{conc:>4} {stats["wallSeconds"]:>7.2f} {stats["itemsPerSecond"]:>8.1f} {lat["p50"]:>6.2f} '
+                  f'{lat["p95"]:>6.2f} {lat["max"]:>6.2f} {stats["retries"]:>7} {stats["done"]:>5}')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
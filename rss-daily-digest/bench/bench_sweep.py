@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Weight-sweep throughput: re-rank a synthetic corpus under many weight vectors.
+
+Usage: python3 bench/bench_sweep.py [--items 100000] [--vectors 1000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scoring  # noqa: E402
+from generate_summary import SCORE_WEIGHTS, get_score_total, select_leaderboards  # noqa: E402
+from bench_topk import make_candidates  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=100_000)
+    parser.add_argument('--vectors', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    records = make_candidates(args.items)
+    for r in records:
+        r['scores'] = {d: rng.randint(1, 5) for d in scoring.DIMENSIONS}
+        r['scores']['total'] = get_score_total(r['scores'])
+
+    start = time.perf_counter()
+    corpus = scoring.Corpus(records)
+    build_s = time.perf_counter() - start
+
+    # Batch leaderboards must match the pure-Python path under the current weights
+    start = time.perf_counter()
+    boards = scoring.select_boards(corpus, SCORE_WEIGHTS)
+    batch_s = time.perf_counter() - start
+    top, others = select_leaderboards(records)
+    expected = {'smartPicks': top, **others}
+    assert {k: [records[i] for i in v] for k, v in boards.items()} == expected, 'batch boards diverged'
+
+    vectors = scoring.random_vectors(args.vectors)
+    start = time.perf_counter()
+    results = scoring.sweep(corpus, vectors, scoring.weight_vector(SCORE_WEIGHTS))
+    sweep_s = time.perf_counter() - start
+
+    unchanged = sum(1 for r in results if r['changed'] == 0)
+    print(f'{args.items} items, {args.vectors} weight vectors')
+    print(f'  build columns:     {build_s:.3f}s')
+    print(f'  batch leaderboards: {batch_s:.3f}s')
+    print(f'  sweep:             {sweep_s:.3f}s  ({unchanged} vectors keep the same Top 10)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Leaderboard selection at scale: full sort + scan per board vs single-pass heaps.
+
+Usage: python3 bench/bench_topk.py [--items 1000000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_summary import CAP_KEYS, select_leaderboards  # noqa: E402
+from leaderboards import DEFAULT_BOARDS, walk  # noqa: E402
+from synth_items import CATEGORIES, source_list  # noqa: E402
+
+SOURCES = source_list(249)
+
+
+def make_candidates(n, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'title': f'Item {i}',
+        'link': f'https://example.com/{i}',
+        'source': rng.choice(SOURCES),
+        'categoryId': rng.choice(CATEGORIES)[0],
+        'scores': {'total': round(rng.uniform(1, 5), 2)},
+        '_idx': i,
+    } for i in range(n)]
+
+
+def sort_and_scan(candidates):
+    """The pre-heap approach: one full sort and linear walk per board."""
+    result = {}
+    for name, spec in DEFAULT_BOARDS.items():
+        cats = spec.get('categories')
+        eligible = [c for c in candidates if not cats or c['categoryId'] in cats]
+        eligible.sort(key=lambda c: c['scores']['total'], reverse=True)
+        result[name] = walk(eligible, spec['size'], spec.get('caps', {}), CAP_KEYS)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.items)
+
+    start = time.perf_counter()
+    expected = sort_and_scan(candidates)
+    sort_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top, others = select_leaderboards(candidates)
+    heap_s = time.perf_counter() - start
+
+    assert {'smartPicks': top, **others} == expected, 'heap selection diverged from full sort'
+    print(f'{args.items} scored items, {len(DEFAULT_BOARDS)} boards')
+    print(f'  sort + scan per board: {sort_s:.3f}s')
+    print(f'  single-pass heaps:     {heap_s:.3f}s  ({sort_s / heap_s:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
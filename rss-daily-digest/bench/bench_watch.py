@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Delta updates of watch.py against full generate_summary.py rebuilds.
+
+Builds a LiveDigest over a --size synthetic corpus (half the items cached
+with skewed scores, the rest pending), ranked with a 24h decay half-life
+and a 6-hour window board on a clock that moves ten minutes per step.
+Then it applies one change at a time the way the daily workflow produces
+them and times poll():
+
+  insert     ten new items at the top (the input is newest first), two of
+             them near-duplicates of scored items
+  remove     ten items dropped from the middle
+  edit       ten titles changed
+  item-data  ten pending items summarized in item-data.json
+  cache      ten entries added to the cache, as summarize.py does
+  clock      three hours pass and no file changes: the window slides and
+             every total decays
+  compact    ten titles changed with a compaction ratio of 0, so the poll
+             rebuilds the store from the items in memory; the store must then
+             hold live rows only
+
+After each step the output, pending list (and, for partitioned, every
+shard) are compared with generate_summary.run() over the same files; exits
+1 on a difference.
+
+Usage:
+  python3 bench/bench_watch.py
+  python3 bench/bench_watch.py --size 20000 --format partitioned
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_summary as gs  # noqa: E402
+from leaderboards import DEFAULT_BOARDS  # noqa: E402
+from partitioned import load_index  # noqa: E402
+from summary_cache import item_key, load_cache, save_cache  # noqa: E402
+from synth_items import DIMENSIONS, iter_items, make_cache, make_item, source_list  # noqa: E402
+from watch import LiveDigest  # noqa: E402
+
+# The synthetic items are published over 21 Feb 2026 (UTC)
+START = datetime(2026, 2, 21, 20, tzinfo=timezone.utc).timestamp()
+BOARDS = {**DEFAULT_BOARDS, 'last6h': {'size': 10, 'hours': 6}}
+
+
+def write_input(path, items):
+    # Laid out like dedupe-filter.ts's JSON.stringify(output, null, 2)
+    data = {'filteredAt': time.strftime('%Y-%m-%dT%H:%M:%S.000Z'), 'timeWindowHours': 48,
+            'totalBefore': len(items), 'totalAfter': len(items), 'newItems': len(items), 'items': items}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def touch_later(path):
+    """Make sure a rewrite within the same clock tick still changes the mtime."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def cache_entry(item, rng, summary):
+    return {'summary': summary, 'scores': {d: rng.randint(3, 5) for d in DIMENSIONS}, 'scoreReason': 'bench',
+            'title': item['title'], 'source': item['feedName'], 'link': item['link'],
+            'categoryId': item['categoryId'], 'cachedAt': time.strftime('%Y-%m-%dT%H:%M:%S+00:00')}
+
+
+def same_outputs(paths, ref, partitioned):
+    """Compare watch.py's files with a full run's; returns a list of differences."""
+    diffs = []
+    if partitioned:
+        got, want = load_index(paths['output']), load_index(ref['output'])
+        got.pop('summarizedAt')
+        want.pop('summarizedAt')
+        if got != want:
+            diffs.append('index.json')
+        for name in sorted(set(os.listdir(paths['output'])) | set(os.listdir(ref['output']))):
+            if name.endswith('.ndjson') and not same_file(paths['output'] / name, ref['output'] / name):
+                diffs.append(name)
+    else:
+        got, want = (Path(p).read_text(encoding='utf-8').split('\n') for p in (paths['output'], ref['output']))
+        if got[:1] + got[2:] != want[:1] + want[2:]:
+            diffs.append('summarized-items.json')
+    if not same_file(paths['pending'], ref['pending']):
+        diffs.append('pending-items.json')
+    return diffs
+
+
+def same_file(a, b):
+    try:
+        return Path(a).read_bytes() == Path(b).read_bytes()
+    except OSError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--format', choices=('json', 'partitioned'), default='json')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    partitioned = args.format == 'partitioned'
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = {'input': tmp / 'filtered-items.json', 'cache': tmp / 'summary-cache.json',
+                 'item-data': tmp / 'item-data.json', 'pending': tmp / 'pending-items.json',
+                 'output': tmp / ('summarized' if partitioned else 'summarized-items.json')}
+        ref = {'output': tmp / 'ref' / ('summarized' if partitioned else 'summarized-items.json'),
+               'pending': tmp / 'ref' / 'pending-items.json'}
+        ref['pending'].parent.mkdir()
+        items = list(iter_items(args.size, seed=args.seed))
+        cache = make_cache(items, seed=args.seed, scores='skewed', scored=0.5)
+        write_input(paths['input'], items)
+        save_cache(cache, paths['cache'])
+        paths['item-data'].write_text('{}', encoding='utf-8')
+        item_data = {}
+
+        gs.DECAY = {'halfLifeHours': 24}
+        clock = [START]
+        digest = LiveDigest(paths['input'], paths['output'], paths['cache'], paths['pending'], paths['item-data'],
+                            BOARDS, partitioned, clock=lambda: clock[0])
+        start = time.perf_counter()
+        digest.build()
+        print(f'{args.size} items, {args.format}: initial build {time.perf_counter() - start:.2f}s\n')
+
+        sources = source_list()
+        counter = [0]
+
+        def new_items(count):
+            made = []
+            for _ in range(count):
+                counter[0] += 1
+                made.append(make_item(rng, f'new-{counter[0]}', sources=sources))
+            return made
+
+        def insert():
+            fresh = new_items(10)
+            scored = [i for i, it in enumerate(items) if item_key(it) in cache]
+            for n, item in enumerate(fresh[:5]):
+                summary = f'bench summary {counter[0]}-{n}'
+                if n < 2:
+                    # Near-duplicate coverage of a scored item
+                    twin = items[rng.choice(scored)]
+                    item['title'] = twin['title'] + ' (via aggregator)'
+                    summary = cache[item_key(twin)]['summary']
+                cache[item_key(item)] = cache_entry(item, rng, summary)
+            save_cache(cache, paths['cache'])
+            items[:0] = fresh
+            write_input(paths['input'], items)
+
+        def remove():
+            at = len(items) // 2
+            del items[at:at + 10]
+            write_input(paths['input'], items)
+
+        def edit():
+            for pos in rng.sample(range(len(items)), 10):
+                items[pos] = {**items[pos], 'title': items[pos]['title'] + ' (updated)'}
+            write_input(paths['input'], items)
+
+        def summarize_pending():
+            pending = [it for it in items if item_key(it) not in cache][:10]
+            for item in pending:
+                item_data[item_key(item)] = {'summary': f'今日摘要 {item["title"][:20]}',
+                                             'scores': {d: 5 for d in DIMENSIONS}, 'scoreReason': 'bench'}
+            paths['item-data'].write_text(json.dumps(item_data, ensure_ascii=False), encoding='utf-8')
+            touch_later(paths['item-data'])
+
+        def external_cache():
+            disk = load_cache(paths['cache'])
+            for item in [it for it in items if item_key(it) not in disk][:10]:
+                disk[item_key(item)] = cache[item_key(item)] = cache_entry(item, rng, 'summarize.py')
+            save_cache(disk, paths['cache'])
+            touch_later(paths['cache'])
+
+        def later():
+            clock[0] += 3 * 3600
+
+        def compact():
+            digest.compact_ratio = 0
+            edit()
+
+        failures = []
+        print(f'{"change":<10} {"rows -/+":>9} {"encoded":>8} {"rank ms":>8} {"write ms":>9} {"poll ms":>8} '
+              f'{"full run s":>11}  check')
+        for name, change in [('insert', insert), ('remove', remove), ('edit', edit),
+                             ('item-data', summarize_pending), ('cache', external_cache), ('clock', later),
+                             ('compact', compact)]:
+            clock[0] += 600
+            change()
+            report = digest.poll()
+            if report is None:
+                failures.append(f'{name}: change not noticed')
+                continue
+            if name == 'compact' and not (report.get('compacted') and len(digest.store) == len(digest.order)):
+                failures.append(f'compact: {len(digest.store)} rows kept for {len(digest.order)} items')
+            # The full run ranks as of the same moment, whatever watch.py set
+            gs.RANK_TIME = clock[0]
+            start = time.perf_counter()
+            gs.run(paths['input'], ref['output'], load_cache(paths['cache']), ref['pending'], BOARDS, partitioned)
+            full = time.perf_counter() - start
+            diffs = same_outputs(paths, ref, partitioned)
+            if diffs:
+                failures.append(f'{name}: {", ".join(diffs)} differ from a full run')
+            print(f'{name:<10} {report["removed"]:>4}/{report["added"]:<4} {report["encoded"]:>8} '
+                  f'{report["rankSeconds"] * 1000:>8.1f} {report["writeSeconds"] * 1000:>9.1f} '
+                  f'{report["seconds"] * 1000:>8.1f} {full:>11.2f}  {"FAIL" if diffs else "ok"}')
+
+    if failures:
+        print('\nFailures:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Messages API, for exercising summarize.py offline.
+
+Answers POST /v1/messages with a deterministic summary and scores for every
+`[n] 标题:` entry in the prompt, after a simulated latency. A share of requests
+can be failed with 429 + Retry-After to exercise backoff.
+
+Usage: python3 bench/stub_model.py [--port 8765] [--latency 0.5] [--error-rate 0.1]
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENTRY = re.compile(r'^\[(\d+)\] 标题: (.*)$', re.M)
+
+
+def fake_entries(prompt):
+    entries = []
+    for idx, title in ENTRY.findall(prompt):
+        digest = hashlib.sha1(title.encode('utf-8')).digest()
+        entries.append({
+            'index': int(idx),
+            'summary': f'「{title[:40]}」的合成摘要。',
+            'scores': {dim: 1 + digest[n] % 5 for n, dim in
+                       enumerate(('relevance', 'sourceQuality', 'contentValue', 'actionability'))},
+            'scoreReason': 'stub',
+        })
+    return entries
+
+
+def make_handler(latency, jitter, error_rate, seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('content-length', 0))))
+            with lock:
+                fail = rng.random() < error_rate
+                delay = max(0.0, rng.gauss(latency, jitter))
+            if fail:
+                self.send_response(429)
+                self.send_header('retry-after', '0.2')
+                self.end_headers()
+                self.wfile.write(b'{"type":"error","error":{"type":"rate_limit_error"}}')
+                return
+            time.sleep(delay)
+            text = '```json\n' + json.dumps(fake_entries(body['messages'][0]['content']), ensure_ascii=False) + '\n```'
+            payload = json.dumps({'content': [{'type': 'text', 'text': text}]}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('content-type', 'application/json')
+            self.send_header('content-length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start(port=0, latency=0.5, jitter=0.1, error_rate=0.0, seed=0):
+    """Serve on a background thread; returns the server (`server.server_port` for port 0)."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(latency, jitter, error_rate, seed))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help='mean seconds per request')
+    parser.add_argument('--jitter', type=float, default=0.1, help='latency standard deviation')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with 429')
+    args = parser.parse_args()
+    server = start(args.port, args.latency, args.jitter, args.error_rate)
+    print(f'Stub model on http://127.0.0.1:{server.server_port} (Ctrl-C to stop)')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Write a synthetic filtered-items.json (and optionally a matching summary cache) for benchmarks.
+
+Output is determined by the arguments and --seed, except the cache's cachedAt
+(the generation time, so the entries are not pruned as stale). With --cache,
+a share of the items (--scored) get a cached summary and scores drawn from
+--scores, so generate_summary.py runs the whole scoring and leaderboard path.
+
+Usage:
+  python3 bench/synth_items.py 100000 /tmp/filtered.json
+  python3 bench/synth_items.py 100000 /tmp/filtered.json --cache /tmp/cache.json --scores skewed
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from summary_cache import item_key  # noqa: E402
+
+CATEGORIES = [
+    ('ai-company-blogs', 'AI 公司官方博客'),
+    ('ai-tools', 'AI 工具/产品'),
+    ('ai-research', 'AI 研究 / arXiv 每日精选'),
+    ('ai-developers', '知名 AI 个人开发者/研究者'),
+    ('news-media', '新闻媒体'),
+    ('podcasts', 'AI 从业者访谈 / 播客'),
+    ('youtube', 'YouTube AI 频道'),
+    ('github-releases', 'GitHub 开源项目 Releases'),
+    ('tech-blogs', '技术博客 / 开发者博客'),
+    ('ai-changelog', 'AI 公司产品更新 / Changelog'),
+]
+
+# Real source names first so company/arXiv caps are exercised
+KNOWN_SOURCES = ['Claude Code Releases', 'OpenAI Blog', 'AWS News', 'GitHub Changelog', 'Google AI Blog',
+                 'LiteLLM', 'Vercel Blog', 'Hugging Face Blog', 'arXiv cs.AI']
+
+DIMENSIONS = ('relevance', 'sourceQuality', 'contentValue', 'actionability')
+
+# Per-dimension 1-5 score draws
+SCORE_DISTRIBUTIONS = {
+    'uniform': lambda rng: rng.randint(1, 5),
+    'normal': lambda rng: min(5, max(1, round(rng.gauss(3, 1)))),
+    # Most items mediocre, few excellent — closest to a real day
+    'skewed': lambda rng: 1 + int(5 * rng.random() ** 2),
+}
+
+
+def category_list(count=len(CATEGORIES)):
+    extra = [(f'category-{n}', f'Category {n}') for n in range(len(CATEGORIES), count)]
+    return (CATEGORIES + extra)[:count]
+
+
+def source_list(count=250):
+    return (KNOWN_SOURCES + [f'Feed {n}' for n in range(count)])[:max(count, 1)]
+
+
+def make_item(rng, i, categories=CATEGORIES, sources=None):
+    cat_id, cat_name = rng.choice(categories)
+    feed = rng.choice(sources) if sources else f'Feed {rng.randrange(250)}'
+    return {
+        'title': f'Synthetic item {i}: ' + ' '.join(rng.choice('abcdefghij') * rng.randint(3, 9) for _ in range(6)),
+        'link': f'https://example.com/{cat_id}/{i}',
+        'description': 'Lorem ipsum dolor sit amet. ' * rng.randint(2, 10),
+        'pubDate': f'Sat, 21 Feb 2026 {rng.randrange(24):02d}:{rng.randrange(60):02d}:00 GMT',
+        'guid': f'synthetic-{i}',
+        'feedName': feed,
+        'feedUrl': f'https://example.com/{feed.replace(" ", "-").lower()}.xml',
+        'categoryId': cat_id,
+        'categoryName': cat_name,
+    }
+
+
+def iter_items(count, seed=0, categories=None, sources=None):
+    rng = random.Random(seed)
+    cats = category_list(categories) if categories else CATEGORIES
+    srcs = source_list(sources) if sources else None
+    for i in range(count):
+        yield make_item(rng, i, cats, srcs)
+
+
+def write_items(path, count, seed=0, categories=None, sources=None):
+    """Stream `count` items to `path` in dedupe-filter.ts layout (items last)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        header = {
+            'filteredAt': '2026-02-21T00:00:00.000Z',
+            'timeWindowHours': 48,
+            'totalBefore': count,
+            'totalAfter': count,
+            'newItems': count,
+        }
+        f.write(json.dumps(header, ensure_ascii=False, indent=2)[:-2] + ',\n  "items": [')
+        for i, item in enumerate(iter_items(count, seed, categories, sources)):
+            text = json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+            f.write((',' if i else '') + '\n    ' + text)
+        f.write('\n  ]\n}' if count else ']\n}')
+
+
+def make_cache(items, seed=0, scores='uniform', scored=1.0):
+    """Summary-cache entries for a `scored` share of `items`, keyed like the real cache."""
+    rng = random.Random(seed + 1)
+    draw = SCORE_DISTRIBUTIONS[scores]
+    # Fresh timestamp so generate_summary.py's age-based pruning keeps the entries
+    now = datetime.now(timezone.utc).isoformat()
+    cache = {}
+    for i, item in enumerate(items):
+        if rng.random() >= scored:
+            continue
+        cache[item_key(item)] = {
+            'summary': f'合成摘要 {i}', 'scores': {d: draw(rng) for d in DIMENSIONS}, 'scoreReason': 'synthetic',
+            'title': item['title'], 'source': item['feedName'], 'link': item['link'],
+            'categoryId': item['categoryId'], 'cachedAt': now,
+        }
+    return cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('count', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--categories', type=int, help=f'number of categories (default the {len(CATEGORIES)} real ones)')
+    parser.add_argument('--sources', type=int, help='number of distinct sources (default 250)')
+    parser.add_argument('--cache', help='also write a summary cache with scores for these items')
+    parser.add_argument('--scores', choices=sorted(SCORE_DISTRIBUTIONS), default='uniform')
+    parser.add_argument('--scored', type=float, default=1.0, help='share of items that get cached scores')
+    args = parser.parse_args()
+    write_items(args.output, args.count, args.seed, args.categories, args.sources)
+    if args.cache:
+        cache = make_cache(iter_items(args.count, args.seed, args.categories, args.sources),
+                           args.seed, args.scores, args.scored)
+        with open(args.cache, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+
+
+if __name__ == '__main__':
+    main()
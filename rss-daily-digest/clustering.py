@@ -0,0 +1,305 @@
+"""Near-duplicate / same-event clustering over title + summary.
+
+Each text becomes a set of shingles (lower-cased Latin words and CJK
+character bigrams). Shingles that occur in more than `max_df` of the corpus
+("ai", "claude", "发布", ...) say nothing about which event a post covers and
+would put every item in one LSH bucket, so they are dropped first.
+
+Candidates come from MinHash LSH: a one-permutation MinHash sketch of BANDS *
+ROWS bins (one CRC32 per shingle, so sketching is linear in text length),
+cut into BANDS bands of ROWS bins; items sharing any band are candidates. Every candidate
+pair is verified with exact Jaccard similarity and joined with union-find.
+Work is linear in the corpus plus the candidate pairs; buckets larger than
+`max_bucket` are skipped so one common phrase cannot make it quadratic.
+
+With ROWS = 3 and BANDS = 21, a pair at Jaccard 0.5 becomes a candidate with
+probability ~0.94, at 0.6 ~0.99.
+"""
+import gc
+import re
+import zlib
+from collections import Counter, defaultdict
+
+BANDS = 21
+ROWS = 3
+BINS = BANDS * ROWS
+_EMPTY = 1 << 32
+
+_TOKENS = re.compile(r'[a-z0-9][a-z0-9.+#-]*|[㐀-鿿]+')
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the this to was were will with'.split())
+
+
+def shingles(text):
+    """Latin words and CJK character bigrams of `text`."""
+    out = set()
+    for tok in _TOKENS.findall(text.lower()):
+        if tok[0] < '㐀':
+            if tok not in STOPWORDS:
+                out.add(tok.rstrip('.'))
+        elif len(tok) == 1:
+            out.add(tok)
+        else:
+            out.update(tok[i:i + 2] for i in range(len(tok) - 1))
+    return out
+
+
+def sketch(items):
+    """One-permutation MinHash of a shingle set, densified by rotation so no bin stays empty."""
+    bins = [_EMPTY] * BINS
+    for h in map(zlib.crc32, map(str.encode, items)):
+        b = h % BINS
+        if h < bins[b]:
+            bins[b] = h
+    if items:
+        # An empty bin borrows the next filled bin's value (wrapping around),
+        # shifted out of the native range by the distance
+        nxt = next(b for b, v in enumerate(bins) if v < _EMPTY)
+        val, nxt = bins[nxt], nxt + BINS
+        for b in range(BINS - 1, -1, -1):
+            if bins[b] < _EMPTY:
+                nxt, val = b, bins[b]
+            else:
+                bins[b] = val + (nxt - b) * _EMPTY
+    return bins
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def cluster(texts, threshold=0.5, max_df=0.02, max_bucket=200):
+    """Groups of indices into `texts` whose shingle sets reach `threshold` Jaccard (transitively).
+
+    Returns clusters of two or more, each sorted, in order of their first member.
+    """
+    # Millions of small containers and no cycles among them: the cyclic GC
+    # would only rescan them over and over, so it is paused for the build
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _cluster(texts, threshold, max_df, max_bucket)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _cluster(texts, threshold, max_df, max_bucket):
+    sets = [shingles(t) for t in texts]
+    df = Counter(s for items in sets for s in items)
+    # Never drop a shingle shared by only a handful of items, however small the corpus
+    limit = max(max_df * len(sets), 5)
+    common = {s for s, n in df.items() if n > limit}
+    if common:
+        sets = [items - common for items in sets]
+
+    # One table per band; a band is every BANDS-th bin, so the bins densified
+    # from one shingle land in different bands. Tables map the band's hash to
+    # its first item; later items in the bucket go to `shared`, so the lists
+    # only exist for the few buckets that have candidates (a hash collision
+    # only adds a candidate, which verification throws out).
+    tables = [{} for _ in range(BANDS)]
+    shared = defaultdict(list)
+    for idx, items in enumerate(sets):
+        if not items:
+            continue
+        sig = sketch(items)
+        bands = zip(*(sig[r * BANDS:(r + 1) * BANDS] for r in range(ROWS)))
+        for band, key in enumerate(map(hash, bands)):
+            if tables[band].setdefault(key, idx) != idx:
+                shared[band, key].append(idx)
+
+    parent = list(range(len(sets)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    seen = set()
+    for (band, key), rest in shared.items():
+        if len(rest) >= max_bucket:
+            continue
+        members = [tables[band][key], *rest]
+        for n, a in enumerate(members):
+            for b in members[n + 1:]:
+                if (a, b) in seen:
+                    continue
+                seen.add((a, b))
+                if find(a) != find(b) and jaccard(sets[a], sets[b]) >= threshold:
+                    parent[find(b)] = find(a)
+
+    groups = defaultdict(list)
+    for idx in range(len(sets)):
+        groups[find(idx)].append(idx)
+    return sorted((g for g in groups.values() if len(g) > 1), key=lambda g: g[0])
+
+
+class Clusters:
+    """cluster() kept up to date while texts are added and removed.
+
+    Holds each text's shingles, the document frequencies, the LSH buckets and
+    every verified edge, so a batch only sketches and verifies its own texts
+    and re-walks the groups it touched. A batch that changes which shingles
+    are common, or takes a bucket across `max_bucket`, changes candidates all
+    over the corpus; the structures are then rebuilt from the stored
+    shingles. Either way group() matches cluster() over the current texts.
+    """
+
+    def __init__(self, threshold=0.5, max_df=0.02, max_bucket=200):
+        self.threshold = threshold
+        self.max_df = max_df
+        self.max_bucket = max_bucket
+        self.full = {}          # id -> shingle set
+        self.df = Counter()
+        self.levels = Counter()  # df value -> number of shingles with it
+        self.common = set()
+        self.sets = {}          # id -> shingles minus the common ones
+        self.tables = [{} for _ in range(BANDS)]  # band hash -> set of ids
+        self.adj = {}           # id -> ids joined to it by a verified pair
+        self.rebuilds = 0
+
+    def _limit(self):
+        return max(self.max_df * len(self.full), 5)
+
+    def _count(self, shingle, delta, touched):
+        n = self.df.get(shingle, 0)
+        touched.setdefault(shingle, n)
+        if n:
+            self.levels[n] -= 1
+        n += delta
+        if n:
+            self.levels[n] += 1
+            self.df[shingle] = n
+        else:
+            del self.df[shingle]
+
+    def update(self, added=None, removed=()):
+        """Apply one batch: `added` maps new ids to texts, `removed` lists ids to drop.
+
+        Returns the current ids whose group may have changed (every id after a
+        rebuild).
+        """
+        added = added or {}
+        limit = self._limit()
+        touched = {}
+        gone = {}
+        for id_ in removed:
+            gone[id_] = self.sets.pop(id_)
+            for s in self.full.pop(id_):
+                self._count(s, -1, touched)
+        for id_, text in added.items():
+            self.full[id_] = shingles(text)
+            for s in self.full[id_]:
+                self._count(s, 1, touched)
+
+        new_limit = self._limit()
+        flips = any((n > limit) != (self.df.get(s, 0) > new_limit) for s, n in touched.items())
+        if not flips and int(limit) != int(new_limit):
+            low, high = sorted((limit, new_limit))
+            flips = any(self.levels[n] for n in range(int(low), int(high) + 2) if (n > limit) != (n > new_limit))
+        if flips or not self._unlink(gone) or not self._link(added):
+            self.rebuild()
+            return set(self.full)
+        affected = set(added)
+        for id_ in gone:
+            affected.update(self.adj.pop(id_, ()))
+        for id_ in affected.intersection(self.adj):
+            self.adj[id_].difference_update(gone)
+        affected.difference_update(gone)
+        return affected
+
+    def _bands(self, items):
+        sig = sketch(items)
+        return enumerate(map(hash, zip(*(sig[r * BANDS:(r + 1) * BANDS] for r in range(ROWS)))))
+
+    def _unlink(self, gone):
+        """Take `gone` out of the buckets; False if a bucket comes back under max_bucket."""
+        for id_, items in gone.items():
+            if not items:
+                continue
+            for band, key in self._bands(items):
+                bucket = self.tables[band][key]
+                if len(bucket) == self.max_bucket + 1:
+                    return False
+                bucket.discard(id_)
+                if not bucket:
+                    del self.tables[band][key]
+        return True
+
+    def _link(self, added):
+        """Bucket and verify the new ids; False if a bucket grows past max_bucket."""
+        new = []
+        for id_ in added:
+            items = self.sets[id_] = self.full[id_] - self.common
+            self.adj.setdefault(id_, set())
+            if not items:
+                continue
+            buckets = []
+            for band, key in self._bands(items):
+                bucket = self.tables[band].setdefault(key, set())
+                bucket.add(id_)
+                if len(bucket) == self.max_bucket + 1:
+                    return False
+                buckets.append(bucket)
+            new.append((id_, items, buckets))
+        for id_, items, buckets in new:
+            for bucket in buckets:
+                if len(bucket) > self.max_bucket:
+                    continue
+                for other in bucket:
+                    if other != id_ and other not in self.adj[id_] and \
+                            jaccard(items, self.sets[other]) >= self.threshold:
+                        self.adj[id_].add(other)
+                        self.adj[other].add(id_)
+        return True
+
+    def rebuild(self):
+        """Recompute the common shingles, buckets and edges from the stored shingle sets."""
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.rebuilds += 1
+            limit = self._limit()
+            self.common = {s for s, n in self.df.items() if n > limit}
+            self.sets = {}
+            self.tables = [{} for _ in range(BANDS)]
+            self.adj = {}
+            for id_, items in self.full.items():
+                items = self.sets[id_] = items - self.common if self.common else items
+                self.adj[id_] = set()
+                if items:
+                    for band, key in self._bands(items):
+                        self.tables[band].setdefault(key, set()).add(id_)
+            seen = set()
+            for table in self.tables:
+                for bucket in table.values():
+                    if len(bucket) < 2 or len(bucket) > self.max_bucket:
+                        continue
+                    members = list(bucket)
+                    for n, a in enumerate(members):
+                        for b in members[n + 1:]:
+                            pair = (a, b) if a < b else (b, a)
+                            if pair not in seen:
+                                seen.add(pair)
+                                if jaccard(self.sets[a], self.sets[b]) >= self.threshold:
+                                    self.adj[a].add(b)
+                                    self.adj[b].add(a)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def group(self, id_):
+        """Sorted ids connected to `id_` (itself alone when it has no near duplicate)."""
+        members = {id_}
+        todo = [id_]
+        while todo:
+            for other in self.adj[todo.pop()]:
+                if other not in members:
+                    members.add(other)
+                    todo.append(other)
+        return sorted(members)
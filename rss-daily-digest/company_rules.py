@@ -0,0 +1,90 @@
+"""Table-driven company classifier for same-company leaderboard caps.
+
+Rules live in config/company-rules.json; the first rule with any matching
+pattern wins. Source patterns and title patterns are each compiled into one
+trie-shaped regex (a regex-engine Aho-Corasick), so classifying an item is
+one scan per field however many vendors are listed. Feed names repeat all
+day, so the source verdict is memoized per source; the title is only scanned
+when a title rule could outrank it.
+"""
+import json
+import re
+from functools import lru_cache
+
+
+def load_rules(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['rules']
+
+
+def _trie_pattern(words):
+    """Regex source matching any of `words`, preferring the longest at a position."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        alts = [re.escape(ch) + build(node[ch]) for ch in sorted(k for k in node if k)]
+        if not alts:
+            return ''
+        body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class _Matcher:
+    """Find the highest-priority rule whose literal occurs in a text."""
+
+    def __init__(self, patterns):
+        # patterns: (rule index, literal). A hit reports the longest literal at
+        # its start position, so fold in every shorter literal it begins with.
+        rule_of = {}
+        for rule_idx, lit in patterns:
+            rule_of[lit] = min(rule_idx, rule_of.get(lit, rule_idx))
+        self.best_at = {lit: min(r for p, r in rule_of.items() if lit.startswith(p)) for lit in rule_of}
+        self.regex = re.compile(_trie_pattern(rule_of))
+
+    def best(self, text, stop_at=0):
+        best = None
+        search, best_at = self.regex.search, self.best_at
+        m = search(text)
+        while m:
+            rule_idx = best_at[m.group()]
+            if best is None or rule_idx < best:
+                best = rule_idx
+                if best <= stop_at:
+                    break
+            m = search(text, m.start() + 1)
+        return best
+
+
+def compile_rules(rules):
+    """Return classify(source, title, idx) -> company key (source when no rule matches)."""
+    source_pats = [(i, p) for i, r in enumerate(rules) for p in r.get('source', [])]
+    title_pats = [(i, p.lower()) for i, r in enumerate(rules) for p in r.get('title', [])]
+    source_m = _Matcher(source_pats) if source_pats else None
+    title_m = _Matcher(title_pats) if title_pats else None
+    first_title_rule = min((i for i, _ in title_pats), default=None)
+    companies = [rule['company'] for rule in rules]
+
+    @lru_cache(maxsize=None)  # bounded by the number of feeds
+    def source_rule(source):
+        return source_m.best(source) if source_m else None
+
+    def classify(source, title, idx=-1):
+        rule_idx = source_rule(source)
+        if title_m and (rule_idx is None or first_title_rule < rule_idx):
+            hit = title_m.best(title.lower(), first_title_rule)
+            if hit is not None and (rule_idx is None or hit < rule_idx):
+                rule_idx = hit
+        if rule_idx is None:
+            return source
+        company = companies[rule_idx]
+        return company.format(idx=idx) if '{' in company else company
+
+    classify.cache_info = source_rule.cache_info
+    return classify
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Multi-day digest history in SQLite (data/digest.db), with ranked range queries.
+
+summarized-items.json only ever holds the latest run. generate_summary.py
+also appends every run's scored items here: one row per item key (a later
+run updates the scores but keeps the first-seen run and input position),
+with the publication time as epoch seconds and the cap keys the daily
+ranking used, so a week or a quarter can be re-ranked with the same
+per-company caps without touching the archived Markdown.
+
+Top-K reads candidates in score order from the index and runs the daily
+greedy capped walk, stopping as soon as the board is full, so a 90-day Top
+10 touches a few dozen rows.
+
+Usage:
+  python3 digest_store.py top --days 7                  # best of the week (Global Top 10 caps)
+  python3 digest_store.py top --days 90 --board blogTop5
+  python3 digest_store.py trends --days 30 --period week --source "OpenAI Blog"
+"""
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from leaderboards import DEFAULT_BOARDS, walk
+
+SKILL_DIR = Path(__file__).resolve().parent
+HISTORY_PATH = SKILL_DIR / 'data' / 'digest.db'
+SETTINGS_PATH = SKILL_DIR / 'config' / 'settings.json'
+
+DIMENSIONS = ('relevance', 'sourceQuality', 'contentValue', 'actionability')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+  id INTEGER PRIMARY KEY,
+  summarizedAt TEXT NOT NULL,
+  totalItems INTEGER NOT NULL,
+  scored INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+  key TEXT PRIMARY KEY,
+  firstRun INTEGER NOT NULL REFERENCES runs(id),
+  lastRun INTEGER NOT NULL REFERENCES runs(id),
+  idx INTEGER NOT NULL,
+  pubDate TEXT,
+  pubTs INTEGER NOT NULL,
+  title TEXT, link TEXT, source TEXT, categoryId TEXT, categoryName TEXT,
+  summary TEXT, scoreReason TEXT,
+  relevance INTEGER, sourceQuality INTEGER, contentValue INTEGER, actionability INTEGER,
+  total REAL NOT NULL,
+  company TEXT,
+  caps TEXT NOT NULL,
+  derivativeOf TEXT
+);
+CREATE INDEX IF NOT EXISTS items_total ON items(total DESC, firstRun, idx);
+CREATE INDEX IF NOT EXISTS items_pub ON items(pubTs);
+CREATE INDEX IF NOT EXISTS items_category ON items(categoryId, total DESC);
+CREATE INDEX IF NOT EXISTS items_company ON items(company, pubTs);
+CREATE INDEX IF NOT EXISTS items_source ON items(source, pubTs);
+'''
+
+_UPSERT = f'''
+INSERT INTO items (key, firstRun, lastRun, idx, pubDate, pubTs, title, link, source, categoryId, categoryName,
+                   summary, scoreReason, {', '.join(DIMENSIONS)}, total, company, caps, derivativeOf)
+VALUES ({', '.join('?' * 21)})
+ON CONFLICT(key) DO UPDATE SET
+  lastRun = excluded.lastRun, summary = excluded.summary, scoreReason = excluded.scoreReason,
+  {', '.join(f'{d} = excluded.{d}' for d in DIMENSIONS)},
+  total = excluded.total, company = excluded.company, caps = excluded.caps, derivativeOf = excluded.derivativeOf
+'''
+
+
+def connect(path=HISTORY_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record_run(conn, store, rows, summarized_at, total_items, cap_keys, totals=None):
+    """Append one run: its scored `rows` of an item_store.ItemStore. Returns the run id.
+
+    `totals` overrides store.total (a run's totals may carry a recency decay
+    that means nothing across days).
+    """
+    totals = store.total if totals is None else totals
+    run_ts = int(datetime.fromisoformat(summarized_at).timestamp())
+    with conn:
+        run_id = conn.execute('INSERT INTO runs (summarizedAt, totalItems, scored) VALUES (?, ?, ?)',
+                              (summarized_at, total_items, len(rows))).lastrowid
+        records = []
+        for row in rows:
+            # Per-item cap keys ("simon-{idx}" in company-rules.json) take the item key, not the input
+            # position, so they name the same item in every run and never one of another run
+            view = {**store.view(row), '_idx': store.key[row]}
+            caps = {name: fn(view) for name, fn in cap_keys.items()}
+            scores = store.scores[row]
+            pub_ts = store.pubTs[row]
+            records.append((
+                store.key[row], run_id, run_id, store.idx[row], store.pubDate[row], run_ts if pub_ts is None else pub_ts,
+                store.title[row], store.link[row], store.source[row], store.categoryId[row],
+                store.categoryName[row], store.summary[row], store.scoreReason[row],
+                *(scores.get(d) for d in DIMENSIONS), totals[row],
+                caps.get('company'), json.dumps(caps, ensure_ascii=False), store.derivativeOf[row],
+            ))
+        conn.executemany(_UPSERT, records)
+    return run_id
+
+
+def window(days, end=None):
+    """(start, end) epoch seconds of the `days` before `end` (default now)."""
+    end = end or time.time()
+    return int(end - days * 86400), int(end)
+
+
+def top_k(conn, start, end, board=DEFAULT_BOARDS['smartPicks'], name='smartPicks'):
+    """One leaderboard over items published in [start, end), with the board's caps.
+
+    Candidates stream in descending total, ties in input order (first-seen
+    run, then position in that run's input) like the daily ranking, so the
+    walk stops reading once the board is full. As in the daily run
+    (generate_summary.store_picks), derivative coverage is skipped when
+    `name` is smartPicks and ranked like any item on the other boards.
+    """
+    # The unary + keeps SQLite off the pubTs / categoryId indexes: it cannot
+    # know the walk stops early, and would sort the whole window instead of
+    # reading items_total in order
+    sql = 'SELECT * FROM items WHERE +pubTs >= ? AND +pubTs < ?'
+    if name == 'smartPicks':
+        sql += ' AND derivativeOf IS NULL'
+    params = [start, end]
+    cats = board.get('categories')
+    if cats:
+        sql += f' AND +categoryId IN ({", ".join("?" * len(cats))})'
+        params += cats
+    rows = conn.execute(sql + ' ORDER BY total DESC, firstRun, idx', params)
+    caps = board.get('caps', {})
+    key_fns = {name: (lambda row, name=name: json.loads(row['caps']).get(name)) for name in caps}
+    return walk(rows, board['size'], caps, key_fns)
+
+
+def source_trends(conn, start, end, sources=None, period='day'):
+    """Per-source item count, mean and best total per day/week/month in [start, end)."""
+    bucket = {'day': '%Y-%m-%d', 'week': '%Y-W%W', 'month': '%Y-%m'}[period]
+    sql = (f"SELECT source, strftime('{bucket}', pubTs, 'unixepoch') AS period, COUNT(*) AS items, "
+           'ROUND(AVG(total), 2) AS mean, MAX(total) AS best FROM items WHERE pubTs >= ? AND pubTs < ?')
+    params = [start, end]
+    if sources:
+        sql += f' AND source IN ({", ".join("?" * len(sources))})'
+        params += sources
+    return conn.execute(sql + ' GROUP BY source, period ORDER BY source, period', params).fetchall()
+
+
+def load_boards():
+    try:
+        with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get('leaderboards', DEFAULT_BOARDS)
+    except (OSError, ValueError):
+        return DEFAULT_BOARDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=Path, default=HISTORY_PATH, help='history database')
+    sub = parser.add_subparsers(dest='command', required=True)
+    top = sub.add_parser('top', help='ranked top-K over a date range')
+    top.add_argument('--board', default='smartPicks', help='leaderboard from settings.json whose size/caps to use')
+    top.add_argument('--size', type=int, help='override the board size')
+    trends = sub.add_parser('trends', help='per-source score trends')
+    trends.add_argument('--source', action='append', help='limit to this source (repeatable)')
+    trends.add_argument('--period', choices=('day', 'week', 'month'), default='day')
+    for p in (top, trends):
+        p.add_argument('--days', type=float, default=7, help='range length (default 7)')
+        p.add_argument('--end', help='last day of the range, YYYY-MM-DD (default: up to now)')
+        p.add_argument('--json', action='store_true', help='print JSON rows')
+    args = parser.parse_args()
+
+    end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc).timestamp() + 86400 if args.end else None
+    start, end = window(args.days, end)
+    conn = connect(args.db)
+    started = time.perf_counter()
+    if args.command == 'top':
+        board = dict(load_boards()[args.board])
+        if args.size:
+            board['size'] = args.size
+        rows = top_k(conn, start, end, board, args.board)
+    else:
+        rows = source_trends(conn, start, end, args.source, args.period)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps([dict(r) for r in rows], ensure_ascii=False, indent=2))
+        return
+    if args.command == 'top':
+        for rank, r in enumerate(rows, 1):
+            print(f'{rank:2d}. [{r["total"]:.2f}|{r["company"]}] {r["source"]}: {r["title"][:55]}'
+                  f'  ({r["pubDate"] or "-"})')
+    else:
+        for r in rows:
+            print(f'{r["source"][:30]:<30} {r["period"]:<10} {r["items"]:>4} items  mean {r["mean"]:.2f}'
+                  f'  best {r["best"]:.2f}')
+    print(f'\n{len(rows)} rows in {elapsed:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Today's hand-written summaries (formerly the ITEM_DATA literal in generate_summary.py).
+
+item-data.json is the file to edit: a JSON object keyed by the item's
+16-hex key from pending-items.json (never by position: positions change
+whenever filtered-items.json is rebuilt). Python used to compile and build the whole literal on
+every import; now the JSON is compiled, once per edit, into a pack that is
+mmap'd and read on demand:
+
+    header   magic, marshal version, slot count, entry count,
+             source mtime/size (the pack is rebuilt when they change)
+    slots    open-addressing hash table, crc32 of the key, linear probing;
+             each slot is the NUL-padded key, record offset and length
+    records  one marshal blob per entry
+
+A lookup reads one or two slots and decodes only that record, so start-up
+cost does not grow with the file.
+"""
+import json
+import marshal
+import mmap
+import os
+import re
+import struct
+import zlib
+
+MAGIC = b'IDP1'
+_HEADER = struct.Struct('<4sHIIqq')
+_SLOT = struct.Struct('<16sQI')
+KEY_BYTES = 16
+_KEY = re.compile(r'[0-9a-f]{16}')
+
+
+def _slot_count(count):
+    """Power of two at least twice the entry count, so probe runs stay short."""
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def build_pack(source, pack):
+    """Compile the JSON at `source` into `pack` (via a .tmp rename). Returns the entry count."""
+    with open(source, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    slots = _slot_count(len(entries))
+    table = [None] * slots
+    records = []
+    offset = _HEADER.size + slots * _SLOT.size
+    for key, entry in entries.items():
+        if not _KEY.fullmatch(key):
+            raise ValueError(f'{source}: bad key {key!r} (use the item\'s key from pending-items.json)')
+        raw = key.encode('ascii')
+        blob = marshal.dumps(entry)
+        n = zlib.crc32(raw) & (slots - 1)
+        while table[n] is not None:
+            n = (n + 1) & (slots - 1)
+        table[n] = _SLOT.pack(raw, offset, len(blob))
+        records.append(blob)
+        offset += len(blob)
+
+    empty = _SLOT.pack(b'', 0, 0)
+    tmp = f'{pack}.tmp'
+    os.makedirs(os.path.dirname(os.path.abspath(pack)), exist_ok=True)
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, marshal.version, slots, len(entries), *_stamp(source)))
+        f.writelines(slot or empty for slot in table)
+        f.writelines(records)
+    os.replace(tmp, pack)
+    return len(entries)
+
+
+class ItemData:
+    """Read-only mapping view of item-data.json, by item key."""
+
+    def __init__(self, source, pack):
+        self.source = source
+        self.pack = pack
+        self._map = None
+        self._slots = 0
+        self._count = None
+
+    def _open(self):
+        if self._count is not None:
+            return
+        self._count = 0
+        if not os.path.exists(self.source):
+            return
+        if not self._fresh():
+            build_pack(self.source, self.pack)
+        with open(self.pack, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, self._slots, self._count, _, _ = _HEADER.unpack_from(self._map)
+
+    def _fresh(self):
+        try:
+            with open(self.pack, 'rb') as f:
+                header = f.read(_HEADER.size)
+            magic, version, _, _, mtime, size = _HEADER.unpack(header)
+        except (OSError, struct.error):
+            return False
+        return magic == MAGIC and version == marshal.version and (mtime, size) == _stamp(self.source)
+
+    def __len__(self):
+        self._open()
+        return self._count
+
+    def get(self, key, default=None):
+        self._open()
+        if not self._count:
+            return default
+        raw = key.encode()
+        mask = self._slots - 1
+        n = zlib.crc32(raw) & mask
+        while True:
+            slot_key, offset, length = _SLOT.unpack_from(self._map, _HEADER.size + n * _SLOT.size)
+            if not length:
+                return default
+            if slot_key.rstrip(b'\0') == raw:
+                return marshal.loads(self._map[offset:offset + length])
+            n = (n + 1) & mask
+
+    def items(self):
+        """Every (key, entry) pair, in table order."""
+        self._open()
+        for n in range(self._slots if self._count else 0):
+            slot_key, offset, length = _SLOT.unpack_from(self._map, _HEADER.size + n * _SLOT.size)
+            if length:
+                yield slot_key.rstrip(b'\0').decode('ascii'), marshal.loads(self._map[offset:offset + length])
@@ -0,0 +1,76 @@
+"""Column store for processed items.
+
+generate_summary.py used to build a 10+ key dict per item and copy it again
+for each leaderboard and for the output. Here every field is one list indexed
+by row, the strings that repeat across items (source, categoryId,
+categoryName) are interned so each distinct value is stored once, and the
+scores dict from ITEM_DATA / the cache is referenced rather than copied.
+Leaderboards hold row numbers; output dicts are built once, when written.
+pubTs is pubDate parsed once (time_index.parse_pub_date) into epoch
+seconds, or None, for decay and time-window boards.
+"""
+import sys
+
+
+class ItemStore:
+    __slots__ = ('idx', 'key', 'cached', 'title', 'link', 'source', 'categoryId', 'categoryName',
+                 'pubDate', 'summary', 'scores', 'total', 'scoreReason', 'company', 'pubTs', 'derivativeOf')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, [])
+
+    def __len__(self):
+        return len(self.idx)
+
+    def append(self, idx, key, cached, title, link, source, categoryId, categoryName, pubDate, summary,
+               scores, total, scoreReason, company, pubTs=None, derivativeOf=None):
+        """Add one row; returns its row number."""
+        self.idx.append(idx)
+        self.key.append(key)
+        self.cached.append(cached)
+        self.title.append(title)
+        self.link.append(link)
+        self.source.append(sys.intern(source))
+        self.categoryId.append(sys.intern(categoryId))
+        self.categoryName.append(sys.intern(categoryName))
+        self.pubDate.append(pubDate)
+        self.summary.append(summary)
+        self.scores.append(scores)
+        self.total.append(total)
+        self.scoreReason.append(scoreReason)
+        self.company.append(company)
+        self.pubTs.append(pubTs)
+        self.derivativeOf.append(derivativeOf)
+        return len(self.idx) - 1
+
+    @classmethod
+    def from_rows(cls, rows):
+        """A store built column-wise from append() argument tuples (without derivativeOf)."""
+        store = cls()
+        columns = list(zip(*rows))
+        if columns:
+            for name, column in zip(cls.__slots__, columns):
+                setattr(store, name, list(column))
+            for name in ('source', 'categoryId', 'categoryName'):
+                setattr(store, name, list(map(sys.intern, getattr(store, name))))
+            store.derivativeOf = [None] * len(store.idx)
+        return store
+
+    def pop(self):
+        """Drop the last row (used by the streaming passes to keep only what they need)."""
+        for name in self.__slots__:
+            getattr(self, name).pop()
+
+    def scored_rows(self):
+        return [row for row, total in enumerate(self.total) if total is not None]
+
+    def view(self, row):
+        """The ranking fields of one row as a dict, as the cap key functions expect."""
+        view = {'title': self.title[row], 'link': self.link[row], 'source': self.source[row],
+                'categoryId': self.categoryId[row], '_idx': self.idx[row]}
+        if self.scores[row] is not None:
+            view['scores'] = {**self.scores[row], 'total': self.total[row]}
+        if self.company[row]:
+            view['company'] = self.company[row]
+        return view
@@ -0,0 +1,97 @@
+"""Single-pass top-K selection for every leaderboard.
+
+A board is declared as
+    {"size": 10, "categories": [...], "caps": {"company": 2, "arxiv": 1}}
+`categories` limits which items are eligible (omit for all). `caps` limits
+how many picks may share a key; the key functions are supplied by the caller
+and an item whose key is None is not limited by that cap.
+
+Selection is the same greedy walk as a full sort: descending total score,
+ties in input order, skipping items whose cap is full. Each board keeps a
+bounded min-heap of its best `size * POOL_FACTOR` candidates during one pass
+over the input, so the walk only sorts the pool. If caps reject so many
+items that the pool runs dry before the board is full, that board falls back
+to walking all of its candidates, so the result is always exact.
+"""
+import heapq
+
+POOL_FACTOR = 4
+
+# Matches today's hardcoded boards; overridden by settings.json "leaderboards"
+DEFAULT_BOARDS = {
+    'smartPicks': {'size': 10, 'caps': {'company': 2, 'arxiv': 1}},
+    'podcastTop5': {'size': 5, 'categories': ['podcasts']},
+    'blogTop5': {'size': 5, 'categories': ['tech-blogs', 'ai-company-blogs', 'ai-developers'],
+                 'caps': {'company': 2}},
+}
+
+
+def score_of(item):
+    return item['scores']['total']
+
+
+def walk(ordered, size, caps, key_fns):
+    """Greedy capped selection over items already in rank order."""
+    picks = []
+    counts = {name: {} for name in caps}
+    for item in ordered:
+        keys = {}
+        for name, limit in caps.items():
+            key = key_fns[name](item)
+            if key is not None and counts[name].get(key, 0) >= limit:
+                break
+            keys[name] = key
+        else:
+            for name, key in keys.items():
+                if key is not None:
+                    counts[name][key] = counts[name].get(key, 0) + 1
+            picks.append(item)
+            if len(picks) >= size:
+                break
+    return picks
+
+
+def category_of(item):
+    return item.get('categoryId')
+
+
+def select_boards(candidates, boards, key_fns, score=score_of, category=category_of):
+    """Return {board name: picks in rank order} for scored `candidates` (input order).
+
+    Candidates may be anything `score`, `category` and `key_fns` accept, e.g.
+    row numbers into an item_store.ItemStore.
+    """
+    specs = []
+    for name, spec in boards.items():
+        cats = spec.get('categories')
+        specs.append((name, spec['size'], set(cats) if cats else None, spec.get('caps', {}), []))
+
+    # One pass: keep each board's best (score, -position) pairs in a bounded
+    # min-heap. `floors[b]` is the heap's smallest score once full, so most items
+    # are rejected with a single float comparison.
+    pools = [(cats, heap, size * POOL_FACTOR) for _, size, cats, _, heap in specs]
+    floors = [float('-inf')] * len(pools)
+    for pos, item in enumerate(candidates):
+        sc = score(item)
+        cat = category(item)
+        for b, (cats, heap, limit) in enumerate(pools):
+            if sc < floors[b] or (cats is not None and cat not in cats):
+                continue
+            if len(heap) < limit:
+                heapq.heappush(heap, (sc, -pos))
+                if len(heap) == limit:
+                    floors[b] = heap[0][0]
+            elif (sc, -pos) > heap[0]:
+                heapq.heapreplace(heap, (sc, -pos))
+                floors[b] = heap[0][0]
+
+    result = {}
+    for name, size, cats, caps, heap in specs:
+        ordered = [candidates[-neg] for _, neg in sorted(heap, reverse=True)]
+        picks = walk(ordered, size, caps, key_fns)
+        if len(picks) < size and len(heap) == size * POOL_FACTOR:
+            eligible = [c for c in candidates if cats is None or category(c) in cats]
+            eligible.sort(key=score, reverse=True)
+            picks = walk(eligible, size, caps, key_fns)
+        result[name] = picks
+    return result
@@ -0,0 +1,74 @@
+"""Per-stage run metrics for generate_summary.py, written as metrics.json.
+
+Always recorded, for a few clock reads per stage: wall time, CPU time, the
+process's peak RSS so far and whatever counts the stage reports. Per-stage
+peak traced memory needs tracemalloc, which slows allocation-heavy code
+down noticeably, so it is only collected when asked for (--trace-memory).
+"""
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# ru_maxrss is KiB on Linux, bytes on macOS
+_RSS_UNIT = 1 << 20 if sys.platform == 'darwin' else 1 << 10
+
+
+def max_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / _RSS_UNIT
+
+
+class Metrics:
+    def __init__(self, trace_memory=False, **info):
+        self.trace_memory = trace_memory
+        self.info = info
+        self.stages = []
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block; the yielded dict collects the stage's counts."""
+        counts = {}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield counts
+        finally:
+            entry = {
+                'name': name,
+                'wallSeconds': round(time.perf_counter() - wall, 4),
+                'cpuSeconds': round(time.process_time() - cpu, 4),
+                'maxRssMiB': round(max_rss_mib(), 1),
+            }
+            if self.trace_memory:
+                entry['tracedPeakMiB'] = round(tracemalloc.get_traced_memory()[1] / (1 << 20), 2)
+            entry.update(counts)
+            self.stages.append(entry)
+
+    def summary(self):
+        return {
+            'startedAt': self.started_at,
+            **self.info,
+            'wallSeconds': round(time.perf_counter() - self._wall, 4),
+            'cpuSeconds': round(time.process_time() - self._cpu, 4),
+            'maxRssMiB': round(max_rss_mib(), 1),
+            'stages': self.stages,
+        }
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def line(self):
+        """One-line stage breakdown for the console / launchd log."""
+        return ', '.join(f"{s['name']} {s['wallSeconds']:.2f}s" for s in self.stages)
@@ -0,0 +1,147 @@
+"""Partitioned summarized output: a small index plus one NDJSON shard per category.
+
+    summarized/
+      index.json                 header fields, every leaderboard, and the shard table
+      <categoryId>.<hash>.ndjson one compact JSON item per line, in input order (shard_name())
+
+The index is all the DingTalk notifier needs; a category page reads only its
+own shard. The index records each shard's file, item count and byte size.
+Shard files are named by a hash of their content, so a run never replaces a
+file the current index names: its changed shards go to new files, the index
+is swapped in last (every file via a .tmp rename), and only then are the
+shards no index names any more removed. A reader that loads the index and
+then its shards sees one run throughout; if it is slow enough for that run's
+shards to be removed by a later one, the open fails and it should reload the
+index.
+"""
+import hashlib
+import json
+import os
+import re
+
+INDEX_NAME = 'index.json'
+VERSION = 1
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def _stem(category_id):
+    """`category_id` as a file name stem.
+
+    Characters outside [A-Za-z0-9._-] become "_", and then a hash of the raw
+    id is appended, so `a/b` and `a?b` get different files.
+    """
+    safe = _UNSAFE.sub('_', category_id)
+    if safe != category_id or not safe:
+        safe = f"{safe or '_'}-{hashlib.sha1(category_id.encode('utf-8')).hexdigest()[:8]}"
+    return safe
+
+
+def shard_name(category_id, content_hash):
+    """File name of a category's shard: `<categoryId>.<hash>.ndjson`.
+
+    `content_hash` is a hashlib object fed every line of the shard.
+    """
+    return f'{_stem(category_id)}.{content_hash.hexdigest()[:12]}.ndjson'
+
+
+def entry_line(entry):
+    """One shard line, encoded."""
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def write_partitioned(path, header, arrays):
+    """Write `arrays` ((name, entries) pairs) under directory `path`.
+
+    The 'items' array becomes the shards; every other array is a leaderboard
+    and goes into the index. Arrays are consumed in order, like
+    generate_summary.write_output(), so a leaderboard may be produced while
+    items are written.
+    """
+    os.makedirs(path, exist_ok=True)
+    shards = {}
+    sources = set()
+    boards = {}
+    for name, entries in arrays:
+        if name != 'items':
+            boards[name] = list(entries)
+            continue
+        try:
+            for entry in entries:
+                cat = entry['categoryId']
+                shard = shards.get(cat)
+                if shard is None:
+                    shard = shards[cat] = {'categoryName': entry['categoryName'], 'file': None, 'count': 0,
+                                           'bytes': 0, '_f': open(os.path.join(path, _stem(cat) + '.tmp'), 'wb'),
+                                           '_hash': hashlib.sha1()}
+                line = entry_line(entry)
+                shard['_f'].write(line)
+                shard['_hash'].update(line)
+                shard['count'] += 1
+                shard['bytes'] += len(line)
+                sources.add(entry['source'])
+        finally:
+            for shard in shards.values():
+                shard.pop('_f').close()
+
+    for cat, shard in shards.items():
+        shard['file'] = shard_name(cat, shard.pop('_hash'))
+        os.replace(os.path.join(path, _stem(cat) + '.tmp'), os.path.join(path, shard['file']))
+    return write_index(path, header, boards, shards, len(sources))
+
+
+def write_shard(path, category_id, lines):
+    """Write one category's shard from the encoded NDJSON `lines` (via a .tmp rename); returns its file name.
+
+    The shard the current index names is left in place for write_index() to remove.
+    """
+    content_hash = hashlib.sha1()
+    tmp = os.path.join(path, _stem(category_id) + '.tmp')
+    with open(tmp, 'wb') as f:
+        for line in lines:
+            f.write(line)
+            content_hash.update(line)
+    file = shard_name(category_id, content_hash)
+    os.replace(tmp, os.path.join(path, file))
+    return file
+
+
+def write_index(path, header, boards, shards, total_sources):
+    """Write index.json for `shards` ({categoryId: shard entry}, in first-seen order).
+
+    Shard files no entry names are removed after the index is swapped in;
+    call it once the shards themselves are in place.
+    """
+    index = {'version': VERSION, **header, 'totalSources': total_sources, **boards,
+             'categories': {cat: shard for cat, shard in shards.items()}}
+    tmp = os.path.join(path, INDEX_NAME + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, os.path.join(path, INDEX_NAME))
+
+    live = {shard['file'] for shard in shards.values()}
+    for name in os.listdir(path):
+        if name.endswith('.ndjson') and name not in live:
+            os.remove(os.path.join(path, name))
+    return index
+
+
+def load_index(path):
+    with open(os.path.join(path, INDEX_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_category(path, index, category_id):
+    """Yield the items of one category from its shard."""
+    shard = index['categories'].get(category_id)
+    if shard is None:
+        return
+    with open(os.path.join(path, shard['file']), 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def iter_all(path, index):
+    """Every item, category by category in first-seen order."""
+    for cat in index['categories']:
+        yield from iter_category(path, index, cat)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Offline relevance pre-scorer: hashed text vectors against the user profile (requires NumPy).
+
+The relevance dimension follows the user profile in SKILL.md: core tools
+score 5, the focus areas (LLM APIs, AI coding, agents, image models) 4,
+the infrastructure around them 3, general AI news 2 and anything else 1.
+Each level's term list is turned into a vector of hashed words and word
+pairs, and so is each item's title, source and description. Scoring a
+batch is a few NumPy passes over the batch's bytes, with no model and no
+network. An item's provisional relevance is the highest level whose
+cosine similarity reaches `threshold`. The item is borderline when
+scaling the threshold by (1 + margin) either way would change that
+answer, or when it has fewer than `minWords` words to go on (a release
+titled "v2.1.50"). Only borderline items still need a full score from
+summarize.py or by hand.
+
+Usage:
+  python3 prescore.py                  # pre-score items without scores → data/prescores.json
+  python3 prescore.py --agreement      # compare with the relevance already in ITEM_DATA / the cache
+  python3 summarize.py --prescores data/prescores.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import generate_summary as gs
+from summary_cache import item_key, load_cache
+
+PRESCORE_PATH = gs.DATA_DIR / 'prescores.json'
+
+# Relevance level of each profile list; items matching none score 1.
+# Override the lists, threshold, margin and minWords under "prescore" in settings.json.
+LEVELS = {'coreTools': 5, 'focusAreas': 4, 'infrastructure': 3, 'generalAI': 2}
+DEFAULT_PROFILE = {
+    'coreTools': ['Claude Code', 'Codex', 'Cursor', 'GitHub Copilot', 'Windsurf'],
+    'focusAreas': ['LLM API', 'Messages API', 'Agents SDK', 'AI agent', 'agent framework', 'MCP server',
+                   'Model Context Protocol', 'AI coding', 'coding agent', 'code generation', 'image model',
+                   'image generation', 'Claude', 'GPT', 'Gemini', 'LLM'],
+    'infrastructure': ['deployment', 'inference', 'vector database', 'embeddings', 'serverless', 'Kubernetes',
+                       'GPU', 'cloud', 'vLLM', 'Ollama', 'llama.cpp', 'RAG', 'observability'],
+    'generalAI': ['AI', 'artificial intelligence', 'machine learning', 'chatbot', 'generative AI', 'AI startup'],
+}
+DEFAULTS = {'threshold': 0.04, 'margin': 0.25, 'minWords': 8}
+
+# 2**22 one-byte buckets: a 4 MB table, and about one item in a hundred
+# with a chance collision against a few hundred profile features
+FEATURE_BITS = 22
+BATCH = 10_000
+
+# Bytes that belong to a word after lowercasing: ASCII letters and digits,
+# and every byte of a non-ASCII character (so a run of CJK text is one word)
+_WORD_BYTE = np.zeros(256, dtype=np.int8)
+_WORD_BYTE[list(b'abcdefghijklmnopqrstuvwxyz0123456789')] = 1
+_WORD_BYTE[0x80:] = 1
+_MASKS = np.array([(1 << 8 * n) - 1 for n in range(8)] + [(1 << 64) - 1], dtype=np.uint64)
+_K1, _K2 = np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+def item_text(item):
+    return f"{item.get('title', '')} {item.get('feedName', item.get('source', ''))} {item.get('description', '')}"
+
+
+def hashed_features(texts, bits=FEATURE_BITS):
+    """Bucket numbers of the words and adjacent word pairs in `texts`.
+
+    Returns (words, pairs, firsts): text k's words are
+    words[firsts[k]:firsts[k + 1]], and pairs[i] joins words i and i + 1
+    (across a text boundary too; callers drop those). A word is hashed
+    from its first and last eight bytes, read as integers straight out of
+    the joined buffer.
+    """
+    buf = ('\0' + '\0'.join(texts) + '\0').lower().encode('utf-8')
+    if buf.count(b'\0') != len(texts) + 1:
+        buf = ('\0' + '\0'.join(t.replace('\0', ' ') for t in texts) + '\0').lower().encode('utf-8')
+    buf += b' ' * 8
+    data = np.frombuffer(buf, dtype=np.uint8)
+    word = _WORD_BYTE[data]
+    # Padding on both sides is not word bytes, so edges alternate start, end
+    edges = np.flatnonzero(word[1:] != word[:-1]) + 1
+    starts, ends = edges[0::2], edges[1::2]
+    windows = np.ndarray((len(buf) - 7,), dtype='<u8', buffer=buf, strides=(1,))
+    lengths = ends - starts
+    h = windows[starts] & _MASKS[np.minimum(lengths, 8)]
+    long = np.flatnonzero(lengths > 8)
+    h[long] ^= windows[ends[long] - 8] * _K2
+    h *= _K1
+    shift = np.uint64(64 - bits)
+    pairs = ((h[:-1] + h[1:] * _K2) * _K1) >> shift
+    firsts = np.searchsorted(starts, np.flatnonzero(data == 0))
+    return (h >> shift).astype(np.int64), pairs.astype(np.int64), firsts
+
+
+class Profile:
+    """Hashed profile vectors, one per relevance level, and a batch scorer against them."""
+
+    def __init__(self, terms=None, threshold=DEFAULTS['threshold'], margin=DEFAULTS['margin'],
+                 min_words=DEFAULTS['minWords'], bits=FEATURE_BITS):
+        terms = {**DEFAULT_PROFILE, **(terms or {})}
+        self.names = sorted(terms, key=LEVELS.__getitem__, reverse=True)
+        self.levels = np.array([LEVELS[name] for name in self.names] + [1], dtype=np.int8)
+        self.threshold, self.margin, self.min_words, self.bits = threshold, margin, min_words, bits
+        # One bit per level for each bucket a term's words or word pairs hash to
+        self.table = np.zeros(1 << bits, dtype=np.uint8)
+        sizes = []
+        for j, name in enumerate(self.names):
+            words, pairs, firsts = hashed_features(terms[name], bits)
+            ends = firsts[1:-1] - 1
+            inner = np.ones(len(pairs), dtype=bool)
+            inner[ends[(ends >= 0) & (ends < len(pairs))]] = False
+            buckets = np.unique(np.concatenate((words, pairs[inner])))
+            self.table[buckets] |= np.uint8(1 << j)
+            sizes.append(len(buckets))
+        self.norms = np.sqrt(np.array(sizes, dtype=np.float64))
+
+    def similarity(self, texts):
+        """((len(texts), levels) cosine similarities in descending level order, word count per text).
+
+        Item vectors are binary over the buckets they hit; their length is
+        taken as the square root of their word and pair count, so a word
+        repeated in the description weighs on the norm like a new one.
+        """
+        words, pairs, firsts = hashed_features(texts, self.bits)
+        n = len(texts)
+        hit_words = np.flatnonzero(self.table[words])
+        hit_pairs = np.flatnonzero(self.table[pairs])
+        owner = np.searchsorted(firsts, hit_words, 'right') - 1
+        pair_owner = np.searchsorted(firsts, hit_pairs, 'right') - 1
+        same = pair_owner == np.searchsorted(firsts, hit_pairs + 1, 'right') - 1
+        # Distinct (item, bucket) hits
+        keys = np.unique(np.concatenate((owner << self.bits | words[hit_words],
+                                         pair_owner[same] << self.bits | pairs[hit_pairs[same]])))
+        owner, masks = keys >> self.bits, self.table[keys & ((1 << self.bits) - 1)]
+        sims = np.empty((n, len(self.names)))
+        for j in range(len(self.names)):
+            sims[:, j] = np.bincount(owner[(masks >> j) & 1 == 1], minlength=n)
+        counts = np.diff(firsts)
+        length = np.sqrt(np.maximum(2 * counts - 1, 1))
+        return sims / length[:, None] / self.norms, counts
+
+    def relevance(self, sims, threshold=None):
+        """The highest level reaching `threshold` in each row of `sims`, else 1."""
+        reached = sims >= (self.threshold if threshold is None else threshold)
+        first = np.where(reached.any(axis=1), reached.argmax(axis=1), len(self.names))
+        return self.levels[first]
+
+    def score(self, items):
+        """(relevance, borderline, best similarity) arrays for a list of items."""
+        relevance, borderline, best = [], [], []
+        for start in range(0, len(items), BATCH):
+            sims, words = self.similarity([item_text(item) for item in items[start:start + BATCH]])
+            relevance.append(self.relevance(sims))
+            borderline.append((self.relevance(sims, self.threshold * (1 + self.margin))
+                               != self.relevance(sims, self.threshold / (1 + self.margin)))
+                              | (words < self.min_words))
+            best.append(sims.max(axis=1, initial=0.0))
+        if not relevance:
+            return np.empty(0, np.int8), np.empty(0, bool), np.empty(0)
+        return np.concatenate(relevance), np.concatenate(borderline), np.concatenate(best)
+
+
+def load_profile(settings=None):
+    config = (settings or gs.load_settings()).get('prescore', {})
+    config = {**DEFAULTS, **config}
+    return Profile(config.get('profile'), config['threshold'], config['margin'], config['minWords'])
+
+
+def known_relevance(items, cache):
+    """{position: relevance} for items already scored in ITEM_DATA or the cache."""
+    known = {}
+    for i, item in enumerate(items):
+        _, info = gs.lookup_info(item, None)
+        scores = (info or cache.get(item_key(item), {})).get('scores') or {}
+        if scores.get('relevance') is not None:
+            known[i] = scores['relevance']
+    return known
+
+
+def agreement(relevance, borderline, truth):
+    """Agreement stats of provisional `relevance` with the `truth` scores (arrays of the same length)."""
+    confident = ~borderline
+    diff = np.abs(relevance.astype(np.int64) - np.rint(truth).astype(np.int64))
+    confusion = np.zeros((5, 5), dtype=np.int64)
+    np.add.at(confusion, (np.rint(truth).astype(np.int64) - 1, relevance.astype(np.int64) - 1), 1)
+    return {'items': len(truth), 'exact': float(np.mean(diff == 0)) if len(diff) else 0.0,
+            'withinOne': float(np.mean(diff <= 1)) if len(diff) else 0.0,
+            'borderline': int(borderline.sum()),
+            'confidentExact': float(np.mean(diff[confident] == 0)) if confident.any() else 0.0,
+            'confusion': confusion.tolist()}
+
+
+def print_agreement(stats):
+    print(f'{stats["items"]} scored items: {stats["exact"]:.1%} exact, {stats["withinOne"]:.1%} within one; '
+          f'{stats["borderline"]} borderline, {stats["confidentExact"]:.1%} exact on the rest')
+    print('\nscored \\ provisional    1     2     3     4     5')
+    for level, row in enumerate(stats['confusion'], 1):
+        print(f'{level:>20} ' + ' '.join(f'{n:>5}' for n in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=gs.INPUT_PATH, help='filtered-items.json to pre-score')
+    parser.add_argument('--cache', default=gs.CACHE_PATH, help='summary cache (items scored there are skipped)')
+    parser.add_argument('--output', default=PRESCORE_PATH, help='where to write the provisional scores')
+    parser.add_argument('--agreement', action='store_true',
+                        help='score the items that already have a relevance and compare instead')
+    parser.add_argument('--threshold', type=float, help='override prescore.threshold')
+    args = parser.parse_args()
+
+    profile = load_profile()
+    if args.threshold is not None:
+        profile.threshold = args.threshold
+    items = gs.load_items(args.input)['items']
+    cache = load_cache(args.cache)
+    known = known_relevance(items, cache)
+
+    if args.agreement:
+        positions = sorted(known)
+        if not positions:
+            print('No item in the input has a relevance score in ITEM_DATA or the cache yet.')
+            return
+        relevance, borderline, _ = profile.score([items[i] for i in positions])
+        print_agreement(agreement(relevance, borderline, np.array([known[i] for i in positions], dtype=np.float64)))
+        return
+
+    todo = [item for i, item in enumerate(items) if i not in known]
+    start = time.perf_counter()
+    relevance, borderline, best = profile.score(todo)
+    seconds = time.perf_counter() - start
+    scores = {item_key(item): {'relevance': int(r), 'borderline': bool(b), 'similarity': round(float(s), 4)}
+              for item, r, b, s in zip(todo, relevance, borderline, best)}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'threshold': profile.threshold, 'margin': profile.margin, 'items': scores}, f,
+                  ensure_ascii=False, indent=2)
+
+    print(f'Pre-scored {len(todo)} items in {seconds:.2f}s → {args.output}')
+    print(f'{int(borderline.sum())} borderline (need a full score), '
+          f'{len(todo) - int(borderline.sum())} confident: '
+          + ', '.join(f'{level}: {int(((relevance == level) & ~borderline).sum())}' for level in range(5, 0, -1)))
+
+
+if __name__ == '__main__':
+    main()
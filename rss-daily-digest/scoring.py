@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Columnar scoring, ranking and weight sweeps over past digests (requires NumPy).
+
+The daily run scores a few dozen items and stays pure Python
+(generate_summary.get_score_total). This tool is for tuning the weights: the
+four score dimensions of every scored item in data/summary-cache.json sit in
+one (n, 4) array, so totals, ranks and leaderboard membership are computed in
+batch, and a sweep re-ranks the whole corpus under thousands of weight
+vectors and reports how far each one moves the Global Top 10.
+
+Usage:
+  python3 scoring.py                       # rank the cached corpus with settings.json weights and boards
+  python3 scoring.py --sweep 1000          # random weight vectors vs the current weights
+  python3 scoring.py --sweep-grid 0.05     # every weight vector on a 0.05 grid
+"""
+import argparse
+import itertools
+import json
+
+import numpy as np
+
+from generate_summary import CACHE_PATH, CAP_KEYS, SCORE_WEIGHTS, load_settings
+from leaderboards import DEFAULT_BOARDS, POOL_FACTOR, walk
+from summary_cache import load_cache
+
+DIMENSIONS = ('relevance', 'sourceQuality', 'contentValue', 'actionability')
+
+
+class Corpus:
+    """Struct-of-arrays view of scored items.
+
+    `matrix` is (n, 4) in DIMENSIONS order; `caps[name]` holds an int code
+    per item for each cap key (-1 where the key is None, i.e. uncapped);
+    `categories` holds the categoryId per item.
+    """
+
+    def __init__(self, records, key_fns=CAP_KEYS):
+        self.records = records
+        self.matrix = np.array([[r['scores'][d] for d in DIMENSIONS] for r in records], dtype=np.float64)
+        self.matrix = self.matrix.reshape(len(records), len(DIMENSIONS))
+        self.categories = np.array([r.get('categoryId', '') for r in records], dtype=object)
+        self.caps = {}
+        for name, fn in key_fns.items():
+            codes = {}
+            self.caps[name] = np.array(
+                [-1 if (k := fn(r)) is None else codes.setdefault(k, len(codes)) for r in records],
+                dtype=np.int64)
+
+    def __len__(self):
+        return len(self.records)
+
+
+def weight_vector(weights):
+    return np.array([weights[d] for d in DIMENSIONS], dtype=np.float64)
+
+
+def rank_keys(corpus, weights):
+    """Integer sort keys for weight vector(s): higher is better, ties go to the earlier item.
+
+    Totals are rounded to cents exactly as get_score_total() rounds them, so
+    the ordering matches the pure-Python path. `weights` is (4,) or (m, 4);
+    the result is (n,) or (m, n).
+    """
+    n = len(corpus)
+    cents = np.rint((np.atleast_2d(weights) @ corpus.matrix.T) * 100).astype(np.int64)
+    keys = cents * n + (n - 1 - np.arange(n, dtype=np.int64))
+    return keys[0] if np.ndim(weights) == 1 else keys
+
+
+def totals(corpus, weights):
+    return np.rint(corpus.matrix @ weights * 100) / 100
+
+
+def _walk(order, size, caps, corpus):
+    """leaderboards.walk() over corpus indices in rank order, with the cap codes as keys."""
+    key_fns = {name: (lambda i, codes=corpus.caps[name]: None if codes[i] < 0 else codes[i]) for name in caps}
+    return walk(order.tolist(), size, caps, key_fns)
+
+
+def top_k(corpus, keys, size, caps=None, mask=None):
+    """Capped Top-K indices for one row of rank keys.
+
+    Partitions out the best size * POOL_FACTOR items and walks only those;
+    falls back to a full sort if caps drain the pool (same rule as
+    leaderboards.select_boards).
+    """
+    caps = caps or {}
+    idx = np.flatnonzero(mask) if mask is not None else np.arange(len(keys))
+    sub = keys[idx]
+    pool = min(size * POOL_FACTOR, len(sub))
+    if pool == 0:
+        return []
+    part = np.argpartition(-sub, pool - 1)[:pool] if pool < len(sub) else np.arange(len(sub))
+    order = idx[part[np.argsort(-sub[part])]]
+    picks = _walk(order, size, caps, corpus)
+    if len(picks) < size and pool < len(sub):
+        picks = _walk(idx[np.argsort(-sub)], size, caps, corpus)
+    return picks
+
+
+def select_boards(corpus, weights, boards=DEFAULT_BOARDS):
+    """{board name: [corpus indices]} for one weight vector.
+
+    A board's "hours" window is not applied: the corpus spans past digests,
+    not one build.
+    """
+    keys = rank_keys(corpus, weight_vector(weights) if isinstance(weights, dict) else weights)
+    result = {}
+    for name, spec in boards.items():
+        cats = spec.get('categories')
+        mask = np.isin(corpus.categories, cats) if cats else None
+        result[name] = top_k(corpus, keys, spec['size'], spec.get('caps'), mask)
+    return result
+
+
+def sweep(corpus, vectors, baseline, board=DEFAULT_BOARDS['smartPicks'], chunk=64):
+    """Re-rank the corpus under each weight vector; compare its Top-K with `baseline`'s.
+
+    Returns a list of dicts (one per vector) with `overlap` (items shared with
+    the baseline board), `changed` (size - overlap) and `rankShift` (mean
+    absolute rank move of the shared items).
+    """
+    size, caps = board['size'], board.get('caps') or {}
+    base = top_k(corpus, rank_keys(corpus, baseline), size, caps)
+    base_rank = {i: r for r, i in enumerate(base)}
+    pool = min(size * POOL_FACTOR, len(corpus))
+    results = []
+    for start in range(0, len(vectors), chunk):
+        block = vectors[start:start + chunk]
+        keys = rank_keys(corpus, block)
+        # Partition the whole block at once; only pools that caps drain are re-sorted
+        parts = np.argpartition(-keys, pool - 1, axis=1)[:, :pool] if 0 < pool < len(corpus) else None
+        for row, w in enumerate(block):
+            if parts is None:
+                picks = top_k(corpus, keys[row], size, caps)
+            else:
+                part = parts[row]
+                picks = _walk(part[np.argsort(-keys[row, part])], size, caps, corpus)
+                if len(picks) < size:
+                    picks = top_k(corpus, keys[row], size, caps)
+            shared = [(r, base_rank[i]) for r, i in enumerate(picks) if i in base_rank]
+            results.append({
+                'weights': dict(zip(DIMENSIONS, map(float, w))),
+                'overlap': len(shared),
+                'changed': len(base) - len(shared),
+                'rankShift': float(np.mean([abs(a - b) for a, b in shared])) if shared else None,
+            })
+    return results
+
+
+def random_vectors(count, seed=0):
+    return np.random.default_rng(seed).dirichlet(np.ones(len(DIMENSIONS)), size=count)
+
+
+def grid_vectors(step):
+    ticks = round(1 / step)
+    combos = [c for c in itertools.product(range(ticks + 1), repeat=len(DIMENSIONS) - 1) if sum(c) <= ticks]
+    return np.array([[*c, ticks - sum(c)] for c in combos], dtype=np.float64) / ticks
+
+
+def load_corpus(path=CACHE_PATH):
+    """Every scored entry in the summary cache, in first-seen order."""
+    cache = load_cache(path)
+    records = sorted((e for e in cache.values() if e.get('scores')), key=lambda e: e['cachedAt'])
+    # _idx keeps get_company()'s per-item keys (e.g. simon-{idx}) distinct
+    return Corpus([{**e, '_idx': i} for i, e in enumerate(records)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cache', default=CACHE_PATH, help='summary cache to read scored items from')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--sweep', type=int, metavar='N', help='sweep N random weight vectors')
+    group.add_argument('--sweep-grid', type=float, metavar='STEP', help='sweep all weight vectors on a grid')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--show', type=int, default=10, help='vectors to print, most changed first')
+    parser.add_argument('--json', help='write the full sweep result to this file')
+    args = parser.parse_args()
+
+    boards = load_settings().get('leaderboards', DEFAULT_BOARDS)
+    corpus = load_corpus(args.cache)
+    print(f'Corpus: {len(corpus)} scored items from {args.cache}')
+    baseline = weight_vector(SCORE_WEIGHTS)
+
+    if args.sweep is None and args.sweep_grid is None:
+        board_totals = totals(corpus, baseline)
+        for name, picks in select_boards(corpus, baseline, boards).items():
+            print(f'\n=== {name} ===')
+            for rank, i in enumerate(picks, 1):
+                r = corpus.records[i]
+                print(f'{rank:2d}. [{board_totals[i]:.2f}] {r.get("source", "")}: {r.get("title", "")[:55]}')
+        return
+
+    vectors = random_vectors(args.sweep, args.seed) if args.sweep else grid_vectors(args.sweep_grid)
+    results = sweep(corpus, vectors, baseline, boards.get('smartPicks', DEFAULT_BOARDS['smartPicks']))
+    results.sort(key=lambda r: (-r['changed'], -(r['rankShift'] or 0)))
+    unchanged = sum(1 for r in results if r['changed'] == 0)
+    print(f'Swept {len(results)} weight vectors: {unchanged} keep the same Top 10 set')
+    for r in results[:args.show]:
+        w = ' '.join(f'{d}={v:.2f}' for d, v in r['weights'].items())
+        shift = f"{r['rankShift']:.1f}" if r['rankShift'] is not None else '-'
+        print(f"  changed {r['changed']:2d}  rank shift {shift:>4}  {w}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,15 @@
 /**
  * Format filtered/summarized items into a Markdown daily report.
- * Reads data/summarized-items.json (preferred) or data/filtered-items.json (fallback),
+ * Reads summarized output (single file or partitioned, see utils/summarized-reader.ts)
+ * or data/filtered-items.json (fallback),
  * outputs an archived Markdown report file.
  */
 
 import { readFileSync, writeFileSync, existsSync, mkdirSync } from "node:fs"
 import { resolve, dirname } from "node:path"
 import { fileURLToPath } from "node:url"
-import type { FilteredOutput, SummarizedOutput, SummarizedItem, FeedItem, Settings } from "./utils/types.js"
+import type { FilteredOutput, SummarizedItem, FeedItem, Settings } from "./utils/types.js"
+import { loadSummarized } from "./utils/summarized-reader.js"
 
 const __dirname = dirname(fileURLToPath(import.meta.url))
 const SKILL_DIR = resolve(__dirname, "..")
@@ -64,18 +66,17 @@ interface ReportData {
 
 function loadReportData(_settings: Settings): ReportData {
   const date = formatDate(new Date())
-  const summarizedPath = resolve(DATA_DIR, "summarized-items.json")
   const filteredPath = resolve(DATA_DIR, "filtered-items.json")
 
   // Prefer summarized data (has AI summaries)
-  if (existsSync(summarizedPath)) {
-    const data: SummarizedOutput = JSON.parse(readFileSync(summarizedPath, "utf-8"))
-    const smartPicks = data.items
+  const summarized = loadSummarized(DATA_DIR)
+  if (summarized) {
+    const smartPicks = summarized.items
       .filter(i => i.isSmartPick)
       .sort((a, b) => (a.smartPickRank ?? 999) - (b.smartPickRank ?? 999))
 
     const categorized = new Map<string, SummarizedItem[]>()
-    for (const item of data.items) {
+    for (const item of summarized.items) {
       const cat = item.categoryName
       if (!categorized.has(cat)) categorized.set(cat, [])
       categorized.get(cat)!.push(item)
@@ -83,11 +84,11 @@ function loadReportData(_settings: Settings): ReportData {
 
     return {
       date,
-      totalSources: new Set(data.items.map(i => i.source)).size,
-      totalItems: data.totalItems,
+      totalSources: new Set(summarized.items.map(i => i.source)).size,
+      totalItems: summarized.totalItems,
       smartPicks,
-      podcastTop5: data.podcastTop5,
-      blogTop5: data.blogTop5,
+      podcastTop5: summarized.podcastTop5,
+      blogTop5: summarized.blogTop5,
       categorizedItems: categorized as Map<string, Array<SummarizedItem | FeedItem>>,
       hasSummaries: true,
     }
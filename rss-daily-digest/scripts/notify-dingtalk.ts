@@ -1,13 +1,15 @@
 /**
  * Send Smart Recommendations to DingTalk group via Webhook.
- * Reads data/summarized-items.json and sends top picks as Markdown message.
+ * Reads the top picks (data/summarized/index.json when partitioned, else
+ * data/summarized-items.json) and sends them as a Markdown message.
  */
 
-import { readFileSync, existsSync } from "node:fs"
+import { readFileSync } from "node:fs"
 import { resolve, dirname } from "node:path"
 import { fileURLToPath } from "node:url"
 import { createHmac } from "node:crypto"
-import type { SummarizedOutput, Settings } from "./utils/types.js"
+import type { Settings } from "./utils/types.js"
+import { loadSmartPicks } from "./utils/summarized-reader.js"
 
 const __dirname = dirname(fileURLToPath(import.meta.url))
 const SKILL_DIR = resolve(__dirname, "..")
@@ -80,16 +82,12 @@ async function main() {
   const secret = process.env[settings.dingtalk.secretEnvVar] || ""
 
   // Load summarized items
-  const summarizedPath = resolve(DATA_DIR, "summarized-items.json")
-  if (!existsSync(summarizedPath)) {
+  const data = loadSmartPicks(DATA_DIR)
+  if (!data) {
     console.error("summarized-items.json not found. Run summarization first.")
     process.exit(1)
   }
-
-  const data: SummarizedOutput = JSON.parse(readFileSync(summarizedPath, "utf-8"))
-  const smartPicks = data.items
-    .filter(i => i.isSmartPick)
-    .sort((a, b) => (a.smartPickRank ?? 999) - (b.smartPickRank ?? 999))
+  const { smartPicks } = data
 
   if (smartPicks.length === 0) {
     console.log("No Smart Recommendations to send.")
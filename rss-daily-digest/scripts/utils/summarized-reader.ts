@@ -0,0 +1,75 @@
+/**
+ * Read summarization output in either layout written by generate_summary.py:
+ * - data/summarized-items.json (single file, default)
+ * - data/summarized/index.json + one NDJSON shard per category (--format partitioned)
+ * Whichever was written last wins, so switching formats never serves stale data.
+ */
+import { readFileSync, existsSync, statSync } from "node:fs"
+import { resolve } from "node:path"
+import type { SummarizedItem, SummarizedOutput, SummaryIndex } from "./types.js"
+
+export function summarizedPaths(dataDir: string) {
+  return {
+    single: resolve(dataDir, "summarized-items.json"),
+    partitionDir: resolve(dataDir, "summarized"),
+    index: resolve(dataDir, "summarized", "index.json"),
+  }
+}
+
+/** The partitioned index if it is the freshest output, else null. */
+export function loadSummaryIndex(dataDir: string): SummaryIndex | null {
+  const paths = summarizedPaths(dataDir)
+  if (!existsSync(paths.index)) return null
+  if (existsSync(paths.single) && statSync(paths.single).mtimeMs > statSync(paths.index).mtimeMs) return null
+  return JSON.parse(readFileSync(paths.index, "utf-8"))
+}
+
+/** Items of one category, read from its shard only. */
+export function readCategory(dataDir: string, index: SummaryIndex, categoryId: string): SummarizedItem[] {
+  const shard = index.categories[categoryId]
+  if (!shard) return []
+  const text = readFileSync(resolve(summarizedPaths(dataDir).partitionDir, shard.file), "utf-8")
+  return text.split("\n").filter(line => line).map(line => JSON.parse(line) as SummarizedItem)
+}
+
+/** Top 10 in rank order, plus the item total — without reading any item data. */
+export function loadSmartPicks(dataDir: string): { totalItems: number; smartPicks: SummarizedItem[] } | null {
+  const index = loadSummaryIndex(dataDir)
+  if (index) return { totalItems: index.totalItems, smartPicks: index.smartPicks }
+
+  const single = summarizedPaths(dataDir).single
+  if (!existsSync(single)) return null
+  const data: SummarizedOutput = JSON.parse(readFileSync(single, "utf-8"))
+  const smartPicks = data.items
+    .filter(i => i.isSmartPick)
+    .sort((a, b) => (a.smartPickRank ?? 999) - (b.smartPickRank ?? 999))
+  return { totalItems: data.totalItems, smartPicks }
+}
+
+/** Full output in the single-file shape, from whichever layout is current; null if neither exists. */
+export function loadSummarized(dataDir: string): SummarizedOutput | null {
+  try {
+    return readSummarized(dataDir)
+  } catch (err) {
+    // A newer run removed a shard of the index we read: its own index is in place by now
+    if ((err as { code?: string }).code !== "ENOENT") throw err
+    return readSummarized(dataDir)
+  }
+}
+
+function readSummarized(dataDir: string): SummarizedOutput | null {
+  const index = loadSummaryIndex(dataDir)
+  if (index) {
+    const items = Object.keys(index.categories).flatMap(cat => readCategory(dataDir, index, cat))
+    return {
+      summarizedAt: index.summarizedAt,
+      totalItems: index.totalItems,
+      smartPickCount: index.smartPickCount,
+      podcastTop5: index.podcastTop5,
+      blogTop5: index.blogTop5,
+      items,
+    }
+  }
+  const single = summarizedPaths(dataDir).single
+  return existsSync(single) ? JSON.parse(readFileSync(single, "utf-8")) : null
+}
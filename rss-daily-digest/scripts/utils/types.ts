@@ -75,6 +75,8 @@ export interface SummarizedItem {
   summary: string
   isSmartPick: boolean
   smartPickRank?: number
+  /** Link of the original post when clustering marked this one as derivative coverage */
+  derivativeOf?: string
 }
 
 export interface SummarizedOutput {
@@ -86,6 +88,26 @@ export interface SummarizedOutput {
   items: SummarizedItem[]
 }
 
+/** data/summarized/index.json — written by generate_summary.py --format partitioned */
+export interface SummaryShard {
+  categoryName: string
+  file: string
+  count: number
+  bytes: number
+}
+
+export interface SummaryIndex {
+  version: number
+  summarizedAt: string
+  totalItems: number
+  smartPickCount: number
+  totalSources: number
+  smartPicks: SummarizedItem[]
+  podcastTop5?: SummarizedItem[]
+  blogTop5?: SummarizedItem[]
+  categories: Record<string, SummaryShard>
+}
+
 // ── Feed Health ──
 
 export interface FeedHealthEntry {
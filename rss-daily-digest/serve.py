@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Local HTTP query service over the ranked digest.
+
+Builds the digest in memory with generate_summary.py's ranking code (the
+same store, clustering and leaderboards as a run; nothing is written) and
+answers GET requests with JSON:
+
+  /boards                          leaderboard names and sizes
+  /boards/<name>                   one leaderboard; smartPicks is the Global Top 10
+  /boards/<name>?hours=12          the same board over items published in the
+                                   12 hours before the build
+  /categories                      categories with item and scored counts
+  /categories/<id>?page=1&size=20  one category ranked like the leaderboards:
+                                   originals by score, then derivatives, then
+                                   items still waiting for a summary
+  /items/<key>                     one item by its key (as in pending-items.json)
+
+Response bodies are made once per build and kept in memory with an ETag
+(a hash of the body), so a request with a matching If-None-Match gets 304
+and no body. A background thread polls the input, the summary cache and
+item-data.json, and swaps in a new build when one of them changes; the
+cached responses go with the old build.
+
+Usage:
+  python3 serve.py                        # http://127.0.0.1:8766
+  python3 serve.py --port 0 --interval 5
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import generate_summary as gs
+from leaderboards import DEFAULT_BOARDS
+from summary_cache import load_cache, prune_cache
+from time_index import TimeIndex
+from watch import stamp
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+# Responses made on demand (item lookups, later pages) kept per build
+MAX_RESPONSES = 50_000
+
+
+class NotFound(LookupError):
+    pass
+
+
+def encode(payload):
+    """(ETag, body) for a JSON payload."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"', body
+
+
+def etag_matches(header, etag):
+    """Whether an If-None-Match header names `etag` (weak comparison, as RFC 9110 asks for GET)."""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+
+class Snapshot:
+    """One in-memory build of the digest and the responses made from it."""
+
+    def __init__(self, raw_items, cache, boards=DEFAULT_BOARDS):
+        store = self.store = gs.process_items(raw_items, cache)
+        gs.mark_derivatives(store, store.scored_rows())
+        candidates = store.scored_rows()
+        top10, others = gs.select_store_boards(store, candidates, boards)
+        self.rank_time = gs.RANK_TIME
+        self.built_at = datetime.now(timezone.utc).isoformat()
+        self.specs = boards
+        self.boards = {'smartPicks': top10, **others}
+        # Board candidates by pubTs: a ?hours= window is a slice of this, not a pass over the store
+        self.index = TimeIndex(store.pubTs, candidates)
+        self.ranks = {row: rank for rank, row in enumerate(top10, 1)}
+
+        total, derivative = store.total, store.derivativeOf
+        by_cat = defaultdict(list)
+        for row, cat in enumerate(store.categoryId):
+            by_cat[cat].append(row)
+        self.categories = {cat: sorted(rows, key=lambda row: (total[row] is None, derivative[row] is not None,
+                                                              -(total[row] or 0), row))
+                           for cat, rows in by_cat.items()}
+        self.by_key = {}
+        for row, key in enumerate(store.key):
+            self.by_key.setdefault(key, row)
+
+        self.responses = {}
+        for name in self.boards:
+            self.get(f'/boards/{name}')
+        for cat in self.categories:
+            self.get(f'/categories/{cat}')
+        self.get('/boards')
+        self.get('/categories')
+
+    def get(self, path, query=''):
+        """(ETag, body) for a request path; raises NotFound, or ValueError for bad parameters."""
+        parts = tuple(unquote(part) for part in path.strip('/').split('/'))
+        if len(parts) == 2 and parts[0] == 'categories':
+            args = parse_qs(query)
+            page, size = int(args.get('page', [1])[-1]), int(args.get('size', [PAGE_SIZE])[-1])
+            if page < 1 or not 1 <= size <= MAX_PAGE_SIZE:
+                raise ValueError(f'page must be >= 1 and size 1-{MAX_PAGE_SIZE}')
+            parts += (page, size)
+        elif len(parts) == 2 and parts[0] == 'boards' and query:
+            hours = parse_qs(query).get('hours')
+            if hours:
+                hours = float(hours[-1])
+                if not 0 < hours < float('inf'):
+                    raise ValueError('hours must be a positive number')
+                parts += (hours,)
+        response = self.responses.get(parts)
+        if response is None:
+            response = encode(self._payload(parts))
+            if len(self.responses) < MAX_RESPONSES:
+                self.responses[parts] = response
+        return response
+
+    def entry(self, row):
+        return {'key': self.store.key[row], **gs.output_entry(self.store, row, self.ranks.get(row), with_scores=True)}
+
+    def _payload(self, parts):
+        store = self.store
+        kind, *rest = parts
+        if kind == 'boards' and not rest:
+            return {'summarizedAt': self.built_at, 'totalItems': len(store),
+                    'boards': {name: len(rows) for name, rows in self.boards.items()}}
+        if kind == 'boards' and len(rest) == 1 and rest[0] in self.boards:
+            return {'board': rest[0], 'items': [self.entry(row) for row in self.boards[rest[0]]]}
+        if kind == 'boards' and len(rest) == 2 and rest[0] in self.specs:
+            name, hours = rest
+            spec = {k: v for k, v in self.specs[name].items() if k != 'hours'}
+            window = sorted(self.index.between(self.rank_time - hours * 3600))
+            rows = gs.store_picks(store, window, {name: spec})[name]
+            return {'board': name, 'hours': hours, 'items': [self.entry(row) for row in rows]}
+        if kind == 'categories' and not rest:
+            return {'categories': [{'categoryId': cat, 'categoryName': store.categoryName[rows[0]],
+                                    'count': len(rows), 'scored': sum(store.total[r] is not None for r in rows)}
+                                   for cat, rows in self.categories.items()]}
+        if kind == 'categories' and len(rest) == 3 and rest[0] in self.categories:
+            cat, page, size = rest
+            rows = self.categories[cat]
+            return {'categoryId': cat, 'categoryName': store.categoryName[rows[0]], 'count': len(rows),
+                    'page': page, 'size': size, 'pages': -(-len(rows) // size),
+                    'items': [self.entry(row) for row in rows[(page - 1) * size:page * size]]}
+        if kind == 'items' and len(rest) == 1 and rest[0] in self.by_key:
+            return self.entry(self.by_key[rest[0]])
+        raise NotFound('/' + '/'.join(map(str, parts[:2])))
+
+
+class DigestService:
+    """The current Snapshot, rebuilt when the input, cache or item-data.json changes."""
+
+    def __init__(self, in_path=gs.INPUT_PATH, cache_path=gs.CACHE_PATH, item_data_path=gs.ITEM_DATA_PATH,
+                 boards=DEFAULT_BOARDS, max_days=None):
+        self.paths = (in_path, cache_path, item_data_path)
+        self.boards = boards
+        self.max_days = max_days
+        self.snapshot = None
+        self.stamps = None
+        self.builds = 0
+
+    def refresh(self):
+        """Rebuild if a file changed since the last build; returns whether it did."""
+        stamps = tuple(map(stamp, self.paths))
+        if stamps == self.stamps:
+            return False
+        in_path, cache_path, item_data_path = self.paths
+        gs.ITEM_DATA = gs.open_item_data(item_data_path)
+        # Decay and board windows are as of this build
+        gs.RANK_TIME = time.time()
+        cache = load_cache(cache_path)
+        if self.max_days is not None:
+            prune_cache(cache, self.max_days)
+        # Requests hold whichever snapshot they started with; this swaps the whole build at once
+        self.snapshot = Snapshot(gs.load_items(in_path)['items'], cache, self.boards)
+        self.stamps = stamps
+        self.builds += 1
+        return True
+
+    def watch(self, interval, log=print):
+        while True:
+            time.sleep(interval)
+            started = time.perf_counter()
+            try:
+                if self.refresh():
+                    log(f'{datetime.now():%H:%M:%S} rebuilt {len(self.snapshot.store)} items '
+                        f'in {time.perf_counter() - started:.2f}s')
+            except (OSError, ValueError) as e:
+                # Most likely caught mid-write; the next poll sees a new stamp and tries again
+                log(f'{datetime.now():%H:%M:%S} rebuild skipped: {e}')
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, and no Nagle delay between the header and body writes
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                etag, body = service.snapshot.get(url.path, url.query)
+            except NotFound as e:
+                return self._send(404, encode({'error': f'not found: {e}'})[1])
+            except ValueError as e:
+                return self._send(400, encode({'error': str(e)})[1])
+            if etag_matches(self.headers.get('if-none-match'), etag):
+                self.send_response(304)
+                self.send_header('etag', etag)
+                self.end_headers()
+                return
+            self._send(200, body, etag)
+
+        def _send(self, status, body, etag=None):
+            self.send_response(status)
+            self.send_header('content-type', 'application/json; charset=utf-8')
+            self.send_header('content-length', str(len(body)))
+            if etag:
+                self.send_header('etag', etag)
+                self.send_header('cache-control', 'no-cache')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start(service, host='127.0.0.1', port=0, interval=2.0):
+    """Serve on a background thread and watch the files on another; returns the server."""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    threading.Thread(target=service.watch, args=(interval,), daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', type=Path, default=gs.INPUT_PATH, help='filtered-items.json to serve')
+    parser.add_argument('--cache', type=Path, default=gs.CACHE_PATH, help='summary cache file')
+    parser.add_argument('--item-data', type=Path, default=gs.ITEM_DATA_PATH, help="today's hand-written summaries")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766, help='0 picks a free port')
+    parser.add_argument('--interval', type=float, default=2.0, help='seconds between checks for changed files')
+    args = parser.parse_args()
+
+    settings = gs.load_settings()
+    service = DigestService(args.input, args.cache, args.item_data, settings.get('leaderboards', DEFAULT_BOARDS),
+                            settings['filter']['dedupeStoreMaxDays'])
+    started = time.perf_counter()
+    service.refresh()
+    server = start(service, args.host, args.port, args.interval)
+    print(f'Built {len(service.snapshot.store)} items in {time.perf_counter() - started:.2f}s; '
+          f'serving on http://{args.host}:{server.server_port} (Ctrl-C to stop)', flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
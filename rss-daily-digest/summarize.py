@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""Summarize and score filtered items in parallel batches via the Messages API.
+
+Items already in the summary cache are skipped; the rest are split into
+`summarization.batchSize` batches and sent concurrently, limited by a
+semaphore (`concurrency`) and token buckets for requests and estimated input
+tokens per minute. Failed requests (429, 5xx, network errors) are retried
+with exponential backoff, honouring Retry-After. Every finished batch is
+checkpointed to data/summary-cache.json off the event loop, so an
+interrupted run resumes where it stopped, and generate_summary.py picks the
+results up as cache hits. max_tokens grows with the batch size.
+
+Usage:
+  python3 summarize.py                                     # real API (ANTHROPIC_API_KEY)
+  python3 summarize.py --base-url http://127.0.0.1:8765    # e.g. bench/stub_model.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from generate_summary import CACHE_PATH, INPUT_PATH, item_meta, load_items, load_settings
+from summary_cache import item_key, load_cache, remember, save_cache
+
+DEFAULT_BASE_URL = 'https://api.anthropic.com'
+DIMENSIONS = ('relevance', 'sourceQuality', 'contentValue', 'actionability')
+
+# Defaults for settings.json "summarization"
+DEFAULTS = {
+    'batchSize': 40,
+    'concurrency': 4,
+    'requestsPerMinute': 50,
+    'inputTokensPerMinute': 40000,
+    'maxRetries': 4,
+    'timeoutMs': 120000,
+}
+
+# A 2-3 sentence Chinese summary, four scores and a scoreReason come to about 300 output tokens per item
+OUTPUT_TOKENS_PER_ITEM = 400
+MAX_OUTPUT_TOKENS = 64000
+
+SYSTEM_PROMPT = """你是 RSS Daily AI Digest 的摘要和评分引擎。
+为每条 AI 资讯生成 2-3 句中文摘要（保留英文专有名词），并按 4 个维度打 1-5 分：
+- relevance 应用相关性：核心 AI 编程工具链 5 分，纯学术/一般科技新闻 1 分
+- sourceQuality 信息源质量：官方博客/Changelog 5 分，营销号/二次转述 1 分
+- contentValue 内容价值类型：新产品/功能首发 5 分，二手总结 1 分；衍生内容最高 2 分
+- actionability 可操作性：现在就能用 5 分，无直接关系 1 分
+条目带「相关性预评」时（prescore.py 的离线预评），relevance 直接用该分，只评其余 3 个维度。
+
+摘要中禁止使用双引号（"），引用请用「」。严格输出合法 JSON。"""
+
+
+class ModelError(Exception):
+    """A failed model request; `retry_after` is in seconds when the server sent one."""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursting up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def take(self, n=1):
+        # A request larger than the bucket waits for a full bucket, then goes
+        n = min(n, self.capacity)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.rate)
+
+
+def build_prompt(items, relevance=None):
+    """The user prompt for one batch; `relevance[i]`, when set, is item i's pre-scored relevance."""
+    lines = []
+    for i, item in enumerate(items):
+        desc = (item.get('description') or '')[:500]
+        hint = f'\n相关性预评: {relevance[i]}' if relevance and relevance[i] is not None else ''
+        lines.append(f"[{i}] 标题: {item.get('title', '')}\n来源: {item.get('feedName', '')}\n"
+                     f"分类: {item.get('categoryName', '')}\n描述: {desc}{hint}")
+    return (f'以下是 {len(items)} 条 AI 资讯：\n\n' + '\n\n---\n\n'.join(lines) + '\n\n'
+            '请以 JSON 数组输出，每个元素包含 index（原始序号）、summary、'
+            'scores（relevance/sourceQuality/contentValue/actionability，整数 1-5）、scoreReason（一句话）：\n'
+            '```json\n[{"index": 0, "summary": "...", "scores": {"relevance": 4, "sourceQuality": 5, '
+            '"contentValue": 4, "actionability": 3}, "scoreReason": "..."}]\n```')
+
+
+def estimate_tokens(text):
+    """Rough input-token count for rate limiting (about 3 characters per token for mixed zh/en)."""
+    return len(text) // 3 + 1
+
+
+def output_tokens(batch_size):
+    """max_tokens for a batch of `batch_size` items, so the JSON array is not cut off."""
+    return min(MAX_OUTPUT_TOKENS, 1024 + OUTPUT_TOKENS_PER_ITEM * batch_size)
+
+
+def call_model(base_url, api_key, model, prompt, timeout, max_tokens=MAX_OUTPUT_TOKENS):
+    """POST one Messages API request; return the text of the first content block."""
+    body = json.dumps({
+        'model': model,
+        'max_tokens': max_tokens,
+        'system': SYSTEM_PROMPT,
+        'messages': [{'role': 'user', 'content': prompt}],
+    }).encode('utf-8')
+    req = urllib.request.Request(f"{base_url.rstrip('/')}/v1/messages", data=body, method='POST', headers={
+        'Content-Type': 'application/json',
+        'x-api-key': api_key,
+        'anthropic-version': '2023-06-01',
+    })
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            result = json.load(resp)
+    except urllib.error.HTTPError as e:
+        retry_after = e.headers.get('retry-after')
+        raise ModelError(f'HTTP {e.code}: {e.read()[:200].decode("utf-8", "replace")}', e.code,
+                         float(retry_after) if retry_after and retry_after.replace('.', '', 1).isdigit() else None)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise ModelError(str(e))
+    blocks = result.get('content') or [{}]
+    return blocks[0].get('text', '')
+
+
+def parse_batch(text, size):
+    """Map batch position → {summary, scores, scoreReason} for every well-formed entry."""
+    match = re.search(r'```json\s*([\s\S]*?)```', text) or re.search(r'\[[\s\S]*\]', text)
+    if not match:
+        raise ModelError('no JSON array in response')
+    raw = (match.group(1) if match.lastindex else match.group(0))
+    raw = raw.replace('“', '"').replace('”', '"').replace('‘', "'").replace('’', "'")
+    try:
+        entries = json.loads(raw)
+    except ValueError as e:
+        raise ModelError(f'invalid JSON in response: {e}')
+
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        idx, scores = entry.get('index'), entry.get('scores')
+        if not isinstance(scores, dict) or not isinstance(idx, int) or not 0 <= idx < size or not entry.get('summary'):
+            continue
+        if not all(isinstance(scores.get(d), (int, float)) and 1 <= scores[d] <= 5 for d in DIMENSIONS):
+            continue
+        parsed[idx] = {
+            'summary': entry['summary'],
+            'scores': {d: scores[d] for d in DIMENSIONS},
+            'scoreReason': entry.get('scoreReason', ''),
+        }
+    return parsed
+
+
+async def summarize_batch(batch, client, config, buckets, log=print, relevance=None):
+    """Send one batch, retrying with backoff; `relevance` as for build_prompt().
+
+    Returns (parsed entries, attempts, latency); latency runs from the first
+    request to the parsed result, so it includes retries but not the initial
+    wait for the rate limiter.
+    """
+    prompt = build_prompt(batch, relevance)
+    tokens = estimate_tokens(SYSTEM_PROMPT + prompt)
+    start = None
+    for attempt in range(1, config['maxRetries'] + 2):
+        await buckets['requests'].take()
+        await buckets['tokens'].take(tokens)
+        start = start or time.perf_counter()
+        try:
+            text = await client(prompt)
+            return parse_batch(text, len(batch)), attempt, time.perf_counter() - start
+        except ModelError as e:
+            if not e.retryable or attempt > config['maxRetries']:
+                raise
+            delay = e.retry_after if e.retry_after is not None else min(60, 2 ** (attempt - 1)) * (1 + random.random())
+            log(f'  batch retry {attempt}/{config["maxRetries"]} in {delay:.1f}s: {e}')
+            await asyncio.sleep(delay)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def summarize_all(items, cache, cache_path, client, config, log=print, prescores=None):
+    """Summarize every cache miss in `items`, checkpointing into `cache` batch by batch.
+
+    Checkpoints are written by a background thread so the event loop keeps
+    dispatching; batches that finish during a write go into the next one,
+    and the last is awaited before returning.
+
+    `prescores` ({key: entry} from prescore.py) passes the provisional
+    relevance of every item that is not borderline on to the model.
+
+    Returns a stats dict: items/batches done and failed, wall time, items/s,
+    per-batch latency percentiles and retry count.
+    """
+    pending = [(item_key(item), item) for item in items]
+    pending = [(k, item) for k, item in pending if not cache.get(k, {}).get('scores')]
+    size = config['batchSize']
+    batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+    buckets = {
+        'requests': TokenBucket(config['requestsPerMinute'] / 60, max(1, config['concurrency'])),
+        'tokens': TokenBucket(config['inputTokensPerMinute'] / 60, config['inputTokensPerMinute']),
+    }
+    limit = asyncio.Semaphore(config['concurrency'])
+    confident = {key: entry['relevance'] for key, entry in (prescores or {}).items() if not entry['borderline']}
+    stats = {'items': len(pending), 'batches': len(batches), 'done': 0, 'failed': 0,
+             'failedBatches': 0, 'retries': 0, 'latencies': []}
+    saver = {'task': None, 'dirty': False}
+
+    async def save_loop():
+        while saver['dirty']:
+            saver['dirty'] = False
+            # remember() replaces entries instead of mutating them, so a shallow copy is a stable snapshot
+            await asyncio.to_thread(save_cache, dict(cache), cache_path)
+
+    def checkpoint():
+        saver['dirty'] = True
+        if saver['task'] is None or saver['task'].done():
+            saver['task'] = asyncio.create_task(save_loop())
+
+    async def worker(n, batch):
+        async with limit:
+            try:
+                parsed, attempts, latency = await summarize_batch([item for _, item in batch], client, config, buckets,
+                                                                  log, [confident.get(key) for key, _ in batch])
+            except ModelError as e:
+                stats['failedBatches'] += 1
+                stats['failed'] += len(batch)
+                log(f'  batch {n + 1}/{len(batches)} failed: {e}')
+                return
+            stats['latencies'].append(latency)
+            stats['retries'] += attempts - 1
+            for pos, (key, item) in enumerate(batch):
+                if pos in parsed:
+                    remember(cache, key, {**item_meta(item), **parsed[pos]})
+            stats['done'] += len(parsed)
+            stats['failed'] += len(batch) - len(parsed)
+            # Checkpoint: a crash after the next write never re-requests this batch
+            checkpoint()
+            log(f'  batch {n + 1}/{len(batches)}: {len(parsed)}/{len(batch)} items '
+                  f'in {latency:.2f}s')
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n, batch) for n, batch in enumerate(batches)))
+    if saver['task'] is not None:
+        await saver['task']
+    wall = time.perf_counter() - start
+    lat = stats.pop('latencies')
+    stats.update({
+        'wallSeconds': round(wall, 3),
+        'itemsPerSecond': round(stats['done'] / wall, 2) if wall else 0.0,
+        'batchLatency': {q: round(percentile(lat, p), 3) for q, p in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))}
+                        | {'max': round(max(lat, default=0.0), 3)},
+    })
+    return stats
+
+
+def run(items, cache_path, base_url, api_key, model, config, log=print, prescores=None):
+    cache = load_cache(cache_path)
+    timeout = config['timeoutMs'] / 1000
+    max_tokens = output_tokens(config['batchSize'])
+
+    async def main_async():
+        loop = asyncio.get_running_loop()
+        # urllib blocks, so each in-flight request needs its own thread, plus one for cache checkpoints
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=max(1, config['concurrency']) + 1))
+
+        async def client(prompt):
+            return await asyncio.to_thread(call_model, base_url, api_key, model, prompt, timeout, max_tokens)
+
+        return await summarize_all(items, cache, cache_path, client, config, log, prescores)
+
+    return asyncio.run(main_async())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=INPUT_PATH, help='filtered-items.json to summarize')
+    parser.add_argument('--cache', default=CACHE_PATH, help='summary cache to read and checkpoint into')
+    parser.add_argument('--base-url', default=os.environ.get('ANTHROPIC_BASE_URL', DEFAULT_BASE_URL))
+    parser.add_argument('--concurrency', type=int, help='override summarization.concurrency')
+    parser.add_argument('--batch-size', type=int, help='override summarization.batchSize')
+    parser.add_argument('--stats', help='also write the run stats as JSON to this file')
+    parser.add_argument('--prescores', help="prescore.py's output: give the model the confident provisional relevance")
+    args = parser.parse_args()
+
+    settings = load_settings()['summarization']
+    config = {**DEFAULTS, **{k: v for k, v in settings.items() if k in DEFAULTS}}
+    if args.concurrency:
+        config['concurrency'] = args.concurrency
+    if args.batch_size:
+        config['batchSize'] = args.batch_size
+
+    api_key = os.environ.get('ANTHROPIC_API_KEY') or os.environ.get('ANTHROPIC_AUTH_TOKEN') or ''
+    if not api_key and args.base_url == DEFAULT_BASE_URL:
+        sys.exit('ANTHROPIC_API_KEY environment variable not set.')
+
+    items = load_items(args.input)['items']
+    print(f'Summarizing {len(items)} items (batch {config["batchSize"]}, concurrency {config["concurrency"]})...')
+    prescores = None
+    if args.prescores:
+        with open(args.prescores, 'r', encoding='utf-8') as f:
+            prescores = json.load(f)['items']
+    stats = run(items, args.cache, args.base_url, api_key, settings['model'], config, prescores=prescores)
+
+    if not stats['items']:
+        print('All items are already in the summary cache.')
+        return
+    lat = stats['batchLatency']
+    print(f'\nSummarized {stats["done"]}/{stats["items"]} cache misses in {stats["batches"]} batches, '
+          f'{stats["wallSeconds"]:.1f}s ({stats["itemsPerSecond"]:.1f} items/s, {stats["retries"]} retries)')
+    print(f'Batch latency: p50 {lat["p50"]:.2f}s  p95 {lat["p95"]:.2f}s  p99 {lat["p99"]:.2f}s  max {lat["max"]:.2f}s')
+    if stats['failed']:
+        print(f'{stats["failed"]} items not summarized ({stats["failedBatches"]} failed batches); re-run to retry them')
+    if args.stats:
+        with open(args.stats, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+    print('Next: python3 generate_summary.py')
+
+
+if __name__ == '__main__':
+    main()
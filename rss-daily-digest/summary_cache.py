@@ -0,0 +1,62 @@
+"""Persistent summary/score cache keyed by stable item identity.
+
+Entries survive re-runs of dedupe-filter.ts (which reorder filtered-items.json)
+because they are addressed by a hash of the item's guid/link and title rather
+than by position. Age-based eviction mirrors the seen-guids store.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+# Fields copied from ITEM_DATA into the cache, plus the item fields needed to
+# re-rank past days (scoring.py sweeps)
+CACHED_FIELDS = ('summary', 'scores', 'scoreReason', 'company', 'title', 'source', 'link', 'categoryId')
+
+
+def item_key(item):
+    """Stable 16-hex-digit identity for a filtered item.
+
+    Uses the same guid → link → feedUrl#title fallback as dedupe-filter.ts,
+    plus the title so a feed that reuses guids still gets fresh summaries.
+    """
+    ident = item.get('guid') or item.get('link') or f"{item.get('feedUrl', '')}#{item.get('title', '')}"
+    raw = f"{ident}\n{item.get('title', '')}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def load_cache(path):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def save_cache(cache, path):
+    """Write atomically so an interrupted run never leaves a truncated cache."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        # One dumps() call stays in the C encoder; dump() streams chunks through Python
+        f.write(json.dumps(cache, ensure_ascii=False, separators=(',', ':')))
+    os.replace(tmp, path)
+
+
+def remember(cache, key, info, now=None):
+    """Store the cacheable fields of an ITEM_DATA entry, keeping the first-seen time."""
+    entry = {k: info[k] for k in CACHED_FIELDS if k in info}
+    prev = cache.get(key)
+    entry['cachedAt'] = prev['cachedAt'] if prev else (now or datetime.now(timezone.utc)).isoformat()
+    cache[key] = entry
+
+
+def prune_cache(cache, max_days, now=None):
+    """Drop entries first cached more than `max_days` ago. Returns the count removed."""
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=max_days)
+    stale = [k for k, v in cache.items() if datetime.fromisoformat(v['cachedAt']) < cutoff]
+    for k in stale:
+        del cache[k]
+    return len(stale)
@@ -0,0 +1,124 @@
+"""pubDate parsing and a sorted time index over store rows.
+
+Feeds give pubDate as RFC 822 ("Sat, 21 Feb 2026 09:30:00 GMT", numeric
+or named zones) or ISO 8601 ("2026-02-21T09:30:00.000Z"), as rss-parser
+found it. parse_pub_date() reads the usual shapes with one regex match and
+memo lookups of the day, clock time and zone, and leaves anything else to
+email.utils and datetime.fromisoformat, so every string gets the answer
+the stdlib parsers give. generate_summary.py runs it once per item into the store's pubTs
+column; ranking and windows only ever compare those integers.
+
+TimeIndex keeps rows sorted by that time, so the rows of a window such as
+"the last 12 hours" are a bisect away instead of a pass over the store.
+"""
+import calendar
+import re
+from bisect import bisect_left
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+_MONTHS = {name: n for n, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+# email.utils' named zones, in hours; any other name is read as UTC, as there
+_ZONES = {'UT': 0, 'UTC': 0, 'GMT': 0, 'Z': 0, 'AST': -4, 'ADT': -3, 'EST': -5, 'EDT': -4,
+          'CST': -6, 'CDT': -5, 'MST': -7, 'MDT': -6, 'PST': -8, 'PDT': -7}
+
+_RFC822 = re.compile(r'\s*(?:[A-Za-z]{3},\s*)?(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})\s+(\d{1,2}:\d{2}(?::\d{2})?)'
+                     r'\s*([+-]\d{4}|[A-Za-z]{1,3})?\s*')
+# Three or six fractional digits and a colon in the offset: forms every
+# Python 3 fromisoformat() accepts
+_ISO = re.compile(r'(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}(?::\d{2})?)(?:\.\d{3}|\.\d{6})?(Z|[+-]\d{2}:\d{2})?')
+
+# Memos of the three parts of a date: few distinct days, clock times and
+# zones recur across a whole corpus
+_MISS = object()
+_DAYS, _CLOCKS, _OFFSETS = {}, {}, {}
+
+
+def parse_pub_date(pub_date):
+    """Epoch seconds of an RSS (RFC 822) or ISO 8601 date; None when it cannot be parsed.
+
+    A date without a zone is taken as UTC.
+    """
+    if not pub_date:
+        return None
+    m = _RFC822.fullmatch(pub_date) or _ISO.fullmatch(pub_date)
+    if m is None:
+        return _parse_slow(pub_date)
+    day, clock, zone = m.groups()
+    start, seconds, offset = _DAYS.get(day, _MISS), _CLOCKS.get(clock, _MISS), _OFFSETS.get(zone, _MISS)
+    if start is _MISS:
+        start = _DAYS[day] = _day_start(day)
+    if seconds is _MISS:
+        seconds = _CLOCKS[clock] = _clock_seconds(clock)
+    if offset is _MISS:
+        offset = _OFFSETS[zone] = _zone_offset(zone)
+    if start is None or seconds is None or offset is None or start + seconds < offset:
+        # Out of range somewhere (or before the epoch, where int() truncates
+        # fractions the other way): the stdlib has the last word
+        return _parse_slow(pub_date)
+    return start + seconds - offset
+
+
+def _day_start(text):
+    """Epoch seconds at 00:00 UTC of "21 Feb 2026" or "2026-02-21"; None if invalid or before 1970."""
+    if '-' in text:
+        year, month, day = text.split('-')
+        month = int(month)
+    else:
+        day, month, year = text.split()
+        month = _MONTHS.get(month.lower(), 0)
+    year, day = int(year), int(day)
+    if not 1 <= month <= 12 or year < 1970 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+    return calendar.timegm((year, month, day, 0, 0, 0))
+
+
+def _clock_seconds(text):
+    hour, minute, second = (text + ':00').split(':')[:3]
+    hour, minute, second = int(hour), int(minute), int(second)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    return hour * 3600 + minute * 60 + second
+
+
+def _zone_offset(zone):
+    """Seconds east of UTC; None for an offset the stdlib rejects."""
+    if not zone or zone[0] not in '+-':
+        return _ZONES.get((zone or 'UTC').upper(), 0) * 3600
+    hours, minutes = int(zone[1:3]), int(zone[-2:])
+    offset = hours * 3600 + minutes * 60
+    # fromisoformat() wants a real HH:MM; email.utils only a delta under a day
+    if (':' in zone and (hours > 23 or minutes > 59)) or offset >= 86400:
+        return None
+    return -offset if zone[0] == '-' else offset
+
+
+def _parse_slow(pub_date):
+    for parse in (parsedate_to_datetime, lambda s: datetime.fromisoformat(s.replace('Z', '+00:00'))):
+        try:
+            dt = parse(pub_date)
+        except (TypeError, ValueError, IndexError):
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    return None
+
+
+class TimeIndex:
+    """`rows` sorted by their time in `times` (a pubTs column); rows without one are left out."""
+
+    def __init__(self, times, rows):
+        pairs = sorted((times[row], row) for row in rows if times[row] is not None)
+        self.times = [t for t, _ in pairs]
+        self.rows = [row for _, row in pairs]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def between(self, start=None, end=None):
+        """Rows published in [start, end), oldest first; either bound may be None."""
+        lo = 0 if start is None else bisect_left(self.times, start)
+        hi = len(self.times) if end is None else bisect_left(self.times, end)
+        return self.rows[lo:hi]
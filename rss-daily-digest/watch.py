@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+"""Watch mode: keep the ranked digest in memory and apply input changes as deltas.
+
+generate_summary.py rebuilds everything on every run. watch.py does one
+full build, then polls filtered-items.json, item-data.json and the summary
+cache (summarize.py writes it) and applies only what changed:
+
+  input      the items array is compared with the previous text; only the
+             span that differs is looked at, and inside it only items whose
+             text changed are decoded and processed, the rest keep their rows
+  ITEM_DATA  items named by an added, changed or removed entry are looked
+             up again
+  cache      items whose cache entry changed are looked up again
+  clock      every poll ranks as of now (generate_summary.RANK_TIME): with
+             "hours" boards or a decay half-life set, windows slide and
+             totals decay even when no file changed
+
+Scored items sit in per-category lists ordered by (total, input order), so
+a leaderboard is a short capped walk (as in digest_store.top_k) instead of
+a pass over everything. Near-duplicate clustering is kept up to date by
+clustering.Clusters. Each item's output entry is kept encoded, and only
+entries whose content or Top 10 rank changed are encoded again; with
+--format partitioned only the shards that changed are rewritten.
+
+The output, pending list and cache match what generate_summary.py writes
+for the same files, apart from summarizedAt. Watch mode does not append to
+the history store; run generate_summary.py for that.
+
+Usage:
+  python3 watch.py
+  python3 watch.py --format partitioned --interval 0.2
+"""
+import argparse
+import heapq
+import json
+import os
+import re
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import generate_summary as gs
+from clustering import Clusters
+from item_store import ItemStore
+from leaderboards import DEFAULT_BOARDS, walk
+from partitioned import entry_line, write_index, write_shard
+from summary_cache import load_cache, prune_cache, save_cache
+
+# Order keys of a fresh build are this far apart, so items inserted between
+# two neighbours get keys without renumbering the rest
+GAP = 1 << 32
+# Rows left behind by changed items, as a share of the live ones, at which a poll rebuilds the store
+COMPACT_RATIO = 1.0
+
+_SEPARATORS = re.compile(r'[\s,]*')
+_DECODER = json.JSONDecoder()
+_LOOKAHEAD = 4   # old items tried at each position of a changed span
+_PENDING_INDEX = b'\n      "index": 0'
+
+
+class InputChanging(ValueError):
+    """The input is mid-write (or not an items array); try again at the next poll."""
+
+
+def stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def items_start(text):
+    """Offset just past the `[` of the top-level "items" array (the last key, as in iter_items)."""
+    key = text.find('"items"')
+    bracket = text.find('[', key) if key != -1 else -1
+    if bracket == -1:
+        raise InputChanging('no "items" array')
+    return bracket + 1
+
+
+def next_element(text, pos, stop=None):
+    """Offset of the array element at or after `pos`, or None at the end.
+
+    The end is offset `stop`, which an element must not run past, or
+    without it the array's closing bracket.
+    """
+    pos = _SEPARATORS.match(text, pos).end()
+    if stop is not None:
+        if pos == stop:
+            return None
+        if pos > stop or text[pos] == ']':
+            raise InputChanging('items moved under the diff')
+    elif pos >= len(text):
+        raise InputChanging('truncated items array')
+    elif text[pos] == ']':
+        if text[pos + 1:].strip() != '}':
+            raise InputChanging('"items" is not the last key')
+        return None
+    return pos
+
+
+def decode_element(text, pos):
+    try:
+        return _DECODER.raw_decode(text, pos)
+    except json.JSONDecodeError as e:
+        raise InputChanging(str(e)) from None
+
+
+def parse_items(text, pos, stop=None):
+    """Decode array elements from `pos` up to offset `stop`, or to the closing bracket.
+
+    Returns (items, starts, ends). With `stop`, the last element must end
+    right before it (separators aside), otherwise the span was not a run of
+    whole elements.
+    """
+    items, starts, ends = [], [], []
+    while (pos := next_element(text, pos, stop)) is not None:
+        item, end = decode_element(text, pos)
+        items.append(item)
+        starts.append(pos)
+        ends.append(end)
+        pos = end
+    return items, starts, ends
+
+
+def common_prefix(a, i, b, j, limit, block=1 << 16):
+    """Length of the common prefix of a[i:] and b[j:], at most `limit`.
+
+    Blocks grow from 1 KiB to `block`, so a difference near the start
+    (an edited item) costs little.
+    """
+    n = 0
+    size = min(1 << 10, block)
+    while n < limit:
+        k = min(size, limit - n)
+        size = min(size * 2, block)
+        if a[i + n:i + n + k] != b[j + n:j + n + k]:
+            low, high = 0, k - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if a[i + n:i + n + mid] == b[j + n:j + n + mid]:
+                    low = mid
+                else:
+                    high = mid - 1
+            return n + low
+        n += k
+    return n
+
+
+def common_suffix(a, b, limit, block=1 << 16):
+    """Length of the common suffix of `a` and `b`, at most `limit`."""
+    n = 0
+    while n < limit:
+        k = min(block, limit - n)
+        if a[len(a) - n - k:len(a) - n] != b[len(b) - n - k:len(b) - n]:
+            low, high = 0, k - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if a[len(a) - n - mid:len(a) - n] == b[len(b) - n - mid:len(b) - n]:
+                    low = mid
+                else:
+                    high = mid - 1
+            return n + low
+        n += k
+    return n
+
+
+def entry_text(entry):
+    """One array element as generate_summary._write_array() lays it out, UTF-8 encoded."""
+    return ('\n    ' + json.dumps(entry, ensure_ascii=False, indent=2).replace('\n', '\n    ')).encode('utf-8')
+
+
+def array_parts(name, texts):
+    """A named array as chunks for replace_text(); joining them would copy the whole output again."""
+    head = f'  {json.dumps(name)}: ['.encode('utf-8')
+    return [head, b','.join(texts), b'\n  ]'] if texts else [head, b']']
+
+
+def replace_text(path, parts):
+    """Write encoded `parts` through a temporary file, so readers never see half an output."""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.writelines(parts)
+    os.replace(tmp, path)
+
+
+class LiveDigest:
+    """The digest of one input file, held in memory and updated by deltas.
+
+    Rows live in an append-only ItemStore: a changed item gets a new row
+    and its old one is dropped from every structure but the store. Once
+    those dead rows pass `compact_ratio` times the live ones, the next poll
+    rebuilds the store and everything indexed by row from the items in
+    memory (no file is read again). `store.idx` holds an
+    order key rather than the input position, so inserting items does not
+    renumber the rest; positions are only needed for the pending list, and
+    come from `order`.
+    """
+
+    def __init__(self, in_path=gs.INPUT_PATH, out_path=gs.OUTPUT_PATH, cache_path=gs.CACHE_PATH,
+                 pending_path=gs.PENDING_PATH, item_data_path=gs.ITEM_DATA_PATH, boards=DEFAULT_BOARDS,
+                 partitioned=False, clustering=gs.CLUSTERING, max_days=None, clock=time.time,
+                 compact_ratio=COMPACT_RATIO):
+        self.in_path = in_path
+        self.out_path = out_path
+        self.cache_path = cache_path
+        self.pending_path = pending_path
+        self.item_data_path = item_data_path
+        self.boards = boards
+        self.partitioned = partitioned
+        self.clustering = clustering if clustering.get('enabled', True) else None
+        self.max_days = max_days
+        self.clock = clock
+        self.compact_ratio = compact_ratio
+        self.windows = any(spec.get('hours') is not None for spec in boards.values())
+        self.stamps = {}
+
+    # ---- loading -------------------------------------------------------
+
+    def _load_item_data(self):
+        """Point generate_summary at a fresh view of item-data.json; returns the keys whose entry changed."""
+        gs.ITEM_DATA = gs.open_item_data(self.item_data_path)
+        self.stamps['item-data'] = stamp(self.item_data_path)
+        snapshot = dict(gs.ITEM_DATA.items())
+        old = getattr(self, 'item_data', {})
+        self.item_data = snapshot
+        return {k for k in snapshot.keys() | old.keys() if snapshot.get(k) != old.get(k)}
+
+    def _load_cache(self):
+        self.stamps['cache'] = stamp(self.cache_path)
+        cache = load_cache(self.cache_path)
+        if self.max_days is not None:
+            prune_cache(cache, self.max_days)
+        return cache
+
+    def _read_input(self):
+        self.stamps['input'] = stamp(self.in_path)
+        # Decoding in one go is several times faster than a text-mode read
+        with open(self.in_path, 'rb') as f:
+            data = f.read()
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # A write cut mid-character
+            raise InputChanging(str(e)) from None
+
+    def build(self):
+        """Full build from the current files, as generate_summary.run() does."""
+        gs.RANK_TIME = self.clock()
+        self._load_item_data()
+        self.cache = self._load_cache()
+        self.cache_dirty = False
+        text = self._read_input()
+        start = items_start(text)
+        items, starts, ends = parse_items(text, start)
+
+        self.text, self.start = text, start
+        self.items = items
+        self.starts = [s - start for s in starts]
+        self.ends = [e - start for e in ends]
+        return self._populate()
+
+    def _populate(self):
+        """Rows, rankings, clusters and encoded entries for `self.items`, from scratch; the _commit() report."""
+        self.store = ItemStore()
+        self.ranked = {}    # categoryId -> sorted (-total, order key, row) of board candidates
+        self.by_cat = {}    # categoryId -> sorted (order key, row)
+        self.sources = Counter()
+        self.lines = {}     # row -> encoded output entry
+        self.shard_files = {}   # categoryId -> (shard file, bytes) as last written
+        self.pending = {}   # row -> pending entry text around its index, or None
+        self.picks = {}
+        self.ranks = {}
+        self.clusters = Clusters(self.clustering['threshold']) if self.clustering else None
+        self.order = [self._add(i, item, (i + 1) * GAP) for i, item in enumerate(self.items)]
+        return self._commit([], self.order)
+
+    # ---- polling -------------------------------------------------------
+
+    def poll(self):
+        """Apply whatever changed since the last build or poll; returns an update report or None."""
+        gs.RANK_TIME = self.clock()
+        decays = bool(gs.DECAY.get('halfLifeHours'))
+        changed = {name for name, path in (('input', self.in_path), ('item-data', self.item_data_path),
+                                           ('cache', self.cache_path)) if stamp(path) != self.stamps.get(name)}
+        if not changed and not (decays or self.windows):
+            return None
+        started = time.perf_counter()
+        self.cache_dirty = False
+        refresh = set()
+        keys = self._load_item_data() if 'item-data' in changed else set()
+        if 'cache' in changed:
+            cache = self._load_cache()
+            keys.update(k for k in self.cache.keys() | cache.keys() if self.cache.get(k) != cache.get(k))
+            self.cache = cache
+
+        removed, added = [], []
+        if 'input' in changed:
+            try:
+                text = self._read_input()
+                if text != self.text:
+                    removed, added = self._splice(text)
+            except InputChanging:
+                # Half-written: forget the stamp so the next poll reads it again
+                self.stamps.pop('input', None)
+
+        if keys:
+            refresh.update(pos for pos, row in enumerate(self.order) if self.store.key[row] in keys)
+        fresh = set(added)
+        for pos in sorted(refresh):
+            old = self.order[pos]
+            if old in fresh:
+                continue
+            row = self._add(pos, self.items[pos], self.store.idx[old])
+            if self._same(old, row):
+                self.pending.pop(row, None)
+                self.store.pop()
+                continue
+            self.order[pos] = row
+            removed.append(old)
+            added.append(row)
+        if len(self.store) - len(self.order) > self.compact_ratio * len(self.order):
+            report = self._populate()
+            report.update(removed=len(removed), added=len(added), compacted=True)
+        else:
+            report = self._commit(removed, added, rescore=decays, idle=not changed)
+            if report is None:
+                return None
+        report['changed'] = sorted(changed) or ['clock']
+        report['seconds'] = time.perf_counter() - started
+        return report
+
+    def _splice(self, text):
+        """Replace the items in the span where `text` differs from the previous input.
+
+        Items inside the span whose text is unchanged (matched in order) keep
+        their rows, so scattered edits only redo the items they touched.
+        Returns (removed rows, added rows).
+        """
+        start = items_start(text)
+        old, old_start = self.text, self.start
+        old_len, new_len = len(old) - old_start, len(text) - start
+        limit = min(old_len, new_len)
+        prefix = common_prefix(old, old_start, text, start, limit)
+        suffix = common_suffix(old, text, limit - prefix)
+        lo = bisect_right(self.ends, prefix)
+        hi = bisect_left(self.starts, old_len - suffix)
+        shift = new_len - old_len
+        stop = start + self.starts[hi] + shift if hi < len(self.order) else None
+        items, starts, ends, kept = self._parse_span(text, start + (self.ends[lo - 1] if lo else 0), stop, lo, hi)
+
+        # Order keys for each run of new items, between its neighbours
+        segment = [self.order[kept[n]] if n in kept else None for n in range(len(items))]
+        runs = []
+        n = 0
+        while n < len(segment):
+            end = n
+            while end < len(segment) and segment[end] is None:
+                end += 1
+            if end > n:
+                prev = segment[n - 1] if n else (self.order[lo - 1] if lo else None)
+                nxt = segment[end] if end < len(segment) else (self.order[hi] if hi < len(self.order) else None)
+                runs.append((n, end, prev, nxt))
+            n = end + 1
+        keys = [self._gap_keys(prev, nxt, end - n) for n, end, prev, nxt in runs]
+        if None in keys:
+            self._renumber(GAP * max(end - n + 1 for n, end, _, _ in runs))
+            keys = [self._gap_keys(prev, nxt, end - n) for n, end, prev, nxt in runs]
+        added = []
+        for (n, end, _, _), run_keys in zip(runs, keys):
+            for m, key in zip(range(n, end), run_keys):
+                segment[m] = self._add(lo + m, items[m], key)
+                added.append(segment[m])
+
+        removed = [self.order[pos] for pos in set(range(lo, hi)).difference(kept.values())]
+        self.order[lo:hi] = segment
+        self.items[lo:hi] = items
+        self.starts[lo:] = [s - start for s in starts] + [s + shift for s in self.starts[hi:]]
+        self.ends[lo:] = [e - start for e in ends] + [e + shift for e in self.ends[hi:]]
+        self.text, self.start = text, start
+        return removed, added
+
+    def _parse_span(self, text, pos, stop, lo, hi):
+        """parse_items() over the span that replaces old positions lo..hi-1.
+
+        Old items found unchanged keep their values: a whole run of them is
+        taken with one block compare (an object's text cannot be the prefix
+        of another's), looking a few items ahead for dropped ones, so only
+        edited or inserted items are decoded. Returns (items, starts, ends,
+        kept), `kept` mapping an index into `items` to its old position.
+        """
+        old, base, old_starts, old_ends = self.text, self.start, self.starts, self.ends
+        limit = len(text) if stop is None else stop
+        items, starts, ends, kept = [], [], [], {}
+        k = lo          # next old position expected
+        index = None    # old text -> positions, built once out of step
+        unchecked = []  # decoded elements not yet looked up in it
+        while (pos := next_element(text, pos, stop)) is not None:
+            for n in range(k, min(k + _LOOKAHEAD, hi)):
+                at = base + old_starts[n]
+                same = common_prefix(old, at, text, pos, min(len(old) - at, limit - pos))
+                run = bisect_right(old_ends, old_starts[n] + same, n, hi)
+                if run > n:
+                    shift = pos - at
+                    kept.update(zip(range(len(items), len(items) + run - n), range(n, run)))
+                    items += self.items[n:run]
+                    starts += [base + s + shift for s in old_starts[n:run]]
+                    ends += [base + e + shift for e in old_ends[n:run]]
+                    pos, k, unchecked = ends[-1], run, []
+                    break
+            else:
+                item, end = decode_element(text, pos)
+                unchecked.append(len(items))
+                items.append(item)
+                starts.append(pos)
+                ends.append(end)
+                pos = next_element(text, end, stop)
+                if k < hi and (index is not None or len(unchecked) > 1 or pos is None):
+                    # Two in a row, or the last: items moved, or more were
+                    # dropped than the look-ahead covers
+                    if index is None:
+                        index = {}
+                        for n in range(hi - 1, k - 1, -1):
+                            index.setdefault(old[base + old_starts[n]:base + old_ends[n]], []).append(n)
+                    for m in unchecked:
+                        same = index.get(text[starts[m]:ends[m]])
+                        while same and same[-1] < k:
+                            same.pop()
+                        if same:
+                            k = kept[m] = same.pop()
+                            items[m] = self.items[k]
+                            k += 1
+                    unchecked = []
+                if pos is None:
+                    break
+        return items, starts, ends, kept
+
+    def _gap_keys(self, prev, nxt, count):
+        """`count` increasing order keys between rows `prev` and `nxt` (None at either end).
+
+        None when the gap between them is too small.
+        """
+        idx = self.store.idx
+        if prev is None and nxt is None:
+            return [(n + 1) * GAP for n in range(count)]
+        if prev is None:
+            return [idx[nxt] - (count - n) * GAP for n in range(count)]
+        if nxt is None:
+            return [idx[prev] + (n + 1) * GAP for n in range(count)]
+        step = (idx[nxt] - idx[prev]) // (count + 1)
+        return [idx[prev] + (n + 1) * step for n in range(count)] if step else None
+
+    def _renumber(self, spacing=GAP):
+        """Space the order keys out again; relative order, and so every sorted list, is unchanged."""
+        idx = self.store.idx
+        for pos, row in enumerate(self.order):
+            idx[row] = (pos + 1) * spacing
+        self.ranked = {cat: [(neg, idx[row], row) for neg, _, row in rows] for cat, rows in self.ranked.items()}
+        self.by_cat = {cat: [(idx[row], row) for _, row in rows] for cat, rows in self.by_cat.items()}
+
+    # ---- rows ------------------------------------------------------------
+
+    def _add(self, pos, item, order_key):
+        """Process one item (ITEM_DATA and cache lookup) into a new row with `order_key`."""
+        key, info = gs.lookup_info(item, self.cache)
+        entry = self.cache.get(key)
+        if entry is not None and entry is not info:
+            self.cache_dirty = True
+        row = self.store.append(*gs.row_values(pos, item, key, info))
+        self.store.idx[row] = order_key
+        if not info:
+            self.pending[row] = self._pending_parts(row, item)
+        return row
+
+    def _same(self, a, b):
+        return all(getattr(self.store, name)[a] == getattr(self.store, name)[b]
+                   for name in ItemStore.__slots__[1:14])
+
+    def _candidate(self, row):
+        return self.store.total[row] is not None
+
+    def _rank(self, row):
+        store = self.store
+        insort(self.ranked.setdefault(store.categoryId[row], []), (-store.total[row], store.idx[row], row))
+
+    def _unrank(self, row):
+        store = self.store
+        rows = self.ranked[store.categoryId[row]]
+        del rows[bisect_left(rows, (-store.total[row], store.idx[row], row))]
+
+    def _place(self, row):
+        store = self.store
+        insort(self.by_cat.setdefault(store.categoryId[row], []), (store.idx[row], row))
+        self.sources[store.source[row]] += 1
+
+    def _unplace(self, row):
+        store = self.store
+        cat = store.categoryId[row]
+        rows = self.by_cat[cat]
+        del rows[bisect_left(rows, (store.idx[row], row))]
+        if not rows:
+            del self.by_cat[cat]
+        self.sources[store.source[row]] -= 1
+        if not self.sources[store.source[row]]:
+            del self.sources[store.source[row]]
+        self.lines.pop(row, None)
+        self.pending.pop(row, None)
+
+    def _pending_parts(self, row, item):
+        """The pending entry's text split around its index, which moves with the items before it."""
+        if 'key' in item or 'index' in item:
+            return None
+        text = entry_text({'key': self.store.key[row], 'index': 0, **item})
+        at = text.find(_PENDING_INDEX)
+        if at == -1:
+            return None
+        cut = at + len(_PENDING_INDEX) - 1
+        return text[:cut], text[cut + 1:]
+
+    def _pending_text(self, pos, row):
+        parts = self.pending[row]
+        if parts is None:
+            return entry_text({'key': self.store.key[row], 'index': pos, **self.items[pos]})
+        return b'%s%d%s' % (parts[0], pos, parts[1])
+
+    # ---- applying a delta ------------------------------------------------
+
+    def _commit(self, removed, added, rescore=False, idle=False):
+        """Take `removed` rows out, bring `added` rows in, re-rank and rewrite the outputs.
+
+        With `rescore`, every total is decayed again as of RANK_TIME. With
+        `idle` (no file changed), returns None and writes nothing when no
+        total or pick moved.
+        """
+        started = time.perf_counter()
+        store = self.store
+        for row in removed:
+            if self._candidate(row):
+                self._unrank(row)
+            self._unplace(row)
+        dirty = {store.categoryId[row] for row in removed}
+
+        encode = set(added)
+        derivatives = 0
+        if self.clusters is not None:
+            affected = self.clusters.update({row: gs.cluster_text(store, row) for row in added
+                                             if store.total[row] is not None},
+                                            [row for row in removed if store.total[row] is not None])
+            first_party = set(self.clustering['firstPartyCategories'])
+            done = set()
+            for row in affected:
+                if row in done:
+                    continue
+                members = self.clusters.group(row)
+                done.update(members)
+                original = gs.cluster_original(store, members, first_party) if len(members) > 1 else None
+                for member in members:
+                    link = gs.derivative_link(store, member, original, first_party)
+                    if store.derivativeOf[member] != link:
+                        store.derivativeOf[member] = link
+                        encode.add(member)
+            derivatives = len(done)
+        for row in added:
+            self._place(row)
+            if self._candidate(row):
+                self._rank(row)
+        if rescore:
+            encode.update(self._rescore())
+
+        picks = self._walk_boards()
+        if idle and not encode and picks == self.picks:
+            return None
+        ranks = {row: rank for rank, row in enumerate(picks.get('smartPicks', []), 1)}
+        encode.update((ranks.keys() ^ self.ranks.keys()) - set(removed))
+        encode.update(row for row, rank in ranks.items() if self.ranks.get(row, rank) != rank)
+        self.picks, self.ranks = picks, ranks
+        for row in encode:
+            entry = gs.output_entry(store, row, ranks.get(row))
+            self.lines[row] = entry_line(entry) if self.partitioned else entry_text(entry)
+        dirty.update(store.categoryId[row] for row in encode)
+        ranked = time.perf_counter()
+
+        self._write(dirty)
+        if self.cache_dirty:
+            save_cache(self.cache, self.cache_path)
+            self.stamps['cache'] = stamp(self.cache_path)
+        return {'items': len(self.order), 'removed': len(removed), 'added': len(added), 'encoded': len(encode),
+                'clustered': derivatives, 'rankSeconds': ranked - started,
+                'writeSeconds': time.perf_counter() - ranked}
+
+    def _rescore(self):
+        """Decay every scored row's total as of RANK_TIME; returns the rows whose total changed.
+
+        Each row was scored as of the poll that brought it in, and undated
+        rows never decay, so totals from different polls do not compare.
+        """
+        store = self.store
+        changed = []
+        for row in self.order:
+            scores = store.scores[row]
+            if scores:
+                total = gs.get_score_total(scores, decay=gs.decay_factor(store.pubTs[row]))
+                if total != store.total[row]:
+                    store.total[row] = total
+                    changed.append(row)
+        if changed:
+            self.ranked = {}
+            for row in self.order:
+                if self._candidate(row):
+                    self.ranked.setdefault(store.categoryId[row], []).append(
+                        (-store.total[row], store.idx[row], row))
+            for rows in self.ranked.values():
+                rows.sort()
+        return changed
+
+    def _walk_boards(self):
+        store = self.store
+        key_fns = {name: (lambda row, fn=fn: fn(store.view(row))) for name, fn in gs.CAP_KEYS.items()}
+        picks = {}
+        for name, spec in self.boards.items():
+            cats = dict.fromkeys(spec.get('categories') or self.ranked)
+            ordered = (row for _, _, row in heapq.merge(*(self.ranked[c] for c in cats if c in self.ranked)))
+            start = gs.window_start(spec)
+            if start is not None:
+                # A window keeps the merged order, it only skips older rows
+                ordered = (row for row in ordered if store.pubTs[row] is not None and store.pubTs[row] >= start)
+            if name == 'smartPicks':
+                ordered = (row for row in ordered if store.derivativeOf[row] is None)
+            picks[name] = walk(ordered, spec['size'], spec.get('caps', {}), key_fns)
+        return picks
+
+    # ---- output ------------------------------------------------------------
+
+    def _write(self, dirty):
+        store = self.store
+        others = {name: rows for name, rows in self.picks.items() if name != 'smartPicks'}
+        top10 = self.picks.get('smartPicks', [])
+        header = {'summarizedAt': datetime.now(timezone.utc).isoformat(), 'totalItems': len(self.order),
+                  'smartPickCount': len(top10)}
+        boards = {name: [gs.output_entry(store, row, self.ranks.get(row), with_scores=True) for row in rows]
+                  for name, rows in others.items()}
+
+        if self.partitioned:
+            os.makedirs(self.out_path, exist_ok=True)
+            shards = {}
+            for cat, rows in sorted(self.by_cat.items(), key=lambda kv: kv[1][0]):
+                if cat in dirty or cat not in self.shard_files:
+                    lines = [self.lines[row] for _, row in rows]
+                    self.shard_files[cat] = write_shard(self.out_path, cat, lines), sum(map(len, lines))
+                file, size = self.shard_files[cat]
+                shards[cat] = {'categoryName': store.categoryName[rows[0][1]], 'file': file,
+                               'count': len(rows), 'bytes': size}
+            for cat in self.shard_files.keys() - shards.keys():
+                del self.shard_files[cat]
+            top = [gs.output_entry(store, row, rank, with_scores=True) for rank, row in enumerate(top10, 1)]
+            write_index(self.out_path, header, {'smartPicks': top, **boards}, shards, len(self.sources))
+        else:
+            parts = [b'{\n']
+            parts += [f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n'.encode('utf-8')
+                      for key, value in header.items()]
+            arrays = [array_parts(name, [entry_text(entry) for entry in entries]) for name, entries in boards.items()]
+            arrays.append(array_parts('items', [self.lines[row] for row in self.order]))
+            for n, chunks in enumerate(arrays):
+                parts += [b',\n'] * bool(n) + chunks
+            parts.append(b'\n}')
+            replace_text(self.out_path, parts)
+
+        texts = [self._pending_text(pos, row) for pos, row in enumerate(self.order) if row in self.pending]
+        replace_text(self.pending_path, [b'{\n', *array_parts('items', texts), b',\n  "count": %d\n}' % len(texts)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', type=Path, default=gs.INPUT_PATH, help='filtered-items.json to watch')
+    parser.add_argument('--output', type=Path,
+                        help=f'output file, or directory for --format partitioned '
+                             f'(default {gs.OUTPUT_PATH.name} / {gs.PARTITIONED_PATH.name}/ in data/)')
+    parser.add_argument('--format', choices=('json', 'partitioned'), default='json')
+    parser.add_argument('--item-data', type=Path, default=gs.ITEM_DATA_PATH, help="today's hand-written summaries")
+    parser.add_argument('--cache', type=Path, default=gs.CACHE_PATH, help='summary cache file')
+    parser.add_argument('--pending', type=Path, default=gs.PENDING_PATH,
+                        help='where to list items that still need a summary')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between polls (default 1)')
+    args = parser.parse_args()
+
+    settings = gs.load_settings()
+    partitioned = args.format == 'partitioned'
+    digest = LiveDigest(args.input, args.output or (gs.PARTITIONED_PATH if partitioned else gs.OUTPUT_PATH),
+                        args.cache, args.pending, args.item_data, settings.get('leaderboards', DEFAULT_BOARDS),
+                        partitioned, max_days=settings['filter']['dedupeStoreMaxDays'])
+    while True:
+        try:
+            started = time.perf_counter()
+            report = digest.build()
+            break
+        except InputChanging:
+            # Half-written input, as poll() tolerates: build once the writer is done
+            time.sleep(args.interval)
+    print(f'Built {report["items"]} items in {time.perf_counter() - started:.2f}s; '
+          f'watching {args.input} every {args.interval:g}s (Ctrl-C to stop)')
+    try:
+        while True:
+            time.sleep(args.interval)
+            report = digest.poll()
+            if report:
+                print(f'{datetime.now():%H:%M:%S} {"+".join(report["changed"])}: {report["items"]} items, '
+                      f'-{report["removed"]} +{report["added"]} rows, {report["encoded"]} entries encoded; '
+                      f'rank {report["rankSeconds"] * 1000:.1f} ms, write {report["writeSeconds"] * 1000:.1f} ms, '
+                      f'total {report["seconds"] * 1000:.1f} ms'
+                      f'{", store compacted" if report.get("compacted") else ""}', flush=True)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()